@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Batch degree audit for a cohort of students.
+
+Input CSV columns: student_id, program, year, completed
+`completed` is a semicolon-separated list of courses, optionally with grades:
+    CPSC 230:A; CPSC 231:B+; MATH 110
+
+Usage (from repo root):
+    python scripts/audit_cohort.py students.csv
+    python scripts/audit_cohort.py students.csv --json > audit.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fse_catalog.degree_audit import load_degree_auditor
+from fse_utils.config_loader import load_config
+
+
+def read_students(path: str):
+    students = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            completed = []
+            for item in (row.get('completed') or '').split(';'):
+                code, _, grade = item.strip().partition(':')
+                if code:
+                    completed.append((code, grade.strip() or None))
+            students.append({
+                'id': row.get('student_id'),
+                'program': (row.get('program') or '').strip(),
+                'year': (row.get('year') or '').strip(),
+                'completed': completed,
+            })
+    return students
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch degree audit from a CSV of completed courses')
+    parser.add_argument('csv_path')
+    parser.add_argument('--json', action='store_true', help='Print full audit results as JSON')
+    args = parser.parse_args()
+
+    auditor = load_degree_auditor(load_config())
+    if auditor is None:
+        print("No major catalog JSON directory found")
+        sys.exit(1)
+
+    students = read_students(args.csv_path)
+    start = time.perf_counter()
+    results = auditor.audit_batch(students)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'student':<14}{'program':<9}{'year':<6}{'complete':<10}{'upper units':<13}open sections")
+    for student, result in zip(students, results):
+        if result is None:
+            print(f"{student['id'] or '?':<14}{student['program']:<9}{student['year']:<6}no catalog")
+            continue
+        open_sections = [s['name'] for s in result['sections'] if not s['satisfied']]
+        upper = result['upper_division_units']
+        print(f"{student['id'] or '?':<14}{result['program']:<9}{result['year']:<6}"
+              f"{str(result['complete']):<10}{upper['completed']:g}/{upper['needed']:<10}"
+              f"{'; '.join(open_sections)}")
+    print(f"\nAudited {len(students)} students in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
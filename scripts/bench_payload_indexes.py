@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compare filtered query latency with and without Qdrant payload indexes.
+
+Copies the points of an existing collection into two scratch collections, indexes
+the filter fields on one of them, then replays the SubjectCode/Year filters that
+FSEUnifiedRAG._build_filter produces against both.
+
+Usage (from repo root, Qdrant running and the collection already ingested):
+    python scripts/bench_payload_indexes.py --collection major_catalogs --runs 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import FieldCondition, Filter, MatchValue, PointStruct
+
+from fse_ingestion.fse_ingestion import ensure_payload_indexes
+from fse_utils.config_loader import load_config
+
+
+def copy_collection(client, source: str, target: str, batch_size: int = 256) -> int:
+    # Same size, distance and named vectors as the source so the timings reflect production
+    vectors_cfg = client.get_collection(source).config.params.vectors
+    if client.collection_exists(target):
+        client.delete_collection(target)
+    client.create_collection(target, vectors_config=vectors_cfg)
+
+    copied, offset = 0, None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source, limit=batch_size, offset=offset,
+            with_payload=True, with_vectors=True,
+        )
+        if not points:
+            break
+        client.upsert(target, points=[PointStruct(id=p.id, vector=p.vector, payload=p.payload) for p in points])
+        copied += len(points)
+        if offset is None:
+            break
+    return copied
+
+
+def filters_for(config: dict):
+    programs = sorted(set(config['domain']['majors'].values()))
+    years = config['domain']['catalog_years']
+    return [
+        Filter(must=[
+            FieldCondition(key='SubjectCode', match=MatchValue(value=program)),
+            FieldCondition(key='Year', match=MatchValue(value=str(year))),
+        ])
+        for program in programs for year in years
+    ]
+
+
+def time_queries(client, collection: str, filters, query_vector, runs: int) -> dict:
+    query_ms, scroll_ms = [], []
+    for _ in range(runs):
+        flt = random.choice(filters)
+        start = time.perf_counter()
+        client.query_points(collection_name=collection, query=query_vector, limit=10, query_filter=flt)
+        query_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        client.scroll(collection_name=collection, scroll_filter=flt, limit=500, with_payload=True)
+        scroll_ms.append((time.perf_counter() - start) * 1000)
+
+    def summary(values):
+        values = sorted(values)
+        return {
+            'p50': round(statistics.median(values), 2),
+            'p95': round(values[int(len(values) * 0.95) - 1], 2),
+            'mean': round(statistics.mean(values), 2),
+        }
+
+    return {'query_points': summary(query_ms), 'scroll': summary(scroll_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark filtered search with and without payload indexes')
+    parser.add_argument('--collection', default='major_catalogs', help='Collection key from config')
+    parser.add_argument('--runs', type=int, default=50, help='Queries per variant')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch collections afterwards')
+    args = parser.parse_args()
+
+    config = load_config()
+    client = QdrantClient(host=config['qdrant']['host'], port=config['qdrant']['port'],
+                          timeout=config['qdrant']['timeout'])
+    source = config['qdrant']['collections'].get(args.collection, args.collection)
+    per_cfg = config.get('collection_config', {}).get(args.collection, {})
+    fields = per_cfg.get('payload_indexes') or ['SubjectCode', 'Year', 'doc_type']
+
+    plain, indexed = f"{source}__bench_plain", f"{source}__bench_indexed"
+    print(f"Copying '{source}' into scratch collections...")
+    count = copy_collection(client, source, plain)
+    copy_collection(client, source, indexed)
+    ensure_payload_indexes(client, indexed, fields, per_cfg.get('tenant_field'))
+    print(f"  {count} points, indexed fields on '{indexed}': {', '.join(fields)}")
+
+    sample, _ = client.scroll(collection_name=source, limit=1, with_vectors=True)
+    if not sample:
+        print("Source collection is empty — run ingestion first")
+        return
+    query_vector = sample[0].vector
+    filters = filters_for(config)
+
+    time_queries(client, plain, filters, query_vector, 5)
+    time_queries(client, indexed, filters, query_vector, 5)
+    results = {
+        'without_indexes': time_queries(client, plain, filters, query_vector, args.runs),
+        'with_indexes': time_queries(client, indexed, filters, query_vector, args.runs),
+    }
+
+    print(f"\n{'variant':<18}{'op':<14}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for variant, ops in results.items():
+        for op, stats in ops.items():
+            print(f"{variant:<18}{op:<14}{stats['p50']:>10}{stats['p95']:>10}{stats['mean']:>10}")
+
+    if not args.keep:
+        client.delete_collection(plain)
+        client.delete_collection(indexed)
+
+
+if __name__ == "__main__":
+    main()
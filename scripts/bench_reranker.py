@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Accuracy vs latency of the reranker backends on the eval corpus.
+
+Candidates for each eval question are retrieved once through FSEUnifiedRAG.search_collection
+(over its expected_collections) and cached, so later runs need no Qdrant. Every backend then
+reranks the same candidates. It is compared with the baseline ('torch', core_rag's BGEReranker)
+on top-k overlap, top-1 agreement, and how often an expected answer term lands in the top k.
+
+With --adaptive, each backend is also run through AdaptiveReranker (reranker.adaptive settings),
+reporting pairs scored per query and recall@k against the same backend's exhaustive ranking.
+
+Usage (from repo root):
+    python scripts/bench_reranker.py --backends int8 onnx onnx-int8 --threads 4
+    python scripts/bench_reranker.py --candidates .reports/rerank_candidates.json --json
+    python scripts/bench_reranker.py --backends int8 --adaptive
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fse_retrieval.rerank_pruning import AdaptiveReranker, build_adaptive_reranker
+from fse_retrieval.reranker_backends import build_reranker
+from fse_utils.config_loader import get_project_root, load_config
+
+
+def expected_terms(acceptable: str):
+    """'Should mention: ENGR 385, 3 credits' -> ['engr 385', '3 credits']."""
+    m = re.match(r'\s*should mention:\s*(.+)', acceptable or '', re.IGNORECASE)
+    return [t.strip().lower() for t in m.group(1).split(',') if t.strip()] if m else []
+
+
+def collect_candidates(config: dict, corpus_path: str, max_candidates: int):
+    os.environ['RERANK_DISABLED'] = 'true'
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    rag = FSEUnifiedRAG()
+    majors = config.get('domain', {}).get('majors', {})
+    with open(corpus_path, encoding='utf-8') as f:
+        queries = yaml.safe_load(f).get('queries', [])
+
+    items = []
+    for q in queries:
+        user_context = {k: v for k, v in {'program': majors.get(q.get('major')),
+                                          'year': q.get('year')}.items() if v}
+        chunks = []
+        for collection in q.get('expected_collections') or ['major_catalogs']:
+            chunks += rag.search_collection(q['question'], collection, dict(user_context), top_k=max_candidates)
+        scores = {}
+        for c in chunks:
+            if c.get('text'):
+                scores[c['text']] = max(scores.get(c['text'], float('-inf')), c.get('score') or 0.0)
+        texts = sorted(scores, key=scores.get, reverse=True)[:max_candidates]
+        if texts:
+            items.append({'id': q.get('id'), 'question': q['question'], 'texts': texts,
+                          'scores': [scores[t] for t in texts],
+                          'terms': expected_terms(q.get('acceptable_answer'))})
+    return items
+
+
+def run_backend(reranker, items, top_k: int):
+    latencies, rankings, pairs = [], [], []
+    reranker.rerank(items[0]['question'], [{'text': t} for t in items[0]['texts'][:2]])  # load + compile
+    for item in items:
+        # Caches written before retrieval scores were stored fall back to rank order
+        scores = item.get('scores') or [1.0 / (60 + i) for i in range(len(item['texts']))]
+        chunks = [{'text': t, 'idx': i, 'score': s} for i, (t, s) in enumerate(zip(item['texts'], scores))]
+        if isinstance(reranker, AdaptiveReranker):
+            reranker.begin_request()
+        start = time.perf_counter()
+        ranked = reranker.rerank(item['question'], chunks)
+        latencies.append((time.perf_counter() - start) * 1000)
+        rankings.append([c['idx'] for c in ranked[:top_k]])
+        pairs.append(reranker.request_stats()['pairs_scored'] if isinstance(reranker, AdaptiveReranker)
+                     else len(chunks))
+    return latencies, rankings, pairs
+
+
+def summarize(name, latencies, rankings, pairs, baseline, items, top_k):
+    hits = 0
+    scored = 0
+    for item, ranking in zip(items, rankings):
+        if not item['terms']:
+            continue
+        scored += 1
+        top_text = ' '.join(item['texts'][i] for i in ranking).lower()
+        hits += any(term in top_text for term in item['terms'])
+    overlap = [len(set(r) & set(b)) / max(len(b), 1) for r, b in zip(rankings, baseline)]
+    latencies = sorted(latencies)
+    return {
+        'backend': name,
+        'p50_ms': round(statistics.median(latencies), 1),
+        'p95_ms': round(latencies[int(0.95 * (len(latencies) - 1))], 1),
+        'mean_ms': round(statistics.mean(latencies), 1),
+        f'overlap@{top_k}': round(statistics.mean(overlap), 3),
+        'top1_agreement': round(statistics.mean(r[:1] == b[:1] for r, b in zip(rankings, baseline)), 3),
+        f'answer_hit@{top_k}': round(hits / scored, 3) if scored else None,
+        'pairs_scored': round(statistics.mean(pairs), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reranker backends against the baseline model')
+    parser.add_argument('--backends', nargs='+', default=['int8', 'onnx', 'onnx-int8'])
+    parser.add_argument('--baseline', default='torch')
+    parser.add_argument('--corpus', default='configs/eval_corpus.yaml')
+    parser.add_argument('--candidates', default='.reports/rerank_candidates.json',
+                        help='Cached candidates; built from Qdrant if missing')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=None, help='reranker.num_threads for CPU backends')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Also run each backend with adaptive candidate pruning')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    config = load_config()
+    root = get_project_root()
+    cache = Path(args.candidates if os.path.isabs(args.candidates) else os.path.join(root, args.candidates))
+    if cache.exists():
+        items = json.loads(cache.read_text())
+    else:
+        max_candidates = config.get('reranker', {}).get('max_candidates_for_rerank', 200)
+        items = collect_candidates(config, os.path.join(root, args.corpus), max_candidates)
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps(items))
+    if not items:
+        print("No candidates retrieved for the eval corpus")
+        sys.exit(1)
+
+    results, baseline = [], None
+    for name in [args.baseline] + [b for b in args.backends if b != args.baseline]:
+        os.environ['RERANK_BACKEND'] = name
+        if args.threads:
+            config.setdefault('reranker', {})['num_threads'] = args.threads
+        try:
+            start = time.perf_counter()
+            reranker = build_reranker(config)
+            load_s = time.perf_counter() - start
+        except Exception as e:
+            print(f"Skipping {name}: {e}")
+            continue
+        latencies, rankings, pairs = run_backend(reranker, items, args.top_k)
+        if baseline is None:
+            baseline = rankings
+        results.append(dict(summarize(name, latencies, rankings, pairs, baseline, items, args.top_k),
+                            load_s=round(load_s, 1)))
+        if args.adaptive:
+            rcfg = dict(config.get('reranker', {}), top_k_rerank=args.top_k)
+            rcfg['adaptive'] = dict(rcfg.get('adaptive', {}), enabled=True)
+            adaptive = build_adaptive_reranker(reranker, {'reranker': rcfg})
+            a_latencies, a_rankings, a_pairs = run_backend(adaptive, items, args.top_k)
+            result = summarize(f"{name}+adaptive", a_latencies, a_rankings, a_pairs, baseline, items, args.top_k)
+            # recall@k of the pruned ranking against this backend's own exhaustive ranking
+            result[f'recall@{args.top_k}'] = round(statistics.mean(
+                len(set(a) & set(f)) / max(len(f), 1) for a, f in zip(a_rankings, rankings)), 3)
+            results.append(dict(result, load_s=round(load_s, 1)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    n_candidates = statistics.mean(len(i['texts']) for i in items)
+    print(f"{len(items)} eval questions, {n_candidates:.0f} candidates each on average\n")
+    keys = list(dict.fromkeys(k for r in results for k in r if k != 'backend'))
+    print(f"{'backend':<18}" + ''.join(f"{k:>17}" for k in keys))
+    for r in results:
+        print(f"{r['backend']:<18}" + ''.join(f"{str(r.get(k, '-')):>17}" for k in keys))
+
+
+if __name__ == '__main__':
+    main()
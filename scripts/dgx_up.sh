@@ -230,6 +230,7 @@ else
     --dtype bfloat16 \
     --gpu-memory-utilization $LLM_GPU_MEM_UTIL \
     --enable-prefix-caching \
+    --enable-prompt-tokens-details \
     --enable-chunked-prefill \
     --trust-remote-code
   echo "  Started. Log: docker logs -f $VLLM_PRIMARY_CONTAINER"
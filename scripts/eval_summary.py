@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-"""Quick summary of .reports/eval_corpus.json."""
+"""Quick summary of .reports/eval_corpus.json.
+
+Usage: eval_summary.py [report.json] [baseline.json]
+"""
 
 import json
 import sys
@@ -9,6 +12,7 @@ from collections import defaultdict
 report = Path(__file__).parent.parent / '.reports' / 'eval_corpus.json'
 if len(sys.argv) > 1:
     report = Path(sys.argv[1])
+baseline = Path(sys.argv[2]) if len(sys.argv) > 2 else None
 
 with open(report) as f:
     data = json.load(f)
@@ -24,6 +28,10 @@ errored       = [r for r in data if 'error' in r]
 
 tps_vals  = [r['judge_tokens_per_s'] for r in data if r.get('judge_tokens_per_s')]
 time_vals = [r['elapsed_s'] for r in data if r.get('elapsed_s')]
+pruned    = [r for r in data if r.get('rerank_candidates')]
+saved     = [r['prompt_tokens_saved'] for r in data if r.get('prompt_tokens_saved') is not None]
+cached    = [r for r in data if r.get('prompt_cached_tokens') is not None and r.get('prompt_tokens')]
+prefill   = [r['prompt_prefill_tokens'] for r in data if r.get('prompt_prefill_tokens') is not None]
 
 def pct(n, d):
     return f"{100*n/d:.1f}%" if d else "n/a"
@@ -42,6 +50,32 @@ if time_vals:
     print(f"\n  Avg elapsed          : {sum(time_vals)/len(time_vals):.1f}s")
     print(f"  Min / Max elapsed    : {min(time_vals):.1f}s / {max(time_vals):.1f}s")
 
+if pruned:
+    pairs = sum(r['rerank_pairs_scored'] for r in pruned)
+    candidates = sum(r['rerank_candidates'] for r in pruned)
+    print(f"\n  Avg rerank pairs     : {pairs/len(pruned):.1f} of {candidates/len(pruned):.1f} candidates"
+          f"  ({pct(pairs, candidates)})")
+
+if saved:
+    print(f"  Avg prompt tok saved : {sum(saved)/len(saved):.1f}  ({len(saved)} questions)")
+
+if prefill:
+    print(f"  Avg prefill tokens   : {sum(prefill)/len(prefill):.1f}")
+if cached:
+    hit = sum(r['prompt_cached_tokens'] for r in cached)
+    total_prompt = sum(r['prompt_tokens'] for r in cached)
+    print(f"  Prompt cache hits    : {hit} / {total_prompt} tokens  ({pct(hit, total_prompt)})")
+
+if baseline:
+    with open(baseline) as f:
+        base = [r for r in json.load(f) if r.get('judge_passed') is not None]
+    base_passed = [r for r in base if r.get('judge_passed') is True]
+    rate = len(judge_passed) / len(judged) if judged else 0.0
+    base_rate = len(base_passed) / len(base) if base else 0.0
+    print(f"\n  Baseline judge pass  : {len(base_passed)} / {len(base)}  ({pct(len(base_passed), len(base))})"
+          f"  ({baseline.name})")
+    print(f"  Judge pass delta     : {100*(rate - base_rate):+.1f} pts")
+
 if tps_vals:
     print(f"\n  Avg judge tok/s      : {sum(tps_vals)/len(tps_vals):.1f}")
     print(f"  Min / Max tok/s      : {min(tps_vals):.1f} / {max(tps_vals):.1f}")
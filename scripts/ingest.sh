@@ -3,12 +3,13 @@
 # Run data ingestion against DGX cluster (default) or local Ollama.
 # Cluster mode uses model.yaml (DGX ports/models). Local mode adds .local.yaml overrides.
 #
-# Usage: ./scripts/ingest.sh [--local|-l] [--clean|-c]
+# Usage: ./scripts/ingest.sh [--local|-l] [--clean|-c] [--reindex|-r]
 
 set -e
 
 MODE="cluster"
 CLEAN=false
+INGEST_ARGS=""
 
 while [[ $# -gt 0 ]]; do
   case $1 in
@@ -20,10 +21,15 @@ while [[ $# -gt 0 ]]; do
       CLEAN=true
       shift
       ;;
+    --reindex|-r)
+      INGEST_ARGS="--reindex"
+      shift
+      ;;
     -h|--help)
-      echo "Usage: $0 [--local|-l] [--clean|-c]"
+      echo "Usage: $0 [--local|-l] [--clean|-c] [--reindex|-r]"
       echo "  --local, -l   Use local Ollama (loads config.local.yaml + model.local.yaml)"
       echo "  --clean, -c   Wipe Qdrant data before ingesting"
+      echo "  --reindex, -r Build new collection versions and swap aliases (no downtime)"
       exit 0
       ;;
     *)
@@ -75,11 +81,11 @@ if [ "$MODE" = "cluster" ]; then
   echo "OK"
   echo
   echo "Running ingestion (cluster mode - DGX models + ports, no local config overrides)..."
-  PYTHONPATH=src .venv/bin/python src/ingestion/ingest.py
+  PYTHONPATH=src .venv/bin/python src/ingestion/ingest.py $INGEST_ARGS
 else
   echo
   echo "Running ingestion (local mode - local Ollama, .local.yaml overrides active)..."
-  LOCAL_DEV=true PYTHONPATH=src .venv/bin/python src/ingestion/ingest.py
+  LOCAL_DEV=true PYTHONPATH=src .venv/bin/python src/ingestion/ingest.py $INGEST_ARGS
 fi
 
 echo
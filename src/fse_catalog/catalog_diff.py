@@ -0,0 +1,194 @@
+import re
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from fse_catalog.model import Catalog, CatalogStore, get_catalog_store
+
+CHANGE_QUERY_RE = re.compile(
+    r"what(?:'s| has| have)? changed|what changes|changes? (?:between|from|in)|differen(?:ce|t) between|"
+    r"compare (?:the )?(?:20\d{2}|catalog)",
+    re.IGNORECASE,
+)
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+_COURSE_FIELDS = (('name', 'title'), ('credit_hours', 'credits'), ('prerequisite', 'prerequisite'),
+                  ('corequisite', 'corequisite'), ('description', 'description'))
+
+
+def _same(a, b) -> bool:
+    """Equal ignoring whitespace-only edits ("iOS Application Development " vs without the space)."""
+    if isinstance(a, str) or isinstance(b, str):
+        return ' '.join(str(a or '').split()) == ' '.join(str(b or '').split())
+    return a == b
+
+
+def diff_catalogs(old: Catalog, new: Catalog) -> Dict:
+    """Structured differences between two catalog years of the same program."""
+    added = sorted(set(new.courses) - set(old.courses))
+    removed = sorted(set(old.courses) - set(new.courses))
+
+    # Same title under a new code (CPSC 330 -> CENG 330) is a renumbering, not a drop + add
+    renumbered = []
+    by_name = {new.courses[c].name.strip().lower(): c for c in added}
+    for code in list(removed):
+        match = by_name.get(old.courses[code].name.strip().lower())
+        if match and match in added:
+            renumbered.append({'from': code, 'to': match, 'name': new.courses[match].name})
+            removed.remove(code)
+            added.remove(match)
+
+    changed = []
+    for code in sorted(set(old.courses) & set(new.courses)):
+        a, b = old.courses[code], new.courses[code]
+        fields = {label: {'from': getattr(a, attr), 'to': getattr(b, attr)}
+                  for attr, label in _COURSE_FIELDS if not _same(getattr(a, attr), getattr(b, attr))}
+        if fields:
+            changed.append({'code': code, 'number': b.number, 'changes': fields})
+
+    old_sections = {s.name: s for s in old.sections}
+    new_sections = {s.name: s for s in new.sections}
+    sections = []
+    for name in list(old_sections) + [n for n in new_sections if n not in old_sections]:
+        a, b = old_sections.get(name), new_sections.get(name)
+        if a is None or b is None:
+            sections.append({'name': name, 'status': 'added' if a is None else 'removed'})
+            continue
+        a_codes = {c.code for c, _ in a.iter_courses()}
+        b_codes = {c.code for c, _ in b.iter_courses()}
+        entry = {'name': name}
+        if a.credits != b.credits:
+            entry['credits'] = {'from': a.credits, 'to': b.credits}
+        if b_codes - a_codes:
+            entry['courses_added'] = sorted(b_codes - a_codes)
+        if a_codes - b_codes:
+            entry['courses_removed'] = sorted(a_codes - b_codes)
+        if len(entry) > 1:
+            sections.append(dict(entry, status='changed'))
+
+    program = {}
+    for attr in ('total_credits', 'gpa', 'grade_requirement', 'upper_division_units'):
+        if getattr(old, attr) != getattr(new, attr):
+            program[attr] = {'from': getattr(old, attr), 'to': getattr(new, attr)}
+
+    return {
+        'program': new.program_code,
+        'program_name': new.program,
+        'from_year': old.year,
+        'to_year': new.year,
+        'program_changes': program,
+        'sections': sections,
+        'courses_added': [{'code': c, 'number': new.courses[c].number, 'name': new.courses[c].name} for c in added],
+        'courses_removed': [{'code': c, 'number': old.courses[c].number, 'name': old.courses[c].name}
+                            for c in removed],
+        'courses_renumbered': renumbered,
+        'courses_changed': changed,
+    }
+
+
+def format_diff(diff: Dict) -> str:
+    """Short plain-text summary of a catalog diff, used as a retrievable chunk and as LLM context."""
+    lines = [f"Changes to {diff['program_name']} from the {diff['from_year']} to the {diff['to_year']} catalog:"]
+    labels = {'total_credits': 'Total credits', 'gpa': 'GPA rules', 'grade_requirement': 'Grade requirement',
+              'upper_division_units': 'Upper-division units'}
+    for key, change in diff['program_changes'].items():
+        lines.append(f"- {labels[key]}: {change['from']} -> {change['to']}")
+    for s in diff['sections']:
+        if s['status'] != 'changed':
+            lines.append(f"- Section {s['status']}: {s['name']}")
+            continue
+        parts = []
+        if 'credits' in s:
+            parts.append(f"credits {s['credits']['from']} -> {s['credits']['to']}")
+        if s.get('courses_added'):
+            parts.append('now lists ' + ', '.join(s['courses_added']))
+        if s.get('courses_removed'):
+            parts.append('no longer lists ' + ', '.join(s['courses_removed']))
+        lines.append(f"- {s['name']}: {'; '.join(parts)}")
+    if diff['courses_renumbered']:
+        lines.append('- Renumbered: ' + ', '.join(
+            f"{r['from']} -> {r['to']} ({r['name']})" for r in diff['courses_renumbered']))
+    if diff['courses_added']:
+        lines.append('- New courses: ' + ', '.join(f"{c['number']} {c['name']}" for c in diff['courses_added']))
+    if diff['courses_removed']:
+        lines.append('- Removed courses: ' + ', '.join(f"{c['number']} {c['name']}" for c in diff['courses_removed']))
+    for c in diff['courses_changed']:
+        changes = c['changes']
+        parts = [f"{label} {v['from'] or 'none'} -> {v['to'] or 'none'}" for label, v in changes.items()
+                 if label in ('credits', 'title')]
+        for label in ('prerequisite', 'corequisite'):
+            if label in changes:
+                parts.append(f"{label} now: {changes[label]['to'] or 'none'}")
+        if 'description' in changes:
+            parts.append('description updated')
+        lines.append(f"- {c['number']}: {'; '.join(parts)}")
+    if len(lines) == 1:
+        lines.append('- No differences in courses, sections or program requirements')
+    return '\n'.join(lines)
+
+
+class CatalogDiffIndex:
+    """Precomputed diffs for every (program, older year, newer year) pair."""
+
+    def __init__(self, diffs: Dict[Tuple[str, str, str], Dict]):
+        self.diffs = diffs
+
+    @classmethod
+    def from_store(cls, store: CatalogStore) -> 'CatalogDiffIndex':
+        by_program: Dict[str, List[Catalog]] = {}
+        for catalog in store.iter_catalogs():
+            by_program.setdefault(catalog.program_code, []).append(catalog)
+        diffs = {}
+        for program, catalogs in by_program.items():
+            catalogs.sort(key=lambda c: c.year)
+            for old, new in combinations(catalogs, 2):
+                diffs[(program, old.year, new.year)] = diff_catalogs(old, new)
+        return cls(diffs)
+
+    def years(self, program: str) -> List[str]:
+        return sorted({y for p, a, b in self.diffs if p == program for y in (a, b)})
+
+    def lookup(self, program: str, from_year: str, to_year: str) -> Optional[Dict]:
+        a, b = sorted((str(from_year), str(to_year)))
+        return self.diffs.get((program, a, b))
+
+    def resolve(self, query: str, program: str, student_year: str = None) -> Optional[Dict]:
+        """Year pair for a "what changed" question: both years from the query, else the
+        student's (or the one mentioned) catalog year against the newest one."""
+        years = self.years(program)
+        if not years:
+            return None
+        mentioned = [y for y in _YEAR_RE.findall(query) if y in years]
+        if len(mentioned) >= 2:
+            return self.lookup(program, mentioned[0], mentioned[1])
+        # answer_question(student_year=2024) passes an int; catalog years are strings
+        base = mentioned[0] if mentioned else (str(student_year) if student_year else None)
+        if not base or base not in years or base == years[-1]:
+            base = years[-2] if len(years) > 1 else None
+        return self.lookup(program, base, years[-1]) if base else None
+
+
+def adjacent_diff_chunks(catalogs: List[Catalog]) -> List[Dict]:
+    """One chunk per consecutive catalog-year pair of a program, for ingestion into major_catalogs."""
+    catalogs = sorted(catalogs, key=lambda c: c.year)
+    chunks = []
+    for old, new in zip(catalogs, catalogs[1:]):
+        diff = diff_catalogs(old, new)
+        chunks.append({
+            'text': format_diff(diff),
+            'metadata': {
+                'DocumentType': 'major_catalog',
+                'doc_type': 'major_catalog',
+                'ChunkType': 'catalog_diff',
+                'SubjectCode': new.program_code,
+                'Program': new.program,
+                'FromYear': old.year,
+                'ToYear': new.year,
+                'Years': [old.year, new.year],
+            },
+        })
+    return chunks
+
+
+def load_catalog_diff_index(config: dict) -> Optional[CatalogDiffIndex]:
+    store = get_catalog_store(config)
+    return CatalogDiffIndex.from_store(store) if store is not None else None
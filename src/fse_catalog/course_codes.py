@@ -0,0 +1,44 @@
+import re
+from typing import List, Optional
+
+# Matches "CPSC 350", "CPSC350", "cpsc-350", "PHYS 101L". Subject codes are 2-5 letters.
+COURSE_CODE_RE = re.compile(r'\b([A-Za-z]{2,5})\s*[-_]?\s*(\d{3})([A-Za-z]?)\b')
+
+# Subject prefixes used in the catalogs and plans. In free text a lowercase prefix only counts as a
+# course code if it is one of these, so "I have 120 credits" is not read as HAVE 120.
+SUBJECT_CODES = frozenset({
+    'BCHM', 'BIOL', 'CENG', 'CHEM', 'CPSC', 'ECON', 'EENG', 'ENG', 'ENGR', 'ENV', 'FFC', 'GAME',
+    'GCI', 'ISP', 'MATH', 'MGSC', 'PHY', 'PHYS', 'PSY', 'SCI', 'SE',
+})
+
+
+def normalize_course_code(code: str) -> Optional[str]:
+    """Canonical lookup key for a course code: 'cpsc-350' -> 'CPSC350'."""
+    m = COURSE_CODE_RE.search(code or '')
+    if not m:
+        return None
+    return f"{m.group(1)}{m.group(2)}{m.group(3)}".upper()
+
+
+def display_course_code(code: str) -> Optional[str]:
+    """Catalog display form: 'cpsc350' -> 'CPSC 350'."""
+    m = COURSE_CODE_RE.search(code or '')
+    if not m:
+        return None
+    return f"{m.group(1).upper()} {m.group(2)}{m.group(3).upper()}"
+
+
+def find_course_codes(text: str) -> List[str]:
+    """Every course code mentioned in free text, normalized and in order of appearance.
+
+    A match counts if its subject is written in uppercase or is a known subject code.
+    """
+    seen = []
+    for m in COURSE_CODE_RE.finditer(text or ''):
+        subject = m.group(1)
+        if not subject.isupper() and subject.upper() not in SUBJECT_CODES:
+            continue
+        code = f"{m.group(1)}{m.group(2)}{m.group(3)}".upper()
+        if code not in seen:
+            seen.append(code)
+    return seen
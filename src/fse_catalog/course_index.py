@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional
+
+from fse_catalog.course_codes import find_course_codes, normalize_course_code
+from fse_catalog.model import Catalog, CatalogStore, get_catalog_store
+from fse_ingestion.catalog_chunker import chunk_catalog
+
+
+class CourseIndex:
+    """In-memory inverted index: normalized course code -> catalog year -> program -> course chunk.
+
+    The chunks are the same ones catalog_chunker emits at ingestion, so a hit here is
+    exactly what vector search would have returned for that course, without the ANN query.
+    """
+
+    def __init__(self):
+        self._courses: Dict[str, Dict[str, Dict[str, Dict]]] = {}
+
+    @classmethod
+    def from_store(cls, store: CatalogStore) -> 'CourseIndex':
+        index = cls()
+        for catalog in store.iter_catalogs():
+            index.add_catalog(catalog)
+        return index
+
+    def add_catalog(self, catalog: Catalog):
+        for chunk in chunk_catalog(catalog):
+            meta = chunk['metadata']
+            if meta.get('ChunkType') != 'course':
+                continue
+            by_year = self._courses.setdefault(meta['CourseCode'], {})
+            by_year.setdefault(meta['Year'], {})[meta['SubjectCode']] = chunk
+
+    def __len__(self):
+        return len(self._courses)
+
+    def __contains__(self, code: str) -> bool:
+        return normalize_course_code(code) in self._courses
+
+    def lookup(self, code: str, year: str = None, program: str = None) -> Optional[Dict]:
+        """Best single chunk for a course: the student's program/year first, else the newest year."""
+        by_year = self._courses.get(normalize_course_code(code) or '')
+        if not by_year:
+            return None
+        years = [str(year)] if year and str(year) in by_year else []
+        years += sorted((y for y in by_year if y not in years), reverse=True)
+        for y in years:
+            programs = by_year[y]
+            if program and program in programs:
+                return programs[program]
+        return next(iter(by_year[years[0]].values()))
+
+    def resolve(self, query: str, year: str = None, program: str = None) -> List[Dict]:
+        """Chunks for every indexed course mentioned in the query, in mention order."""
+        hits = []
+        for code in find_course_codes(query):
+            chunk = self.lookup(code, year, program)
+            if chunk is not None:
+                hits.append(chunk)
+        return hits
+
+    def mentions_only_indexed(self, query: str) -> bool:
+        codes = find_course_codes(query)
+        return bool(codes) and all(c in self._courses for c in codes)
+
+
+def load_course_index(config: dict) -> Optional[CourseIndex]:
+    store = get_catalog_store(config)
+    return CourseIndex.from_store(store) if store is not None else None
@@ -0,0 +1,266 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from fse_catalog.course_codes import display_course_code, normalize_course_code
+from fse_catalog.model import Catalog, CatalogStore, Course, Section, get_catalog_store
+
+AUDIT_QUERY_RE = re.compile(
+    r'still need|left to (?:take|graduate)|remaining (?:requirements|courses)|degree audit|on track to graduate|'
+    r'what (?:else )?do i need to graduate',
+    re.IGNORECASE,
+)
+
+GRADE_POINTS = {
+    'A+': 4.0, 'A': 4.0, 'A-': 3.7, 'B+': 3.3, 'B': 3.0, 'B-': 2.7, 'C+': 2.3, 'C': 2.0,
+    'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'D-': 0.7, 'F': 0.0,
+}
+_GRADE_RE = re.compile(r'\b([A-D][+-]?|F)\b')
+_UPPER_DIVISION = 300
+
+
+def _min_credits(value) -> Optional[float]:
+    """'23-24' and '39–40' -> 23.0 / 39.0; ints pass through."""
+    if value is None:
+        return None
+    m = re.match(r'\s*(\d+(?:\.\d+)?)', str(value))
+    return float(m.group(1)) if m else None
+
+
+def _course_level(code: str) -> int:
+    m = re.search(r'(\d{3})', code)
+    return int(m.group(1)) if m else 0
+
+
+class CompiledCatalog:
+    """One catalog's requirements as a (requirement x course) weight matrix.
+
+    Row kinds: 'all' (every listed course, weight 1 per course), 'credits' (reach a credit
+    total from a pool or by repeating a course, weight = course credits) and 'sequence'
+    (one alternative of a section; the section is met when any of its sequences is).
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.program = catalog.program_code
+        self.year = catalog.year
+        self.name = catalog.program
+        self.gpa_rules = catalog.gpa
+        self.upper_division_units = catalog.upper_division_units or 0
+        m = _GRADE_RE.search(catalog.grade_requirement or '')
+        self.min_grade_points = GRADE_POINTS[m.group(1)] if m else None
+
+        self.courses: List[str] = []
+        self.course_credits: List[float] = []
+        self._column: Dict[str, int] = {}
+        self.rows: List[Dict] = []
+        for section in catalog.sections:
+            self._compile_section(section)
+
+        self.weights = np.zeros((len(self.rows), len(self.courses)), dtype=np.float32)
+        self.needed = np.zeros(len(self.rows), dtype=np.float32)
+        for r, row in enumerate(self.rows):
+            for col in row['columns']:
+                self.weights[r, col] = self.course_credits[col] if row['kind'] == 'credits' else 1.0
+            self.needed[r] = row['needed']
+        self.credit_rows = np.array([row['kind'] == 'credits' for row in self.rows], dtype=bool)
+        self.credits = np.array(self.course_credits, dtype=np.float32)
+        self.upper_mask = np.array([_course_level(c) >= _UPPER_DIVISION for c in self.courses], dtype=bool)
+
+    def _col(self, course: Course) -> int:
+        if course.code not in self._column:
+            self._column[course.code] = len(self.courses)
+            self.courses.append(course.code)
+            self.course_credits.append(float(course.credit_hours or 0))
+        return self._column[course.code]
+
+    def _compile_section(self, section: Section):
+        name = section.name
+        target = _min_credits(section.credits)
+        columns = [self._col(course) for course in section.courses]
+        sequences = section.sequences
+
+        if columns:
+            listed = sum(self.course_credits[c] for c in columns)
+            # A credit target below the listed total is an elective pool; above it with a single
+            # course it is a repeatable course (colloquium). Anything else means "take them all".
+            pool = target is not None and not sequences and (
+                target < listed or (target > listed and len(columns) == 1))
+            if pool:
+                self.rows.append({'section': name, 'kind': 'credits', 'columns': columns,
+                                  'needed': target})
+            else:
+                self.rows.append({'section': name, 'kind': 'all', 'columns': columns,
+                                  'needed': len(columns)})
+        for seq in sequences:
+            seq_cols = [self._col(course) for course in seq.courses]
+            self.rows.append({'section': name, 'kind': 'sequence', 'columns': seq_cols,
+                              'needed': len(seq_cols),
+                              'label': f"Sequence {seq.number if seq.number is not None else '?'}"})
+
+    def completion_matrix(self, students: List[List[Dict]]) -> np.ndarray:
+        """(students x courses) completion counts, dropping grades below the catalog minimum."""
+        x = np.zeros((len(students), len(self.courses)), dtype=np.float32)
+        for s, completed in enumerate(students):
+            for entry in completed:
+                col = self._column.get(entry['code'])
+                if col is None:
+                    continue
+                points = entry.get('points')
+                if points is not None and self.min_grade_points is not None and points < self.min_grade_points:
+                    continue
+                x[s, col] += 1
+        return x
+
+
+def _normalize_completed(completed: Iterable) -> List[Dict]:
+    """Accept 'CPSC 350', ('CPSC 350', 'B+') or {'code': ..., 'grade': ...} entries."""
+    entries = []
+    for item in completed:
+        if isinstance(item, dict):
+            code, grade = item.get('code', ''), item.get('grade')
+        elif isinstance(item, (tuple, list)):
+            code, grade = item[0], (item[1] if len(item) > 1 else None)
+        else:
+            code, grade = item, None
+        code = normalize_course_code(code)
+        if code:
+            entries.append({'code': code, 'grade': grade,
+                            'points': GRADE_POINTS.get(str(grade).upper()) if grade else None})
+    return entries
+
+
+class DegreeAuditor:
+    """Evaluates completed-course lists against compiled catalogs; batches share one matmul per catalog."""
+
+    def __init__(self, catalogs: Iterable[CompiledCatalog]):
+        self.catalogs: Dict[Tuple[str, str], CompiledCatalog] = {(c.program, c.year): c for c in catalogs}
+
+    @classmethod
+    def from_store(cls, store: CatalogStore) -> 'DegreeAuditor':
+        return cls(CompiledCatalog(c) for c in store.iter_catalogs())
+
+    def catalog_for(self, program: str, year: str = None) -> Optional[CompiledCatalog]:
+        if (program, str(year)) in self.catalogs:
+            return self.catalogs[(program, str(year))]
+        years = sorted((y for p, y in self.catalogs if p == program), reverse=True)
+        return self.catalogs[(program, years[0])] if years else None
+
+    def audit(self, program: str, year: str, completed: Iterable) -> Optional[Dict]:
+        return self.audit_batch([{'program': program, 'year': year, 'completed': completed}])[0]
+
+    def audit_batch(self, students: List[Dict]) -> List[Optional[Dict]]:
+        """Audit many students at once; each entry needs program, year and completed (id optional)."""
+        results: List[Optional[Dict]] = [None] * len(students)
+        by_catalog = defaultdict(list)
+        for i, student in enumerate(students):
+            catalog = self.catalog_for(student.get('program'), student.get('year'))
+            if catalog is not None:
+                by_catalog[(catalog.program, catalog.year)].append(i)
+
+        for key, indices in by_catalog.items():
+            catalog = self.catalogs[key]
+            completed = [_normalize_completed(students[i].get('completed', [])) for i in indices]
+            x = catalog.completion_matrix(completed)
+            # 'all'/'sequence' rows count each course once; 'credits' rows count repeats (colloquia)
+            progress = np.where(catalog.credit_rows, x @ catalog.weights.T, np.minimum(x, 1) @ catalog.weights.T)
+            met = progress >= catalog.needed
+            upper_units = (np.minimum(x, 1) * catalog.upper_mask) @ catalog.credits
+            for n, i in enumerate(indices):
+                results[i] = self._result(catalog, students[i], completed[n], x[n], progress[n], met[n],
+                                          float(upper_units[n]))
+        return results
+
+    def _result(self, catalog: CompiledCatalog, student: Dict, completed: List[Dict],
+                x: np.ndarray, progress: np.ndarray, met: np.ndarray, upper_units: float) -> Dict:
+        sections: Dict[str, Dict] = {}
+        for r, row in enumerate(catalog.rows):
+            entry = sections.setdefault(row['section'], {'name': row['section'], 'satisfied': True, 'remaining': []})
+            if row['kind'] == 'sequence':
+                entry.setdefault('sequences', []).append(r)
+                continue
+            if met[r]:
+                continue
+            entry['satisfied'] = False
+            missing = [catalog.courses[c] for c in row['columns'] if x[c] == 0]
+            if row['kind'] == 'credits':
+                choose_from = missing or [catalog.courses[c] for c in row['columns']]
+                entry['remaining'].append({'credits': float(row['needed'] - progress[r]), 'choose_from': choose_from})
+            else:
+                entry['remaining'].append({'courses': missing})
+
+        for entry in sections.values():
+            seq_rows = entry.pop('sequences', None)
+            if not seq_rows or any(met[r] for r in seq_rows):
+                continue
+            closest = min(seq_rows, key=lambda r: catalog.needed[r] - progress[r])
+            row = catalog.rows[closest]
+            entry['satisfied'] = False
+            entry['remaining'].append({
+                'one_of_sequences': True,
+                'closest': row['label'],
+                'courses': [catalog.courses[c] for c in row['columns'] if x[c] == 0],
+            })
+
+        gpa = {}
+        graded = [e for e in completed if e['points'] is not None and e['code'] in catalog._column]
+        if graded:
+            def average(entries):
+                hours = sum(catalog.course_credits[catalog._column[e['code']]] for e in entries)
+                if not hours:
+                    return None
+                return round(sum(e['points'] * catalog.course_credits[catalog._column[e['code']]]
+                                 for e in entries) / hours, 2)
+            scopes = {'major': graded,
+                      'lower_division': [e for e in graded if _course_level(e['code']) < _UPPER_DIVISION]}
+            for rule, minimum in catalog.gpa_rules.items():
+                value = average(scopes.get(rule, graded))
+                gpa[rule] = {'gpa': value, 'minimum': minimum, 'met': value is None or value >= minimum}
+
+        section_list = list(sections.values())
+        upper = {'completed': upper_units, 'needed': catalog.upper_division_units,
+                 'met': upper_units >= catalog.upper_division_units}
+        return {
+            'id': student.get('id'),
+            'program': catalog.program,
+            'program_name': catalog.name,
+            'year': catalog.year,
+            'complete': all(s['satisfied'] for s in section_list) and upper['met']
+            and all(g['met'] for g in gpa.values()),
+            'sections': section_list,
+            'upper_division_units': upper,
+            'gpa': gpa,
+        }
+
+
+def _codes(codes: List[str]) -> str:
+    return ', '.join(display_course_code(c) or c for c in codes)
+
+
+def format_audit(result: Dict) -> str:
+    """Plain-text remaining requirements for the LLM to narrate."""
+    lines = [f"Degree audit: {result['program_name']} ({result['year']} catalog) — "
+             + ('all requirements met' if result['complete'] else 'requirements remaining')]
+    for section in result['sections']:
+        if section['satisfied']:
+            lines.append(f"- {section['name']}: complete")
+            continue
+        for item in section['remaining']:
+            if item.get('one_of_sequences'):
+                lines.append(f"- {section['name']}: complete one sequence (closest: {item['closest']}, "
+                             f"still needs {_codes(item['courses'])})")
+            elif 'credits' in item:
+                lines.append(f"- {section['name']}: {item['credits']:g} more credits from {_codes(item['choose_from'])}")
+            else:
+                lines.append(f"- {section['name']}: {_codes(item['courses'])}")
+    upper = result['upper_division_units']
+    lines.append(f"- Upper-division units: {upper['completed']:g} of {upper['needed']}")
+    for rule, g in result['gpa'].items():
+        lines.append(f"- {rule.replace('_', ' ')} GPA: {g['gpa']} (minimum {g['minimum']})")
+    return '\n'.join(lines)
+
+
+def load_degree_auditor(config: dict) -> Optional[DegreeAuditor]:
+    store = get_catalog_store(config)
+    return DegreeAuditor.from_store(store) if store is not None else None
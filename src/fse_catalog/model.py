@@ -0,0 +1,328 @@
+import json
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fse_catalog.course_codes import display_course_code, normalize_course_code
+from fse_utils.config_loader import get_project_root
+
+# Bump when a record's fields change so stale snapshots are rebuilt instead of unpickled
+_MODEL_VERSION = 1
+_SEQUENCE_KEYS = ('math_sequences', 'approved_sequences')
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value or '')
+
+
+class Course:
+    __slots__ = ('code', 'number', 'name', 'credit_hours', 'description',
+                 'prerequisite', 'corequisite', 'recommended_prerequisite')
+
+    def __init__(self, code, number, name, credit_hours, description,
+                 prerequisite='', corequisite='', recommended_prerequisite=''):
+        self.code = code
+        self.number = number
+        self.name = name
+        self.credit_hours = credit_hours
+        self.description = description
+        self.prerequisite = prerequisite
+        self.corequisite = corequisite
+        self.recommended_prerequisite = recommended_prerequisite
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['Course']:
+        code = normalize_course_code(data.get('course_number', ''))
+        if not code:
+            return None
+        return cls(
+            _intern(code),
+            _intern(display_course_code(code)),
+            data.get('name', ''),
+            data.get('credit_hours'),
+            data.get('description', ''),
+            data.get('prerequisite', ''),
+            data.get('corequisite', ''),
+            data.get('recommended_prerequisite', ''),
+        )
+
+    def __repr__(self):
+        return f"Course({self.number!r})"
+
+
+class Sequence:
+    __slots__ = ('number', 'notes', 'courses')
+
+    def __init__(self, number, notes: str, courses: Tuple[Course, ...]):
+        self.number = number
+        self.notes = notes
+        self.courses = courses
+
+
+class Section:
+    __slots__ = ('name', 'credits', 'notes', 'courses', 'sequences')
+
+    def __init__(self, name: str, credits, notes: str, courses: Tuple[Course, ...],
+                 sequences: Tuple[Sequence, ...]):
+        self.name = name
+        self.credits = credits
+        self.notes = notes
+        self.courses = courses
+        self.sequences = sequences
+
+    def iter_courses(self) -> Iterator[Tuple[Course, Optional[Sequence]]]:
+        """Every course in the section, with the sequence it belongs to (None for plain lists)."""
+        for course in self.courses:
+            yield course, None
+        for seq in self.sequences:
+            for course in seq.courses:
+                yield course, seq
+
+
+class Catalog:
+    """One major catalog year from data/major_catalog_json."""
+
+    __slots__ = ('program_code', 'program', 'year', 'total_credits', 'gpa', 'grade_requirement',
+                 'upper_division_units', 'notes', 'sections', 'courses')
+
+    def __init__(self, program_code, program, year, total_credits, gpa, grade_requirement,
+                 upper_division_units, notes, sections: Tuple[Section, ...], courses: Dict[str, Course]):
+        self.program_code = program_code
+        self.program = program
+        self.year = year
+        self.total_credits = total_credits
+        self.gpa = gpa
+        self.grade_requirement = grade_requirement
+        self.upper_division_units = upper_division_units
+        self.notes = notes
+        self.sections = sections
+        self.courses = courses
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Catalog':
+        courses: Dict[str, Course] = {}
+
+        def course_ref(raw: Dict) -> Optional[Course]:
+            # A course listed in several sections is one shared record (first listing wins)
+            course = Course.from_dict(raw)
+            if course is None:
+                return None
+            return courses.setdefault(course.code, course)
+
+        sections = []
+        for raw in data.get('sections', []):
+            credits = None
+            for key in ('credits', 'credits_required', 'credit_hours'):
+                if raw.get(key) is not None:
+                    credits = raw[key]
+                    break
+            sequences = tuple(
+                Sequence(seq.get('sequence'), seq.get('notes', ''),
+                         tuple(c for c in map(course_ref, seq.get('courses', [])) if c is not None))
+                for key in _SEQUENCE_KEYS for seq in raw.get(key, [])
+            )
+            sections.append(Section(
+                raw.get('name', ''),
+                credits,
+                raw.get('notes') or raw.get('note') or '',
+                tuple(c for c in map(course_ref, raw.get('courses', [])) if c is not None),
+                sequences,
+            ))
+
+        meta = data.get('metadata', {})
+        req = data.get('requirements', {})
+        return cls(
+            _intern(meta.get('SubjectCode', '')),
+            data.get('program', ''),
+            _intern(str(meta.get('Year', ''))),
+            data.get('total_credits'),
+            dict(req.get('GPA', {})),
+            req.get('grade_requirement', ''),
+            req.get('upper_division_units'),
+            req.get('notes', ''),
+            tuple(sections),
+            courses,
+        )
+
+    def __contains__(self, code: str) -> bool:
+        return normalize_course_code(code) in self.courses
+
+    def __repr__(self):
+        return f"Catalog({self.program_code!r}, {self.year!r})"
+
+
+class PlanCourse:
+    __slots__ = ('code', 'title', 'credits', 'category')
+
+    def __init__(self, code, title, credits, category):
+        self.code = code
+        self.title = title
+        self.credits = credits
+        self.category = category
+
+
+class PlanTerm:
+    __slots__ = ('year', 'semester', 'total_credits', 'courses')
+
+    def __init__(self, year, semester, total_credits, courses: Tuple[PlanCourse, ...]):
+        self.year = year
+        self.semester = semester
+        self.total_credits = total_credits
+        self.courses = courses
+
+
+class FourYearPlan:
+    """One structured curriculum from data/4_year_plans/<year>/<year>_<program>_plan.json."""
+
+    __slots__ = ('program_code', 'program', 'catalog_year', 'total_credits', 'requirements_summary', 'terms')
+
+    def __init__(self, program_code, program, catalog_year, total_credits, requirements_summary,
+                 terms: Tuple[PlanTerm, ...]):
+        self.program_code = program_code
+        self.program = program
+        self.catalog_year = catalog_year
+        self.total_credits = total_credits
+        self.requirements_summary = requirements_summary
+        self.terms = terms
+
+    @classmethod
+    def from_dict(cls, data: Dict, program_code: str) -> 'FourYearPlan':
+        terms = tuple(
+            PlanTerm(
+                term.get('year'), _intern(term.get('semester', '')), term.get('total_credits'),
+                tuple(PlanCourse(_intern(c.get('code', '')), c.get('title', ''), c.get('credits'),
+                                 _intern(c.get('category', ''))) for c in term.get('courses', [])),
+            )
+            for term in data.get('curriculum', [])
+        )
+        return cls(_intern(program_code), data.get('program', ''), _intern(str(data.get('catalog_year', ''))),
+                   data.get('total_credits'), dict(data.get('requirements_summary', {})), terms)
+
+    def __repr__(self):
+        return f"FourYearPlan({self.program_code!r}, {self.catalog_year!r})"
+
+
+def load_catalog_file(path: str) -> Catalog:
+    with open(path, 'r', encoding='utf-8') as f:
+        return Catalog.from_dict(json.load(f))
+
+
+def load_plan_file(path: str) -> FourYearPlan:
+    """Program code comes from the file name: 2026_cs_plan.json -> 'cs'."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return FourYearPlan.from_dict(json.load(f), Path(path).stem.split('_')[1])
+
+
+class CatalogStore:
+    """Every major catalog and structured 4-year plan, parsed once and shared.
+
+    Consumers (course index, prerequisite graph, degree audit, plan scheduler) read from
+    here instead of re-parsing the JSON; the store itself is pickled so startup skips
+    parsing whenever the source files are unchanged.
+    """
+
+    def __init__(self, catalogs: List[Catalog] = (), plans: List[FourYearPlan] = ()):
+        self.catalogs: Dict[Tuple[str, str], Catalog] = {(c.program_code, c.year): c for c in catalogs}
+        self.plans: Dict[Tuple[str, str], FourYearPlan] = {(p.program_code, p.catalog_year): p for p in plans}
+
+    @classmethod
+    def from_directories(cls, catalog_dir: str, plans_dir: str = None) -> 'CatalogStore':
+        catalogs = [load_catalog_file(str(p)) for p in sorted(Path(catalog_dir).glob('*/*.json'))]
+        plans = []
+        if plans_dir and os.path.isdir(plans_dir):
+            plans = [load_plan_file(str(p)) for p in sorted(Path(plans_dir).glob('*/*_plan.json'))]
+        return cls(catalogs, plans)
+
+    def catalog(self, program: str, year: str = None) -> Optional[Catalog]:
+        """The requested catalog year, else the newest year for the program."""
+        if (program, str(year)) in self.catalogs:
+            return self.catalogs[(program, str(year))]
+        years = sorted((y for p, y in self.catalogs if p == program), reverse=True)
+        return self.catalogs[(program, years[0])] if years else None
+
+    def plan(self, program: str, year: str = None) -> Optional[FourYearPlan]:
+        if (program, str(year)) in self.plans:
+            return self.plans[(program, str(year))]
+        years = sorted((y for p, y in self.plans if p == program), reverse=True)
+        return self.plans[(program, years[0])] if years else None
+
+    def iter_catalogs(self) -> Iterator[Catalog]:
+        for key in sorted(self.catalogs, key=lambda k: (k[1], k[0])):
+            yield self.catalogs[key]
+
+    def save(self, path: str, fingerprint):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump((_MODEL_VERSION, fingerprint, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, fingerprint) -> Optional['CatalogStore']:
+        """Snapshot contents, or None if it was built from different source files."""
+        with open(path, 'rb') as f:
+            version, saved_fingerprint, store = pickle.load(f)
+        if version != _MODEL_VERSION or saved_fingerprint != fingerprint:
+            return None
+        return store
+
+
+def _source_fingerprint(*dirs: str) -> Tuple:
+    entries = []
+    for d in dirs:
+        if d and os.path.isdir(d):
+            for p in sorted(Path(d).glob('*/*.json')):
+                st = p.stat()
+                entries.append((str(p), st.st_size, st.st_mtime_ns))
+    return tuple(entries)
+
+
+# (catalog dir, plans dir) -> (source fingerprint, monotonic time it was last checked, store)
+_STORES: Dict[Tuple[str, str], Tuple[Tuple, float, CatalogStore]] = {}
+
+
+def get_catalog_store(config: dict) -> Optional[CatalogStore]:
+    """Process-wide catalog store: one parse (or snapshot load) shared by every consumer.
+
+    Source files are re-fingerprinted at most every ``catalog_model.refresh_s`` seconds, so a
+    running process picks up re-ingested catalogs and plans as a new store object.
+    """
+    root = get_project_root()
+    dirs = config.get('data_directories', {})
+    catalog_dir = dirs.get('major_catalog_json', 'data/major_catalog_json')
+    plans_dir = dirs.get('4_year_plans', 'data/4_year_plans')
+    catalog_dir = catalog_dir if os.path.isabs(catalog_dir) else os.path.join(root, catalog_dir)
+    plans_dir = plans_dir if os.path.isabs(plans_dir) else os.path.join(root, plans_dir)
+    if not os.path.isdir(catalog_dir):
+        return None
+    model_cfg = config.get('catalog_model', {})
+    key = (catalog_dir, plans_dir)
+    now = time.monotonic()
+    cached = _STORES.get(key)
+    if cached is not None and now - cached[1] <= model_cfg.get('refresh_s', 30):
+        return cached[2]
+    fingerprint = _source_fingerprint(catalog_dir, plans_dir)
+    if cached is not None and cached[0] == fingerprint:
+        _STORES[key] = (fingerprint, now, cached[2])
+        return cached[2]
+
+    snapshot = model_cfg.get('snapshot_path', '.cache/catalog_model.pkl')
+    snapshot = snapshot if os.path.isabs(snapshot) else os.path.join(root, snapshot)
+
+    store = None
+    if os.path.exists(snapshot):
+        try:
+            store = CatalogStore.load(snapshot, fingerprint)
+        except Exception as e:
+            print(f"Warning: Could not load catalog snapshot, re-parsing JSON: {e}")
+    if store is None:
+        store = CatalogStore.from_directories(catalog_dir, plans_dir)
+        try:
+            store.save(snapshot, fingerprint)
+        except OSError as e:
+            print(f"Warning: Could not save catalog snapshot: {e}")
+    _STORES[key] = (fingerprint, now, store)
+    return store
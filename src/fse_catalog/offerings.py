@@ -0,0 +1,186 @@
+import csv
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fse_catalog.course_codes import display_course_code, normalize_course_code
+from fse_utils.config_loader import get_project_root
+
+OFFERING_QUERY_RE = re.compile(
+    r'\boffered\b|\boffering|\btaught\b|sections? of|open (?:seats|sections)|seats (?:left|available)|'
+    r'\bschedule[ds]? (?:for|in)\b|\bis .{0,30}\b(?:available|running) (?:in|this|next)',
+    re.IGNORECASE,
+)
+SEASONS = ('Interterm', 'Spring', 'Summer', 'Fall')
+_SEASON_RE = re.compile(r'\b(interterm|spring|summer|fall)\b', re.IGNORECASE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    term_order INTEGER NOT NULL,
+    source_path TEXT NOT NULL,
+    source_size INTEGER NOT NULL,
+    source_mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    term TEXT NOT NULL,
+    term_order INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    course TEXT NOT NULL,
+    title TEXT,
+    status TEXT,
+    days TEXT,
+    time TEXT,
+    seats TEXT
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course TEXT PRIMARY KEY,
+    title TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sections_course ON sections (course, term_order);
+CREATE INDEX IF NOT EXISTS idx_sections_term ON sections (term);
+CREATE INDEX IF NOT EXISTS idx_sections_season ON sections (season, course);
+"""
+
+
+def term_order(term: str) -> int:
+    """'Spring 2025' -> sortable int (same ordering as the scraper's get_term_order)."""
+    season, _, year = term.strip().partition(' ')
+    season = season.capitalize()
+    if season not in SEASONS or not year.strip().isdigit():
+        raise ValueError(f"Unrecognized term: {term!r}")
+    return int(year) * 4 + SEASONS.index(season)
+
+
+class OfferingStore:
+    """Section-level course offerings from data/course_listings/<TERM>.csv in an indexed SQLite file.
+
+    Each CSV is one term (as written by src/scraper/scrape_pw.py). ``sync`` loads new terms and
+    reloads a term only when its file changed, so appending a new term never rewrites old ones.
+    """
+
+    def __init__(self, db_path: str):
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def terms(self) -> List[str]:
+        with self._lock:
+            return [r['term'] for r in self._conn.execute('SELECT term FROM terms ORDER BY term_order')]
+
+    def ingest_csv(self, path: str) -> Optional[int]:
+        """Load one term file; returns the section count, or None if it is unchanged since the last load."""
+        st = os.stat(path)
+        term = Path(path).stem
+        with self._lock:
+            row = self._conn.execute('SELECT source_size, source_mtime_ns FROM terms WHERE term = ?',
+                                     (term,)).fetchone()
+        if row is not None and (row['source_size'], row['source_mtime_ns']) == (st.st_size, st.st_mtime_ns):
+            return None
+
+        order, season = term_order(term), term.split()[0].capitalize()
+        sections, courses = [], {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for rec in csv.DictReader(f):
+                # A file can be re-appended by the scraper, so the header may repeat mid-file
+                if rec.get('Class') in (None, 'Class'):
+                    continue
+                code = normalize_course_code(rec['Class'])
+                if not code:
+                    continue
+                sections.append((term, order, season, code, rec.get('Title', ''), rec.get('Status', ''),
+                                 rec.get('Days', ''), rec.get('Time', ''), rec.get('Seats', '')))
+                courses[code] = (code, (rec.get('Title') or '').split(' - ')[0], rec.get('Description', ''))
+
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM sections WHERE term = ?', (term,))
+            self._conn.executemany('INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', sections)
+            self._conn.executemany('INSERT OR REPLACE INTO courses VALUES (?, ?, ?)', courses.values())
+            self._conn.execute('INSERT OR REPLACE INTO terms VALUES (?, ?, ?, ?, ?)',
+                               (term, order, str(path), st.st_size, st.st_mtime_ns))
+        return len(sections)
+
+    def sync(self, listings_dir: str) -> Dict[str, int]:
+        """Ingest every new or changed term CSV; returns {term: sections loaded}."""
+        loaded = {}
+        for path in sorted(Path(listings_dir).glob('*.csv')):
+            try:
+                count = self.ingest_csv(str(path))
+            except (OSError, ValueError, KeyError, csv.Error) as e:
+                print(f"Warning: Could not load course listings {path.name}: {e}")
+                continue
+            if count is not None:
+                loaded[path.stem] = count
+        return loaded
+
+    def offerings(self, code: str, season: str = None) -> List[Dict]:
+        """Sections of a course, newest term first, optionally restricted to one season."""
+        code = normalize_course_code(code) or code
+        sql = 'SELECT term, title, status, days, time, seats FROM sections WHERE course = ?'
+        args = [code]
+        if season:
+            sql += ' AND season = ?'
+            args.append(season.capitalize())
+        sql += ' ORDER BY term_order DESC, rowid'
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, args)]
+
+    def seasons(self, code: str) -> List[str]:
+        code = normalize_course_code(code) or code
+        with self._lock:
+            found = {r['season'] for r in self._conn.execute(
+                'SELECT DISTINCT season FROM sections WHERE course = ?', (code,))}
+        return [s for s in SEASONS if s in found]
+
+    def summary_text(self, code: str, season: str = None) -> Optional[str]:
+        """Plain-text offering history for the LLM; None when the course never appears in the listings."""
+        code = normalize_course_code(code) or code
+        seasons = self.seasons(code)
+        if not seasons:
+            return None
+        number = display_course_code(code) or code
+        with self._lock:
+            row = self._conn.execute('SELECT title FROM courses WHERE course = ?', (code,)).fetchone()
+        title = f" {row['title']}" if row and row['title'] else ''
+        lines = [f"{number}{title} — offered in: {', '.join(seasons)} (from {len(self.terms())} scraped terms)"]
+        if season and season.capitalize() not in seasons:
+            lines.append(f"Not listed in any {season.capitalize()} term.")
+        by_term: Dict[str, List[Dict]] = {}
+        for section in self.offerings(code, season):
+            by_term.setdefault(section['term'], []).append(section)
+        for term, sections in by_term.items():
+            parts = [' '.join(p for p in (s['days'], s['time']) if p) or 'time TBA' for s in sections]
+            status = ', '.join(f"{s['status']} {s['seats']}".strip() for s in sections)
+            lines.append(f"{term}: {len(sections)} section(s) — {'; '.join(parts)} [{status}]")
+        return '\n'.join(lines)
+
+
+def mentioned_season(query: str) -> Optional[str]:
+    m = _SEASON_RE.search(query)
+    return m.group(1).capitalize() if m else None
+
+
+def load_offering_store(config: dict) -> Optional[OfferingStore]:
+    """Open the offering index and incrementally load any new or changed term CSVs."""
+    root = get_project_root()
+    listings_dir = config.get('data_directories', {}).get('course_listings', 'data/course_listings')
+    listings_dir = listings_dir if os.path.isabs(listings_dir) else os.path.join(root, listings_dir)
+    db_path = config.get('course_offerings', {}).get('db_path', '.cache/course_offerings.sqlite')
+    db_path = db_path if os.path.isabs(db_path) else os.path.join(root, db_path)
+    if not os.path.isdir(listings_dir):
+        return None
+    store = OfferingStore(db_path)
+    loaded = store.sync(listings_dir)
+    if loaded:
+        print(f"Loaded course listings: {', '.join(f'{t} ({n} sections)' for t, n in loaded.items())}")
+    return store
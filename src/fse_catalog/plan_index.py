@@ -0,0 +1,77 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from fse_catalog.course_codes import display_course_code, normalize_course_code
+from fse_catalog.model import CatalogStore, FourYearPlan, PlanTerm, get_catalog_store
+
+WHEN_QUERY_RE = re.compile(
+    r'when (?:should|do|can|would|will) (?:i|we|students?) take|(?:what|which) (?:semester|year|term) '
+    r'(?:should|do|can|is)|when is .{0,40}\b(?:taken|offered|scheduled)',
+    re.IGNORECASE,
+)
+
+
+class PlanIndex:
+    """Structured 4-year plans indexed by (program, catalog year) and course code.
+
+    Answers "when should I take CPSC 406" by direct lookup: each course code maps to every
+    plan term it is scheduled in (colloquia such as CPSC 298 appear in several).
+    """
+
+    def __init__(self, plans: List[FourYearPlan]):
+        self.plans: Dict[Tuple[str, str], FourYearPlan] = {(p.program_code, p.catalog_year): p for p in plans}
+        self._terms: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        for key, plan in self.plans.items():
+            by_code = self._terms.setdefault(key, {})
+            for n, term in enumerate(plan.terms):
+                for course in term.courses:
+                    terms = by_code.setdefault(course.code, [])
+                    if n not in terms:
+                        terms.append(n)
+
+    @classmethod
+    def from_store(cls, store: CatalogStore) -> 'PlanIndex':
+        return cls(list(store.plans.values()))
+
+    def plan(self, program: str, year: str = None) -> Optional[FourYearPlan]:
+        """The requested plan year, else the newest structured plan for the program."""
+        if (program, str(year)) in self.plans:
+            return self.plans[(program, str(year))]
+        years = sorted((y for p, y in self.plans if p == program), reverse=True)
+        return self.plans[(program, years[0])] if years else None
+
+    def lookup(self, program: str, code: str, year: str = None) -> List[Dict]:
+        """Every term the course is planned in: [{'year': 4, 'semester': 'Spring', 'credits': 3, ...}]."""
+        plan = self.plan(program, year)
+        code = normalize_course_code(code) or code
+        if plan is None:
+            return []
+        placements = []
+        for n in self._terms[(plan.program_code, plan.catalog_year)].get(code, []):
+            term = plan.terms[n]
+            course = next(c for c in term.courses if c.code == code)
+            placements.append({'year': term.year, 'semester': term.semester, 'credits': course.credits,
+                               'title': course.title, 'category': course.category})
+        return placements
+
+    def semester(self, program: str, plan_year: int, semester: str, year: str = None) -> Optional[PlanTerm]:
+        plan = self.plan(program, year)
+        if plan is None:
+            return None
+        return next((t for t in plan.terms if t.year == plan_year and t.semester.lower() == semester.lower()), None)
+
+    def when_text(self, program: str, code: str, year: str = None) -> Optional[str]:
+        placements = self.lookup(program, code, year)
+        if not placements:
+            return None
+        plan = self.plan(program, year)
+        number = display_course_code(code) or code
+        terms = ', '.join(f"Year {p['year']} {p['semester']}" for p in placements)
+        first = placements[0]
+        return (f"{number} {first['title']} ({first['credits']} credits) is scheduled in {terms} "
+                f"of the {plan.program} {plan.catalog_year} 4-year plan.")
+
+
+def load_plan_index(config: dict) -> Optional[PlanIndex]:
+    store = get_catalog_store(config)
+    return PlanIndex.from_store(store) if store is not None and store.plans else None
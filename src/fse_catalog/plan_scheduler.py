@@ -0,0 +1,208 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+from fse_catalog.course_codes import display_course_code, normalize_course_code
+from fse_catalog.model import FourYearPlan, get_catalog_store
+from fse_catalog.prereq_graph import PrereqGraph, PrereqGraphSet, load_prereq_graphs
+
+PLAN_QUERY_RE = re.compile(r'\b(?:4|four)[- ]year plan|semester (?:by semester )?plan|plan (?:out )?my (?:courses|semesters)',
+                           re.IGNORECASE)
+
+_SEMESTERS = ('Fall', 'Spring')
+_DEFAULT_CREDITS = 3
+
+
+class PlanScheduler:
+    """Deterministic list scheduler over a 4-year curriculum and the catalog prerequisite graph.
+
+    Curriculum courses keep their recommended semester unless a prerequisite or the credit
+    cap forces them later; extra courses (e.g. a minor) go in the earliest semester where
+    their prerequisites are met and credits remain. Prerequisites that appear nowhere in the
+    plan (placement-exam math, transfer credit) are assumed satisfied and reported.
+    """
+
+    def __init__(self, curriculum: FourYearPlan, graph: Optional[PrereqGraph], credit_cap: int = 18,
+                 fallback_graphs: PrereqGraphSet = None):
+        self.curriculum = curriculum
+        self.graph = graph
+        self.credit_cap = credit_cap
+        self.fallback_graphs = fallback_graphs
+
+    def _graph_for(self, code: str) -> Optional[PrereqGraph]:
+        """The program's own catalog first; other programs' catalogs for out-of-major (minor) courses."""
+        if self.graph is not None and code in self.graph:
+            return self.graph
+        if self.fallback_graphs is not None:
+            graph = self.fallback_graphs.get(course=code)
+            if graph is not None and code in graph:
+                return graph
+        return None
+
+    def schedule(self, completed: Iterable[str] = (), extra_courses: Iterable[Dict] = ()) -> Dict:
+        done = {normalize_course_code(c) or c for c in completed}
+
+        items = []
+        for term_index, term in enumerate(self.curriculum.terms):
+            for course in term.courses:
+                if course.code in done:
+                    continue
+                items.append({'code': course.code, 'title': course.title, 'credits': course.credits,
+                              'category': course.category, 'preferred': term_index, 'extra': False})
+        planned_codes = {i['code'] for i in items}
+        for course in extra_courses:
+            code = normalize_course_code(course.get('code', '')) or course.get('code', '')
+            if code in planned_codes or code in done:
+                continue
+            planned_codes.add(code)
+            items.append(dict(course, code=code, credits=course.get('credits') or _DEFAULT_CREDITS,
+                              category=course.get('category', 'extra'), preferred=0, extra=True))
+        items = [dict(item, order=n) for n, item in enumerate(items)]
+        pending = sorted(items, key=lambda i: (i['extra'], i['preferred'], i['order']))
+
+        # Plans bundle lab sections into the lecture's credits (CENG231 at 4 credits covers CENG231L)
+        known = planned_codes | done
+        known |= {f"{c}L" for c in known}
+        assumed = set()
+        unknown = sorted(i['code'] for i in items if i['extra'] and self._graph_for(i['code']) is None)
+        scheduled_before = set(done)
+        semesters = []
+        term_index = 0
+        max_terms = len(self.curriculum.terms) + 4
+
+        def groups_met(groups, available):
+            for group in groups:
+                if any(c in available for c in group):
+                    continue
+                if not any(c in known for c in group):
+                    assumed.update(group)
+                    continue
+                return False
+            return True
+
+        def taken(codes):
+            return codes | {f"{c}L" for c in codes}
+
+        def prereqs_met(item):
+            graph = self._graph_for(item['code'])
+            return graph is None or groups_met(graph.prerequisites(item['code']), scheduled_before)
+
+        def coreqs(item):
+            graph = self._graph_for(item['code'])
+            return graph.corequisites(item['code']) if graph is not None else ()
+
+        def coreq_bundle(item, available):
+            """``item`` plus the pending courses that must be taken with it this term; None if one cannot be."""
+            bundle = [item]
+            available = available | {item['code']}
+            for group in coreqs(item):
+                if groups_met([group], taken(available)):
+                    continue
+                partner = next((p for p in pending if p is not item and p['code'] in group
+                                and p['preferred'] <= term_index and prereqs_met(p)), None)
+                if partner is None:
+                    return None
+                if partner not in bundle:
+                    bundle.append(partner)
+            codes = available | {b['code'] for b in bundle}
+            if not all(groups_met(coreqs(b), taken(codes)) for b in bundle[1:]):
+                return None
+            return bundle
+
+        while pending and term_index < max_terms:
+            term = {'year': term_index // 2 + 1, 'semester': _SEMESTERS[term_index % 2],
+                    'credits': 0, 'courses': []}
+            this_term = set()
+            placed = True
+            while placed:
+                placed = False
+                for item in list(pending):
+                    if item not in pending or item['preferred'] > term_index:
+                        continue
+                    if term['credits'] + (item.get('credits') or 0) > self.credit_cap or not prereqs_met(item):
+                        continue
+                    # Corequisites count only once taken or placed this term, so a pair lands together
+                    bundle = coreq_bundle(item, scheduled_before | this_term)
+                    if bundle is None:
+                        continue
+                    credits = sum(b.get('credits') or 0 for b in bundle)
+                    if term['credits'] + credits > self.credit_cap:
+                        continue
+                    for b in bundle:
+                        pending.remove(b)
+                        term['courses'].append(b)
+                        this_term.add(b['code'])
+                    term['credits'] += credits
+                    placed = True
+            term['courses'].sort(key=lambda i: i['order'])
+            semesters.append(term)
+            scheduled_before |= this_term
+            term_index += 1
+
+        moved = []
+        for index, term in enumerate(semesters):
+            for item in term['courses']:
+                if not item['extra'] and index > item['preferred']:
+                    moved.append({'code': item['code'], 'from_term': item['preferred'], 'to_term': index})
+            term['courses'] = [
+                {k: item.get(k) for k in ('code', 'title', 'credits', 'category')} for item in term['courses']
+            ]
+        while semesters and not semesters[-1]['courses']:
+            semesters.pop()
+
+        return {
+            'program': self.curriculum.program,
+            'catalog_year': self.curriculum.catalog_year,
+            'prereq_catalog_year': self.graph.year if self.graph else None,
+            'credit_cap': self.credit_cap,
+            'semesters': semesters,
+            'total_credits': sum(t['credits'] for t in semesters),
+            'moved': moved,
+            'assumed_prerequisites': sorted(assumed - known),
+            'unknown_prerequisites': unknown,
+            'unscheduled': [i['code'] for i in pending],
+            'valid': not pending,
+        }
+
+
+def format_schedule(plan: Dict) -> str:
+    """Compact plain-text rendering for the LLM to narrate."""
+    lines = [f"Generated semester plan: {plan['program']} ({plan['catalog_year']} curriculum, "
+             f"prerequisites from the {plan['prereq_catalog_year']} catalog, max {plan['credit_cap']} credits/term)"]
+    for term in plan['semesters']:
+        courses = ', '.join(
+            f"{display_course_code(c['code']) or c['code']} {c.get('title') or ''}".strip()
+            + f" ({c.get('credits')})" for c in term['courses']
+        )
+        lines.append(f"Year {term['year']} {term['semester']} [{term['credits']} cr]: {courses}")
+    lines.append(f"Total credits: {plan['total_credits']}")
+    if plan['moved']:
+        lines.append('Moved later for prerequisites or credit cap: ' + ', '.join(
+            f"{display_course_code(m['code']) or m['code']}" for m in plan['moved']))
+    if plan['assumed_prerequisites']:
+        lines.append('Assumed already satisfied (placement or transfer): ' + ', '.join(
+            display_course_code(c) or c for c in plan['assumed_prerequisites']))
+    if plan['unknown_prerequisites']:
+        lines.append('Not in any catalog, prerequisites not checked: ' + ', '.join(
+            display_course_code(c) or c for c in plan['unknown_prerequisites']))
+    if plan['unscheduled']:
+        lines.append('Could not schedule: ' + ', '.join(plan['unscheduled']))
+    return '\n'.join(lines)
+
+
+def minor_courses(config: dict, minor: str) -> Optional[List[Dict]]:
+    """Extra courses for a minor from plan_scheduler.minor_courses; None if the minor is not listed."""
+    codes = config.get('plan_scheduler', {}).get('minor_courses', {}).get(minor)
+    if not codes:
+        return None
+    return [{'code': code, 'category': f"{minor} minor"} for code in codes]
+
+
+def load_plan_scheduler(config: dict, program: str, graphs: PrereqGraphSet = None) -> Optional[PlanScheduler]:
+    cfg = config.get('plan_scheduler', {})
+    store = get_catalog_store(config)
+    curriculum = store.plan(program, cfg.get('curriculum_year')) if store is not None else None
+    if curriculum is None:
+        return None
+    graphs = graphs if graphs is not None else load_prereq_graphs(config)
+    graph = graphs.get(program, curriculum.catalog_year) if graphs else None
+    return PlanScheduler(curriculum, graph, cfg.get('credit_cap', 18), fallback_graphs=graphs)
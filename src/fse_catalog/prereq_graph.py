@@ -0,0 +1,213 @@
+import re
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from fse_catalog.course_codes import display_course_code, find_course_codes, normalize_course_code
+from fse_catalog.model import Catalog, CatalogStore, get_catalog_store
+
+# A requirement is in conjunctive normal form: every group must be satisfied, and a
+# group is satisfied by any one of its courses. "CENG 231 or CPSC 231, EENG 200"
+# compiles to (("CENG231", "CPSC231"), ("EENG200",)).
+Groups = Tuple[Tuple[str, ...], ...]
+
+PREREQ_QUERY_RE = re.compile(
+    r'prereq|pre-req|requisite|before (?:i )?(?:can )?tak|need (?:to take )?before|eligible', re.IGNORECASE
+)
+UNLOCK_QUERY_RE = re.compile(
+    r'unlock|open(?:s)? up|lead(?:s)? to|after (?:taking|i take|completing)|what can i take after', re.IGNORECASE
+)
+
+_AND_SPLIT_RE = re.compile(r'\s*[,;]\s*|\s+and\s+|\.\s+', re.IGNORECASE)
+_OR_SPLIT_RE = re.compile(r'\s+or\s+', re.IGNORECASE)
+_LEADING_OR_RE = re.compile(r'^or\s+', re.IGNORECASE)
+_LEADING_AND_RE = re.compile(r'^and\s+', re.IGNORECASE)
+
+
+def parse_requisites(text: str) -> Tuple[Groups, str]:
+    """Compile a catalog prerequisite string into CNF course groups plus any non-course notes.
+
+    Clauses are split on commas, semicolons and "and"; a clause that starts with "or"
+    extends the previous group ("CPSC 230, or equivalent"). Alternatives that are not
+    courses ("consent of instructor", "AP/IB Biology score of 4 or 5") are kept as notes
+    and make the group waivable rather than dropping it.
+    """
+    if not text:
+        return (), ''
+    groups: List[List[str]] = []
+    notes: List[str] = []
+    for clause in _AND_SPLIT_RE.split(text.strip()):
+        clause = _LEADING_AND_RE.sub('', clause.strip())
+        if not clause:
+            continue
+        extends_previous = bool(_LEADING_OR_RE.match(clause)) and groups
+        clause = _LEADING_OR_RE.sub('', clause)
+        codes = []
+        for alternative in _OR_SPLIT_RE.split(clause):
+            found = find_course_codes(alternative)
+            if found:
+                codes.extend(c for c in found if c not in codes)
+            elif alternative.strip():
+                notes.append(alternative.strip())
+        if not codes:
+            continue
+        if extends_previous:
+            groups[-1].extend(c for c in codes if c not in groups[-1])
+        else:
+            groups.append(codes)
+    return tuple(tuple(g) for g in groups), '; '.join(notes)
+
+
+class PrereqGraph:
+    """Prerequisite DAG for one (program, catalog year) with precomputed transitive closures."""
+
+    def __init__(self, program: str, year: str, prereqs: Dict[str, Groups],
+                 coreqs: Dict[str, Groups] = None, notes: Dict[str, str] = None):
+        self.program = program
+        self.year = str(year)
+        self.prereqs = prereqs
+        self.coreqs = coreqs or {}
+        self.notes = notes or {}
+
+        self._unlocks: Dict[str, set] = {}
+        for course, groups in prereqs.items():
+            for group in groups:
+                for code in group:
+                    self._unlocks.setdefault(code, set()).add(course)
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        self._descendants: Dict[str, FrozenSet[str]] = {}
+        for course in set(prereqs) | set(self._unlocks):
+            self.ancestors(course)
+            self.descendants(course)
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> 'PrereqGraph':
+        prereqs, coreqs, notes = {}, {}, {}
+        for code, course in catalog.courses.items():
+            prereqs[code], note = parse_requisites(course.prerequisite)
+            coreq_groups, _ = parse_requisites(course.corequisite)
+            if coreq_groups:
+                coreqs[code] = coreq_groups
+            if note:
+                notes[code] = note
+        return cls(catalog.program_code, catalog.year, prereqs, coreqs, notes)
+
+    def _closure(self, code: str, edges, memo: Dict[str, FrozenSet[str]]) -> FrozenSet[str]:
+        if code in memo:
+            return memo[code]
+        memo[code] = frozenset()   # cycle guard; catalogs should be acyclic
+        result = set()
+        for nxt in edges(code):
+            result.add(nxt)
+            result |= self._closure(nxt, edges, memo)
+        result.discard(code)
+        memo[code] = frozenset(result)
+        return memo[code]
+
+    def _prereq_edges(self, code: str) -> List[str]:
+        return [c for group in self.prereqs.get(code, ()) for c in group]
+
+    def _unlock_edges(self, code: str) -> List[str]:
+        return sorted(self._unlocks.get(code, ()))
+
+    def __contains__(self, code: str) -> bool:
+        return normalize_course_code(code) in self.prereqs
+
+    def prerequisites(self, code: str) -> Groups:
+        return self.prereqs.get(normalize_course_code(code) or '', ())
+
+    def corequisites(self, code: str) -> Groups:
+        return self.coreqs.get(normalize_course_code(code) or '', ())
+
+    def ancestors(self, code: str) -> FrozenSet[str]:
+        """Every course that may be required, directly or transitively, before `code`."""
+        return self._closure(normalize_course_code(code) or code, self._prereq_edges, self._ancestors)
+
+    def descendants(self, code: str) -> FrozenSet[str]:
+        """Every course that `code` is (transitively) a prerequisite for."""
+        return self._closure(normalize_course_code(code) or code, self._unlock_edges, self._descendants)
+
+    def unlocks(self, code: str) -> List[str]:
+        """Courses that list `code` directly as a prerequisite."""
+        return sorted(self._unlocks.get(normalize_course_code(code) or '', ()))
+
+    def is_satisfied(self, code: str, completed: Iterable[str]) -> bool:
+        done = {normalize_course_code(c) for c in completed}
+        return all(any(c in done for c in group) for group in self.prerequisites(code))
+
+    @staticmethod
+    def format_groups(groups: Groups) -> str:
+        return ' and '.join(
+            ' or '.join(display_course_code(c) for c in group) if len(group) == 1
+            else '(' + ' or '.join(display_course_code(c) for c in group) + ')'
+            for group in groups
+        )
+
+    def prerequisite_chain(self, code: str) -> str:
+        """Readable breadth-first prerequisite chain, suitable as LLM context."""
+        code = normalize_course_code(code)
+        lines = [f"Prerequisite chain for {display_course_code(code)} ({self.program} {self.year} catalog):"]
+        queue, seen = deque([code]), {code}
+        while queue:
+            current = queue.popleft()
+            groups = self.prereqs.get(current, ())
+            note = self.notes.get(current)
+            if groups:
+                line = f"- {display_course_code(current)} requires {self.format_groups(groups)}"
+                if note:
+                    line += f" (or: {note})"
+                lines.append(line)
+            elif current == code:
+                lines.append(f"- {display_course_code(current)} has no course prerequisites"
+                             + (f" ({note})" if note else ''))
+            coreqs = self.coreqs.get(current)
+            if coreqs:
+                lines.append(f"- {display_course_code(current)} corequisite: {self.format_groups(coreqs)}")
+            for nxt in self._prereq_edges(current):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        ancestors = sorted(self.ancestors(code))
+        if ancestors:
+            lines.append('All courses that may be needed first: '
+                         + ', '.join(display_course_code(c) for c in ancestors))
+        return '\n'.join(lines)
+
+    def unlock_summary(self, code: str) -> str:
+        code = normalize_course_code(code)
+        direct = self.unlocks(code)
+        lines = [f"Courses unlocked by {display_course_code(code)} ({self.program} {self.year} catalog):"]
+        if not direct:
+            lines.append(f"- No {self.program} catalog course lists {display_course_code(code)} as a prerequisite")
+        for course in direct:
+            lines.append(f"- {display_course_code(course)} (requires {self.format_groups(self.prereqs[course])})")
+        later = sorted(self.descendants(code) - set(direct))
+        if later:
+            lines.append('Eventually leads to: ' + ', '.join(display_course_code(c) for c in later))
+        return '\n'.join(lines)
+
+
+class PrereqGraphSet:
+    """All compiled graphs keyed by (program code, catalog year)."""
+
+    def __init__(self, graphs: Iterable[PrereqGraph] = ()):
+        self.graphs: Dict[Tuple[str, str], PrereqGraph] = {(g.program, g.year): g for g in graphs}
+
+    @classmethod
+    def from_store(cls, store: CatalogStore) -> 'PrereqGraphSet':
+        return cls(PrereqGraph.from_catalog(c) for c in store.iter_catalogs())
+
+    def get(self, program: str = None, year: str = None, course: str = None) -> Optional[PrereqGraph]:
+        """Graph for the student's program/year; falls back to the newest catalog containing the course."""
+        if program and year and (program, str(year)) in self.graphs:
+            return self.graphs[(program, str(year))]
+        candidates = sorted(self.graphs.values(), key=lambda g: g.year, reverse=True)
+        if program:
+            candidates = [g for g in candidates if g.program == program] or candidates
+        if course:
+            candidates = [g for g in candidates if course in g] or candidates
+        return candidates[0] if candidates else None
+
+
+def load_prereq_graphs(config: dict) -> Optional[PrereqGraphSet]:
+    store = get_catalog_store(config)
+    return PrereqGraphSet.from_store(store) if store is not None else None
@@ -0,0 +1,144 @@
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from fse_catalog.model import Catalog, Course, Section
+
+# Stands in for "2024 catalog" so the same course text from different years hashes identically
+CATALOG_YEARS_PLACEHOLDER = '{catalog_years}'
+
+
+_CATALOG_PDF_RE = re.compile(r'^(\d{4})_([A-Za-z]+)\.pdf$', re.IGNORECASE)
+
+
+def is_catalog_json(file_path: str) -> bool:
+    path = Path(file_path)
+    return path.suffix.lower() == '.json' and 'major_catalog_json' in path.parts
+
+
+def superseded_by_catalog_json(file_path: str, catalogs) -> bool:
+    """True for a major catalog PDF whose program and year are also ingested from catalog JSON.
+
+    ``catalogs`` is ``CatalogStore.catalogs``; indexing both would store every course twice.
+    """
+    path = Path(file_path)
+    m = _CATALOG_PDF_RE.match(path.name)
+    if not m or 'major_catalog' not in path.parts:
+        return False
+    return (m.group(2).lower(), m.group(1)) in catalogs
+
+
+def format_catalog_years(years: Iterable[str]) -> str:
+    """['2022', '2023', '2024'] -> '2022–2024 catalogs'; gaps are listed out."""
+    years = sorted(set(years))
+    if len(years) == 1:
+        return f"{years[0]} catalog"
+    if all(y.isdigit() for y in years) and int(years[-1]) - int(years[0]) == len(years) - 1:
+        return f"{years[0]}–{years[-1]} catalogs"
+    return f"{', '.join(years)} catalogs"
+
+
+def dedup_key(chunk: Dict) -> str:
+    """Content hash of a chunk rendered with CATALOG_YEARS_PLACEHOLDER, scoped to its program."""
+    text = re.sub(r'\s+', ' ', chunk['text']).strip()
+    return hashlib.sha256(f"{chunk['metadata'].get('SubjectCode', '')}\n{text}".encode('utf-8')).hexdigest()
+
+
+def _program_chunk(catalog: Catalog, label: str) -> str:
+    lines = [
+        f"{catalog.program} ({label}) — program requirements",
+        f"Total credits: {catalog.total_credits if catalog.total_credits is not None else 'n/a'}",
+    ]
+    if catalog.gpa:
+        lines.append('GPA: ' + ', '.join(f"{k.replace('_', ' ')} {v}" for k, v in catalog.gpa.items()))
+    if catalog.grade_requirement:
+        lines.append(f"Grade requirement: {catalog.grade_requirement}")
+    if catalog.upper_division_units is not None:
+        lines.append(f"Upper-division units: {catalog.upper_division_units}")
+    if catalog.notes:
+        lines.append(f"Notes: {catalog.notes}")
+    lines.append('Sections: ' + '; '.join(s.name for s in catalog.sections))
+    return '\n'.join(lines)
+
+
+def _section_chunk(section: Section, program: str, label: str) -> str:
+    lines = [f"{program} ({label}) — {section.name}"]
+    if section.credits is not None:
+        lines.append(f"Credits: {section.credits}")
+    if section.notes:
+        lines.append(f"Notes: {section.notes}")
+    if section.courses:
+        lines.append('Courses: ' + ', '.join(f"{c.number} {c.name}".strip() for c in section.courses))
+    for seq in section.sequences:
+        courses = ', '.join(c.number for c in seq.courses)
+        note = f" ({seq.notes})" if seq.notes else ''
+        lines.append(f"Sequence {seq.number if seq.number is not None else '?'}{note}: {courses}")
+    return '\n'.join(lines)
+
+
+def _course_chunk(course: Course, placements: List[str], program: str, label: str) -> str:
+    header = f"{course.number} — {course.name}"
+    if course.credit_hours is not None:
+        header += f" ({course.credit_hours} credits)"
+    lines = [header, f"{program} ({label}), {'; '.join(placements)}"]
+    for value, label in ((course.prerequisite, 'Prerequisite'),
+                         (course.corequisite, 'Corequisite'),
+                         (course.recommended_prerequisite, 'Recommended prerequisite')):
+        if value:
+            lines.append(f"{label}: {value}")
+    if course.description:
+        lines.append(course.description.strip())
+    return '\n'.join(lines)
+
+
+def chunk_catalog(catalog: Catalog, year_label: str = None) -> List[Dict]:
+    """Split one major catalog into program, section and per-course chunks.
+
+    Each chunk is ``{'text': ..., 'metadata': {...}}``; metadata carries the filter fields
+    used by FSEUnifiedRAG plus CourseCode/Section for exact matches. A course listed in
+    several sections or sequences becomes a single chunk naming every placement.
+    ``year_label`` replaces "<year> catalog" in the text (see CATALOG_YEARS_PLACEHOLDER).
+    """
+    year, program = catalog.year, catalog.program
+    label = year_label or f"{year} catalog"
+    base = {
+        'DocumentType': 'major_catalog',
+        'doc_type': 'major_catalog',
+        'Year': year,
+        'SubjectCode': catalog.program_code,
+        'Program': program,
+    }
+
+    chunks = [{'text': _program_chunk(catalog, label), 'metadata': dict(base, ChunkType='program')}]
+
+    placements: Dict[str, Dict] = {}
+    for section in catalog.sections:
+        chunks.append({
+            'text': _section_chunk(section, program, label),
+            'metadata': dict(base, ChunkType='section', Section=section.name),
+        })
+        for course, seq in section.iter_courses():
+            placement = f"{section.name} (Sequence {seq.number if seq.number is not None else '?'})" \
+                if seq else section.name
+            entry = placements.setdefault(course.code, {'course': course, 'placements': [], 'sections': []})
+            if placement not in entry['placements']:
+                entry['placements'].append(placement)
+            if section.name not in entry['sections']:
+                entry['sections'].append(section.name)
+
+    for code, entry in placements.items():
+        course = entry['course']
+        chunks.append({
+            'text': _course_chunk(course, entry['placements'], program, label),
+            'metadata': dict(
+                base,
+                ChunkType='course',
+                CourseCode=code,
+                CourseNumber=course.number,
+                Section=entry['sections'][0],
+                Sections=entry['sections'],
+                CreditHours=course.credit_hours,
+            ),
+        })
+    return chunks
@@ -0,0 +1,123 @@
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+from qdrant_client.models import CreateAlias, CreateAliasOperation, DeleteAlias, DeleteAliasOperation
+
+# Reindexing builds into `<alias>__v<N>` collections and then repoints the alias, so
+# FSEUnifiedRAG keeps querying the configured names while a new version is built.
+_VERSION_SEP = '__v'
+# core_rag's summary indexer writes to `<collection>_summaries`, so a versioned collection's
+# summaries land in `<alias>__v<N>_summaries` and are aliased as `<alias>_summaries`.
+SUMMARY_SUFFIX = '_summaries'
+
+
+def versioned_name(alias: str, version: int, suffix: str = '') -> str:
+    return f"{alias}{_VERSION_SEP}{version}{suffix}"
+
+
+def list_versions(client, alias: str, suffix: str = '') -> List[int]:
+    pattern = re.compile(rf'^{re.escape(alias)}{_VERSION_SEP}(\d+){re.escape(suffix)}$')
+    versions = []
+    for collection in client.get_collections().collections:
+        m = pattern.match(collection.name)
+        if m:
+            versions.append(int(m.group(1)))
+    return sorted(versions)
+
+
+def next_version(client, alias: str) -> int:
+    versions = list_versions(client, alias)
+    return versions[-1] + 1 if versions else 1
+
+
+def alias_targets(client) -> Dict[str, str]:
+    return {a.alias_name: a.collection_name for a in client.get_aliases().aliases}
+
+
+def current_target(client, alias: str) -> Optional[str]:
+    return alias_targets(client).get(alias)
+
+
+def validate_point_counts(client, new_to_old: Dict[str, Optional[str]],
+                          min_ratio: float = 0.9) -> List[str]:
+    """Return a list of problems; an empty list means every new collection is safe to promote."""
+    problems = []
+    for new, old in new_to_old.items():
+        new_count = client.count(collection_name=new, exact=True).count
+        if new_count == 0:
+            problems.append(f"'{new}' is empty")
+            continue
+        if old:
+            old_count = client.count(collection_name=old, exact=True).count
+            if old_count and new_count < old_count * min_ratio:
+                problems.append(
+                    f"'{new}' has {new_count} points, below {min_ratio:.0%} of '{old}' ({old_count})"
+                )
+    return problems
+
+
+def swap_aliases(client, alias_to_collection: Dict[str, str]):
+    """Point every alias at its new collection in a single atomic Qdrant request."""
+    existing_aliases = alias_targets(client)
+    existing_collections = {c.name for c in client.get_collections().collections}
+
+    # One-time migration: a plain collection occupies the alias name. The alias is created
+    # first (aliases win name resolution), then the legacy collection is dropped, so the name
+    # never resolves to nothing. If the server refuses an alias shadowing a collection, the
+    # legacy collection is deleted right before the alias is created instead.
+    migrated = set()
+    for alias, collection in alias_to_collection.items():
+        if alias in existing_aliases or alias not in existing_collections:
+            continue
+        print(f"Replacing legacy collection '{alias}' with an alias")
+        create = [CreateAliasOperation(create_alias=CreateAlias(collection_name=collection, alias_name=alias))]
+        try:
+            client.update_collection_aliases(change_aliases_operations=create)
+        except Exception:
+            client.delete_collection(alias)
+            client.update_collection_aliases(change_aliases_operations=create)
+        else:
+            client.delete_collection(alias)
+        migrated.add(alias)
+
+    operations = []
+    for alias, collection in alias_to_collection.items():
+        if alias in migrated:
+            continue
+        if alias in existing_aliases:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+        operations.append(CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=collection, alias_name=alias)
+        ))
+    if operations:
+        client.update_collection_aliases(change_aliases_operations=operations)
+
+
+def garbage_collect(client, alias: str, keep: int = 2, suffix: str = '') -> List[str]:
+    """Delete old versions of an alias, keeping the newest `keep` and whatever is live.
+
+    With ``suffix`` the companion collections (``<alias>__v<N><suffix>``, aliased as
+    ``<alias><suffix>``) are collected instead.
+    """
+    live = current_target(client, f"{alias}{suffix}")
+    versions = list_versions(client, alias, suffix)
+    keep_names = {versioned_name(alias, v, suffix) for v in versions[-keep:]} if keep > 0 else set()
+    deleted = []
+    for version in versions:
+        name = versioned_name(alias, version, suffix)
+        if name in keep_names or name == live:
+            continue
+        client.delete_collection(name)
+        deleted.append(name)
+    return deleted
+
+
+def corpus_version(client, aliases) -> str:
+    """Short, stable identifier of the collections currently behind the given aliases.
+
+    Changes whenever any alias is swapped, so downstream caches can key on it.
+    """
+    targets = alias_targets(client)
+    parts = [f"{alias}={targets.get(alias, alias)}" for alias in sorted(aliases)]
+    return hashlib.sha1(';'.join(parts).encode('utf-8')).hexdigest()[:12]
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Vectors are stored as float16 in a single memory-mapped file; the JSON index maps
+# a content key to its slot in that file. Freed slots are reused before the file grows.
+_VECTORS_FILE = 'vectors.f16'
+_INDEX_FILE = 'index.json'
+_GROW_SLOTS = 1024
+
+
+def embedding_fingerprint(config: dict) -> str:
+    """Identify everything that changes the vector produced for a given text."""
+    emb = config.get('embedding', {})
+    keys = ('model', 'dimension', 'add_prefixes', 'lowercase',
+            'normalize_unicode', 'collapse_whitespace', 'dehyphenate')
+    return json.dumps({k: emb.get(k) for k in keys}, sort_keys=True)
+
+
+class EmbeddingCache:
+
+    def __init__(self, cache_dir: str, dimension: int, fingerprint: str = '',
+                 max_size_mb: float = 2048, readonly: bool = False):
+        # A readonly cache is a lookup view for another process (the RAG engine) while
+        # ingestion owns writes; it never touches the files and can refresh() its index.
+        self.cache_dir = Path(cache_dir)
+        self.readonly = readonly
+        if not readonly:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.dimension = int(dimension)
+        self.fingerprint = fingerprint
+        self.slot_bytes = self.dimension * 2
+        self.max_entries = max(1, int(max_size_mb * 1024 * 1024) // self.slot_bytes)
+
+        self._entries: Dict[str, List[int]] = {}   # key -> [slot, last_used]
+        self._free: List[int] = []
+        self._capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._clock = 0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index_mtime = None
+
+        self._load()
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha256(self.fingerprint.encode('utf-8'))
+        h.update(b'\0')
+        h.update(text.encode('utf-8'))
+        return h.hexdigest()
+
+    def _load(self):
+        index_path = self.cache_dir / _INDEX_FILE
+        vectors_path = self.cache_dir / _VECTORS_FILE
+        if index_path.exists() and vectors_path.exists():
+            try:
+                self._index_mtime = os.path.getmtime(index_path)
+                with open(index_path, 'r') as f:
+                    index = json.load(f)
+                if index.get('dimension') == self.dimension and index.get('fingerprint') == self.fingerprint:
+                    self._entries = {k: list(v) for k, v in index.get('entries', {}).items()}
+                    self._free = list(index.get('free', []))
+                    self._clock = int(index.get('clock', 0))
+                    self._capacity = os.path.getsize(vectors_path) // self.slot_bytes
+                else:
+                    print("Embedding cache fingerprint changed; starting a fresh cache")
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read embedding cache index, starting fresh: {e}")
+                self._entries, self._free, self._capacity = {}, [], 0
+
+        if self._capacity == 0:
+            self._entries, self._free = {}, []
+            if not self.readonly:
+                vectors_path.write_bytes(b'')
+        self._open_vectors()
+
+    def refresh(self) -> bool:
+        """Reload the index if another process has flushed it since; returns True if reloaded."""
+        try:
+            mtime = os.path.getmtime(self.cache_dir / _INDEX_FILE)
+        except OSError:
+            return False
+        if mtime == self._index_mtime:
+            return False
+        self._entries, self._free, self._capacity = {}, [], 0
+        self._load()
+        return True
+
+    def _open_vectors(self):
+        self._vectors = None
+        if self._capacity:
+            self._vectors = np.memmap(
+                self.cache_dir / _VECTORS_FILE, dtype=np.float16, mode='r' if self.readonly else 'r+',
+                shape=(self._capacity, self.dimension),
+            )
+
+    def _grow(self, needed: int):
+        if self._vectors is not None:
+            self._vectors.flush()
+        new_capacity = min(self.max_entries, max(self._capacity + _GROW_SLOTS, self._capacity + needed))
+        with open(self.cache_dir / _VECTORS_FILE, 'r+b') as f:
+            f.truncate(new_capacity * self.slot_bytes)
+        self._free.extend(range(self._capacity, new_capacity))
+        self._capacity = new_capacity
+        self._open_vectors()
+
+    def _evict(self, count: int):
+        victims = sorted(self._entries.items(), key=lambda kv: kv[1][1])[:count]
+        for key, (slot, _) in victims:
+            del self._entries[key]
+            self._free.append(slot)
+        self.evictions += len(victims)
+
+    def _allocate_slot(self) -> int:
+        if not self._free:
+            if self._capacity < self.max_entries:
+                self._grow(1)
+            else:
+                self._evict(max(1, self.max_entries // 20))
+        return self._free.pop()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        results = []
+        for text in texts:
+            entry = self._entries.get(self.key(text))
+            if entry is None:
+                self.misses += 1
+                results.append(None)
+                continue
+            self.hits += 1
+            if not self.readonly:
+                self._clock += 1
+                entry[1] = self._clock
+                self._dirty = True
+            results.append(self._vectors[entry[0]].astype(np.float32).tolist())
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        if self.readonly:
+            return
+        for text, vector in zip(texts, vectors):
+            if vector is None or len(vector) != self.dimension:
+                continue
+            key = self.key(text)
+            entry = self._entries.get(key)
+            slot = entry[0] if entry else self._allocate_slot()
+            self._vectors[slot] = np.asarray(vector, dtype=np.float16)
+            self._clock += 1
+            self._entries[key] = [slot, self._clock]
+            self._dirty = True
+
+    def flush(self):
+        if self.readonly:
+            return
+        if self._vectors is not None:
+            self._vectors.flush()
+        if not self._dirty:
+            return
+        index = {
+            'dimension': self.dimension,
+            'fingerprint': self.fingerprint,
+            'clock': self._clock,
+            'entries': self._entries,
+            'free': self._free,
+            'updated_at': time.time(),
+        }
+        tmp_path = self.cache_dir / (_INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.cache_dir / _INDEX_FILE)
+        self._dirty = False
+
+    def clear(self):
+        self._entries, self._free, self._capacity = {}, [], 0
+        (self.cache_dir / _VECTORS_FILE).write_bytes(b'')
+        self._open_vectors()
+        self._dirty = True
+        self.flush()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'size_mb': round(self._capacity * self.slot_bytes / (1024 * 1024), 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
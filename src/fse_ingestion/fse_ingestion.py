@@ -1,6 +1,7 @@
 import hashlib
 import os
 import sys
+import uuid
 from datetime import datetime
 from pathlib import Path
 from textwrap import dedent
@@ -9,7 +10,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from pypdf import PdfReader
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
+from qdrant_client.models import (
+    FieldCondition, Filter, FilterSelector, IsEmptyCondition, KeywordIndexParams, KeywordIndexType, MatchValue,
+    PayloadField, PointIdsList, PointStruct, SetPayload, SetPayloadOperation,
+)
 
 from core_rag.ingestion.ingest import UnifiedIngestion
 from core_rag.utils.doc_id import generate_doc_id, get_normalized_path
@@ -18,8 +22,20 @@ from core_rag.ingestion.embedding import EmbeddingGenerator
 from core_rag.ingestion.file_ingest import FileIngestor
 from core_rag.ingestion.json_extract import JSONContentExtractor
 from core_rag.utils.docstore import get_docstore
+from fse_catalog.catalog_diff import adjacent_diff_chunks
+from fse_catalog.model import get_catalog_store, load_catalog_file, load_plan_file
+from fse_ingestion import collection_versions
+from fse_ingestion.catalog_chunker import (
+    CATALOG_YEARS_PLACEHOLDER, chunk_catalog, dedup_key, format_catalog_years, is_catalog_json,
+    superseded_by_catalog_json,
+)
+from fse_ingestion.embedding_cache import EmbeddingCache, embedding_fingerprint
 from fse_ingestion.fse_edit_metadata import FSEMetadataExtractor
-from fse_utils.config_loader import load_config
+from fse_ingestion.plan_chunker import chunk_plan, is_plan_json
+from fse_ingestion.manifest import IngestionManifest
+from fse_utils.config_loader import get_project_root, load_config
+from fse_utils.sentences import scored_sentences
+from fse_utils.tokens import configured_tokenizer, text_stats
 
 try:
     from core_rag.summary import SummaryIndexer, LLAMAINDEX_AVAILABLE
@@ -123,6 +139,84 @@ except ImportError:
     LLAMAINDEX_AVAILABLE = False
 
 
+class CachedEmbeddingGenerator(EmbeddingGenerator):
+    """EmbeddingGenerator that only sends texts missing from the on-disk cache to the server.
+
+    With ``sentence_embeddings``, each chunk's scorable sentences are embedded into the same
+    cache as well, for query-time context compression.
+    """
+
+    def __init__(self, config, cache: EmbeddingCache, sentence_embeddings: bool = False):
+        super().__init__(config)
+        self.cache = cache
+        self.sentence_embeddings = sentence_embeddings
+
+    def _cached_embeddings(self, texts, *args, **kwargs):
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = super().generate_embeddings([texts[i] for i in missing], *args, **kwargs)
+            for i, vector in zip(missing, fresh or []):
+                vectors[i] = vector
+            self.cache.put_many([texts[i] for i in missing], fresh or [])
+        return vectors
+
+    def generate_embeddings(self, texts, *args, **kwargs):
+        texts = list(texts)
+        vectors = self._cached_embeddings(texts, *args, **kwargs)
+        if self.sentence_embeddings:
+            sentences = list(dict.fromkeys(s for t in texts for s in scored_sentences(t or '')))
+            if sentences:
+                try:
+                    self._cached_embeddings(sentences)
+                except Exception as e:
+                    print(f"Warning: Could not embed sentences for context compression: {e}")
+        return vectors
+
+
+def build_embedding_generator(config: dict):
+    cache_cfg = config.get('embedding_cache', {})
+    if not cache_cfg.get('enabled', False):
+        return EmbeddingGenerator(config)
+    cache_dir = cache_cfg.get('dir', '.cache/embeddings')
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(get_project_root(), cache_dir)
+    try:
+        cache = EmbeddingCache(
+            cache_dir,
+            dimension=config['embedding']['dimension'],
+            fingerprint=embedding_fingerprint(config),
+            max_size_mb=cache_cfg.get('max_size_mb', 2048),
+        )
+    except Exception as e:
+        print(f"Warning: Embedding cache disabled: {e}")
+        return EmbeddingGenerator(config)
+    print(f"Embedding cache at {cache_dir} ({cache.stats()['entries']} vectors)")
+    return CachedEmbeddingGenerator(config, cache,
+                                    sentence_embeddings=config.get('context_compression', {}).get('enabled', False))
+
+
+def ensure_payload_indexes(client, collection_name: str, fields, tenant_field: str = None) -> list:
+    """Create keyword payload indexes for filter fields that are not indexed yet.
+
+    Returns the list of fields that were created on this call.
+    """
+    existing = set((client.get_collection(collection_name).payload_schema or {}).keys())
+    created = []
+    for field in fields:
+        if field in existing:
+            continue
+        schema = KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=(field == tenant_field))
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field,
+            field_schema=schema,
+            wait=True,
+        )
+        created.append(field)
+    return created
+
+
 class FSEIngestion(UnifiedIngestion):
 
     def __init__(self):
@@ -136,8 +230,16 @@ class FSEIngestion(UnifiedIngestion):
         )
         self.base_dir = None
         self.collection_name = None
+        ingestion_cfg = self.config.get('ingestion', {})
+        self.manifest = IngestionManifest(ingestion_cfg.get('manifest_path', '.cache/ingest_manifest.json'))
+        self.catalog_chunking = ingestion_cfg.get('catalog_chunking', True)
+        self.cross_year_dedup = ingestion_cfg.get('cross_year_dedup', True)
+        self.plan_chunking = ingestion_cfg.get('plan_chunking', True)
+        self.tokenizer = configured_tokenizer(self.config)
+        diff_cfg = self.config.get('catalog_diff', {})
+        self.catalog_diff_chunks = diff_cfg.get('enabled', False) and diff_cfg.get('ingest_chunks', True)
 
-        self.embedding_gen = EmbeddingGenerator(self.config)
+        self.embedding_gen = build_embedding_generator(self.config)
         chunker = AdvancedChunker(self.config.get('chunker', {}))
         json_extractor = JSONContentExtractor(self.config)
         docstore = get_docstore()
@@ -167,8 +269,143 @@ class FSEIngestion(UnifiedIngestion):
             metadata_extractor=metadata_extractor,
         )
 
+    def _ensure_collections_exist(self):
+        # Names that are live aliases already resolve to a versioned collection; hide them
+        # from core_rag so it does not try to create a plain collection with the same name.
+        mapping = self.config['qdrant']['collections']
+        original = dict(mapping)
+        live_aliases = set(collection_versions.alias_targets(self.client))
+        mapping.clear()
+        mapping.update({k: v for k, v in original.items() if v not in live_aliases})
+        try:
+            super()._ensure_collections_exist()
+        finally:
+            mapping.clear()
+            mapping.update(original)
+        self._ensure_payload_indexes()
+
+    def _ensure_payload_indexes(self):
+        coll_cfg = self.config.get('collection_config', {})
+        for key, collection_name in self.config['qdrant']['collections'].items():
+            per_cfg = coll_cfg.get(key, {})
+            fields = per_cfg.get('payload_indexes', [])
+            if not fields:
+                continue
+            try:
+                created = ensure_payload_indexes(
+                    self.client, collection_name, fields, per_cfg.get('tenant_field'),
+                )
+                if created:
+                    print(f"Created payload indexes on '{collection_name}': {', '.join(created)}")
+            except Exception as e:
+                print(f"Warning: Could not create payload indexes on '{collection_name}': {e}")
+
+    def reindex(self, data_dirs) -> bool:
+        """Blue/green rebuild: ingest into fresh versioned collections, then swap the aliases.
+
+        The live aliases keep serving the previous version until every new collection
+        passes the point-count check, so the bot never sees an empty index. Summary
+        collections of summary-enabled collections are versioned, checked and swapped with them.
+        """
+        alias_cfg = self.config['qdrant'].get('aliasing', {})
+        aliases = dict(self.config['qdrant']['collections'])
+        new_names = {
+            key: collection_versions.versioned_name(alias, collection_versions.next_version(self.client, alias))
+            for key, alias in aliases.items()
+        }
+        coll_cfg = self.config.get('collection_config', {})
+        summary_keys = [key for key in aliases if self.summary_indexer
+                        and coll_cfg.get(key, {}).get('summary_enabled', not coll_cfg)]
+        suffix = collection_versions.SUMMARY_SUFFIX
+
+        # FileIngestor and the summary indexer resolve target collections through this
+        # mapping, so pointing it at the new versions redirects the whole ingestion.
+        self.config['qdrant']['collections'].update(new_names)
+        try:
+            self._ensure_collections_exist()
+            if summary_keys:
+                self.summary_indexer._ensure_summary_collections()
+            self.bulk_ingest(data_dirs)
+        except Exception:
+            self._drop_build(new_names.values())
+            raise
+        finally:
+            self.config['qdrant']['collections'].update(aliases)
+
+        swaps = {aliases[k]: new_names[k] for k in aliases}
+        problems = []
+        for key in summary_keys:
+            new_summary = f"{new_names[key]}{suffix}"
+            if self.client.collection_exists(new_summary):
+                swaps[f"{aliases[key]}{suffix}"] = new_summary
+            else:
+                problems.append(f"'{new_summary}' was not created")
+        new_to_old = {
+            new: collection_versions.current_target(self.client, alias)
+            or (alias if self.client.collection_exists(alias) else None)
+            for alias, new in swaps.items()
+        }
+        problems += collection_versions.validate_point_counts(
+            self.client, new_to_old, alias_cfg.get('min_points_ratio', 0.9),
+        )
+        if problems:
+            print("Reindex validation failed; live aliases left unchanged:")
+            for problem in problems:
+                print(f"  - {problem}")
+            self._drop_build(new_names.values())
+            return False
+
+        collection_versions.swap_aliases(self.client, swaps)
+        print(f"Swapped aliases to: {', '.join(swaps.values())}")
+
+        keep = alias_cfg.get('keep_versions', 2)
+        for alias in aliases.values():
+            for name in collection_versions.garbage_collect(self.client, alias, keep) \
+                    + collection_versions.garbage_collect(self.client, alias, keep, suffix):
+                print(f"Deleted old collection version '{name}'")
+
+        print(f"Corpus version: {collection_versions.corpus_version(self.client, aliases.values())}")
+        return True
+
+    def _drop_build(self, names):
+        """Delete the versioned collections (and their summaries) of a reindex that was not promoted."""
+        for name in names:
+            for collection in (name, f"{name}{collection_versions.SUMMARY_SUFFIX}"):
+                try:
+                    if self.client.collection_exists(collection):
+                        self.client.delete_collection(collection)
+                        print(f"Deleted failed build '{collection}'")
+                except Exception as e:
+                    print(f"Warning: Could not delete failed build '{collection}': {e}")
+
+    def _superseded_by_catalog_json(self, file_path: str) -> bool:
+        if not file_path.lower().endswith('.pdf'):
+            return False
+        store = get_catalog_store(self.config)
+        return store is not None and superseded_by_catalog_json(file_path, store.catalogs)
+
     def ingest_file(self, file_path: str) -> bool:
-        success = self.file_ingestor.ingest_file(file_path)
+        if self._superseded_by_catalog_json(file_path):
+            print(f"Skipping '{Path(file_path).name}': this catalog is ingested from data/major_catalog_json")
+            if self.manifest.get(file_path) is not None:
+                self.delete_file(file_path)
+            return True
+        if self.catalog_chunking and is_catalog_json(file_path):
+            success = self._ingest_catalog_json(file_path)
+            if success and self.catalog_diff_chunks:
+                self._ingest_catalog_diffs(file_path)
+        elif self.plan_chunking and is_plan_json(file_path):
+            success = self._ingest_plan_json(file_path)
+        else:
+            success = self.file_ingestor.ingest_file(file_path)
+            if success:
+                # core_rag writes these points, so their text stats are added afterwards
+                collection_name = self.collection_name or self.file_ingestor.get_last_used_collection()
+                if collection_name:
+                    try:
+                        self.backfill_text_stats(collection_name, generate_doc_id(file_path, self.base_dir))
+                    except Exception as e:
+                        print(f"Warning: Could not add text stats for {file_path}: {e}")
 
         if success and self.summary_indexer and file_path.endswith(('.md', '.txt', '.pdf')):
             collection_name = (
@@ -186,7 +423,261 @@ class FSEIngestion(UnifiedIngestion):
                 except Exception as e:
                     print(f"Warning: Could not generate summary for {file_path}: {e}")
 
+        if success:
+            self.manifest.record(file_path)
+            self.manifest.save()
+        self.flush_embedding_cache()
         return success
 
+    def _ingest_catalog_json(self, file_path: str) -> bool:
+        """Course-level ingestion for data/major_catalog_json (see catalog_chunker)."""
+        try:
+            catalog = load_catalog_file(file_path)
+            if self.cross_year_dedup:
+                return self._ingest_catalog_dedup(file_path, catalog)
+            chunks = chunk_catalog(catalog)
+            if not chunks:
+                return False
+
+            collection_name = self.collection_name or self.config['qdrant']['collections']['major_catalogs']
+            doc_id = generate_doc_id(file_path, self.base_dir)
+            source_path = get_normalized_path(file_path, self.base_dir)
+            vectors = self.embedding_gen.generate_embeddings([c['text'] for c in chunks])
+
+            points = []
+            for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
+                if not vector:
+                    continue
+                payload = dict(chunk['metadata'], chunk_text=chunk['text'], doc_id=doc_id,
+                               source_path=source_path, chunk_index=i,
+                               **text_stats(chunk['text'], self.tokenizer))
+                point_id = hashlib.sha256(f"{doc_id}:{i}".encode()).hexdigest()[:32]
+                points.append(PointStruct(id=point_id, vector=vector, payload=payload))
+            if not points:
+                return False
+
+            self._delete_doc_points(collection_name, doc_id)
+            self.client.upsert(collection_name=collection_name, points=points)
+            print(f"Ingested {len(points)} catalog chunks from '{Path(file_path).name}' into '{collection_name}'")
+            return True
+        except Exception as e:
+            print(f"Error ingesting catalog JSON {file_path}: {e}")
+            return False
+
+    def _ingest_plan_json(self, file_path: str) -> bool:
+        """Structured 4-year plans: one overview chunk and one chunk per semester (see plan_chunker)."""
+        try:
+            chunks = chunk_plan(load_plan_file(file_path))
+            if not chunks:
+                return False
+
+            collection_name = self.collection_name or self.config['qdrant']['collections']['4_year_plans']
+            doc_id = generate_doc_id(file_path, self.base_dir)
+            source_path = get_normalized_path(file_path, self.base_dir)
+            vectors = self.embedding_gen.generate_embeddings([c['text'] for c in chunks])
+
+            points = []
+            for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
+                if not vector:
+                    continue
+                payload = dict(chunk['metadata'], chunk_text=chunk['text'], doc_id=doc_id,
+                               source_path=source_path, chunk_index=i,
+                               **text_stats(chunk['text'], self.tokenizer))
+                point_id = hashlib.sha256(f"{doc_id}:{i}".encode()).hexdigest()[:32]
+                points.append(PointStruct(id=point_id, vector=vector, payload=payload))
+            if not points:
+                return False
+
+            self._delete_doc_points(collection_name, doc_id)
+            self.client.upsert(collection_name=collection_name, points=points)
+            print(f"Ingested {len(points)} plan chunks from '{Path(file_path).name}' into '{collection_name}'")
+            return True
+        except Exception as e:
+            print(f"Error ingesting 4-year plan JSON {file_path}: {e}")
+            return False
+
+    def _ingest_catalog_dedup(self, file_path: str, catalog) -> bool:
+        """Store each catalog chunk once across years.
+
+        Chunks are keyed by their year-neutral text, so a course whose description did not
+        change between 2022 and 2025 is one point with ``Years: [...]`` and one embedding.
+        ``doc_years`` maps each contributing file's doc_id to its year, so deleting or
+        re-ingesting one year only releases that year's reference.
+        """
+        chunks = chunk_catalog(catalog, year_label=CATALOG_YEARS_PLACEHOLDER)
+        if not chunks:
+            return False
+
+        collection_name = self.collection_name or self.config['qdrant']['collections']['major_catalogs']
+        doc_id = generate_doc_id(file_path, self.base_dir)
+        source_path = get_normalized_path(file_path, self.base_dir)
+        keys = [dedup_key(c) for c in chunks]
+        ids = [str(uuid.UUID(k[:32])) for k in keys]
+        existing = {
+            str(r.id): r.payload
+            for r in self.client.retrieve(collection_name=collection_name, ids=ids, with_payload=True)
+        }
+
+        updates, new = [], []
+        for point_id, key, chunk in zip(ids, keys, chunks):
+            payload = existing.get(point_id)
+            if payload is None:
+                new.append((point_id, key, chunk))
+                continue
+            doc_years = dict(payload.get('doc_years', {}), **{doc_id: catalog.year})
+            if doc_years != payload.get('doc_years'):
+                updates.append((point_id, self._shared_payload(payload['chunk_template'], doc_years)))
+
+        vectors = self.embedding_gen.generate_embeddings([
+            c['text'].replace(CATALOG_YEARS_PLACEHOLDER, format_catalog_years([catalog.year])) for _, _, c in new
+        ]) if new else []
+        points = []
+        for (point_id, key, chunk), vector in zip(new, vectors):
+            if not vector:
+                continue
+            metadata = {k: v for k, v in chunk['metadata'].items() if k != 'Year'}
+            payload = dict(metadata, doc_id=doc_id, source_path=source_path, content_hash=key,
+                           chunk_template=chunk['text'],
+                           **self._shared_payload(chunk['text'], {doc_id: catalog.year}))
+            points.append(PointStruct(id=point_id, vector=vector, payload=payload))
+
+        self._delete_doc_points(collection_name, doc_id, keep_ids=set(ids))
+        if updates:
+            self.client.batch_update_points(collection_name=collection_name, update_operations=[
+                SetPayloadOperation(set_payload=SetPayload(payload=payload, points=[point_id]))
+                for point_id, payload in updates
+            ])
+        if points:
+            self.client.upsert(collection_name=collection_name, points=points)
+        print(f"Ingested '{Path(file_path).name}' into '{collection_name}': {len(points)} new chunks, "
+              f"{len(chunks) - len(new)} shared with other catalog years")
+        return True
+
+    def _ingest_catalog_diffs(self, file_path: str):
+        """Re-derive the "what changed" chunks between consecutive catalog years of this file's program.
+
+        Sibling years are found by file name (``*/<year>_CompSci.json``), so this also runs after a
+        year is deleted and drops the pairs that no longer exist.
+        """
+        path = Path(file_path)
+        suffix = path.stem.split('_', 1)[-1]
+        try:
+            catalogs = [load_catalog_file(str(p)) for p in sorted(path.parent.parent.glob(f'*/*_{suffix}.json'))]
+            programs = {c.program_code for c in catalogs if c.program_code}
+            if not programs:
+                return
+            collection_name = self.collection_name or self.config['qdrant']['collections']['major_catalogs']
+            chunks = adjacent_diff_chunks(catalogs)
+            ids = [str(uuid.UUID(hashlib.sha256(
+                f"catalog_diff:{c['metadata']['SubjectCode']}:{c['metadata']['FromYear']}:"
+                f"{c['metadata']['ToYear']}".encode()).hexdigest()[:32])) for c in chunks]
+
+            stale = [
+                point.id for point in self._scroll_points(collection_name, Filter(must=[
+                    FieldCondition(key='ChunkType', match=MatchValue(value='catalog_diff')),
+                    FieldCondition(key='SubjectCode', match=MatchValue(value=next(iter(programs)))),
+                ]))
+                if str(point.id) not in ids
+            ]
+            if stale:
+                self.client.delete(collection_name=collection_name, points_selector=PointIdsList(points=stale))
+            if not chunks:
+                return
+            vectors = self.embedding_gen.generate_embeddings([c['text'] for c in chunks])
+            points = [
+                PointStruct(id=point_id, vector=vector, payload=dict(chunk['metadata'], chunk_text=chunk['text'],
+                                                                     **text_stats(chunk['text'], self.tokenizer)))
+                for point_id, chunk, vector in zip(ids, chunks, vectors) if vector
+            ]
+            if points:
+                self.client.upsert(collection_name=collection_name, points=points)
+            print(f"Updated {len(points)} catalog diff chunks for '{suffix}' in '{collection_name}'")
+        except Exception as e:
+            print(f"Warning: Could not update catalog diff chunks for {file_path}: {e}")
+
+    def _shared_payload(self, template: str, doc_years: dict) -> dict:
+        years = sorted(set(doc_years.values()))
+        text = template.replace(CATALOG_YEARS_PLACEHOLDER, format_catalog_years(years))
+        return {
+            'doc_years': doc_years,
+            'doc_ids': sorted(doc_years),
+            'Years': years,
+            'chunk_text': text,
+            **text_stats(text, self.tokenizer),
+        }
+
+    def _scroll_points(self, collection_name: str, scroll_filter: Filter):
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name, scroll_filter=scroll_filter,
+                limit=256, offset=offset, with_payload=True, with_vectors=False,
+            )
+            yield from points
+            if offset is None:
+                break
+
+    def backfill_text_stats(self, collection_name: str, doc_id: str = None, force: bool = False) -> int:
+        """Add token_count/char_len/text_hash to points that lack them (all points with ``force``).
+
+        Returns the number of points updated.
+        """
+        scroll_filter = Filter(must=[FieldCondition(key='doc_id', match=MatchValue(value=doc_id))]) if doc_id else None
+        updated, updates = 0, []
+        for point in self._scroll_points(collection_name, scroll_filter):
+            payload = point.payload or {}
+            if not force and 'token_count' in payload:
+                continue
+            text = payload.get('chunk_text', payload.get('text', ''))
+            updates.append(SetPayloadOperation(set_payload=SetPayload(
+                payload=text_stats(text, self.tokenizer), points=[point.id])))
+            if len(updates) >= 256:
+                self.client.batch_update_points(collection_name=collection_name, update_operations=updates)
+                updated += len(updates)
+                updates = []
+        if updates:
+            self.client.batch_update_points(collection_name=collection_name, update_operations=updates)
+            updated += len(updates)
+        return updated
+
+    def _delete_doc_points(self, collection_name: str, doc_id: str, keep_ids=frozenset()):
+        """Delete a file's own points and drop its reference from cross-year shared points."""
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=FilterSelector(filter=Filter(must=[
+                FieldCondition(key='doc_id', match=MatchValue(value=doc_id)),
+                IsEmptyCondition(is_empty=PayloadField(key='doc_ids')),
+            ])),
+        )
+        shared = Filter(must=[FieldCondition(key='doc_ids', match=MatchValue(value=doc_id))])
+        orphaned, updates = [], []
+        for point in self._scroll_points(collection_name, shared):
+            if str(point.id) in keep_ids:
+                continue
+            doc_years = {d: y for d, y in point.payload.get('doc_years', {}).items() if d != doc_id}
+            if doc_years:
+                updates.append(SetPayloadOperation(set_payload=SetPayload(
+                    payload=self._shared_payload(point.payload['chunk_template'], doc_years), points=[point.id],
+                )))
+            else:
+                orphaned.append(point.id)
+        if updates:
+            self.client.batch_update_points(collection_name=collection_name, update_operations=updates)
+        if orphaned:
+            self.client.delete(collection_name=collection_name, points_selector=PointIdsList(points=orphaned))
+
+    def delete_file(self, file_path: str):
+        """Remove every point (and summary) that was ingested from a file."""
+        doc_id = generate_doc_id(file_path, self.base_dir)
+        existing = {c.name for c in self.client.get_collections().collections}
+        existing |= set(collection_versions.alias_targets(self.client))
+        for collection_name in self.config['qdrant']['collections'].values():
+            for name in (collection_name, f"{collection_name}_summaries"):
+                if name in existing:
+                    self._delete_doc_points(name, doc_id)
+        if self.catalog_chunking and self.catalog_diff_chunks and is_catalog_json(file_path):
+            self._ingest_catalog_diffs(file_path)
+        self.manifest.forget(file_path)
+        self.manifest.save()
 
 UnifiedIngestion = FSEIngestion
\ No newline at end of file
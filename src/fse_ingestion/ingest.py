@@ -1,28 +1,98 @@
 #!/usr/bin/env python3
 
+import argparse
+import json
 import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from fse_catalog.offerings import load_offering_store
 from fse_utils.config_loader import load_config
 from fse_ingestion.fse_ingestion import FSEIngestion
+from fse_ingestion.plan import IngestionPlanner, format_plan
+from fse_ingestion.watcher import IngestionWatcher
 
 
-def main():
-    config = load_config()
-    ingestion = FSEIngestion()
-    
+def ingest_data_dirs(config: dict) -> list:
+    """Directories bulk ingest, --reindex, --watch and --plan walk."""
     data_dirs_config = config.get('data_directories', {})
-    data_dirs = [
+    return [
         data_dirs_config.get('major_catalogs', 'data/major_catalog'),
+        data_dirs_config.get('major_catalog_json', 'data/major_catalog_json'),
         data_dirs_config.get('minor_catalogs', 'data/minor_catalog'),
         data_dirs_config.get('general_knowledge', 'data/general_knowledge'),
         data_dirs_config.get('4_year_plans', 'data/4_year_plans')
     ]
-    
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest PantherBot data directories into Qdrant')
+    parser.add_argument('--reindex', action='store_true',
+                        help='Rebuild into new versioned collections and swap aliases when done')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and ingest files as they change in the data directories')
+    parser.add_argument('--plan', action='store_true',
+                        help='Dry run: report chunk/token/embedding estimates per collection without ingesting')
+    parser.add_argument('--json', action='store_true', help='With --plan, print the report as JSON')
+    parser.add_argument('--offerings', action='store_true',
+                        help='Only load new or changed data/course_listings term CSVs into the offering index')
+    parser.add_argument('--backfill-stats', action='store_true',
+                        help='Only add token_count/char_len/text_hash to existing points that lack them')
+    args = parser.parse_args()
+
+    config = load_config()
+
+    data_dirs = ingest_data_dirs(config)
+
+    if args.plan:
+        report = IngestionPlanner(config).plan(data_dirs)
+        print(json.dumps(report, indent=2) if args.json else format_plan(report))
+        return
+
+    if args.offerings:
+        store = load_offering_store(config)
+        print(f"Offering index terms: {store.terms()}" if store else "No course listings directory found")
+        return
+
+    ingestion = FSEIngestion()
+
+    if args.backfill_stats:
+        for collection_name in config['qdrant']['collections'].values():
+            print(f"{collection_name}: {ingestion.backfill_text_stats(collection_name)} points updated")
+        return
+
+    if args.watch:
+        watch_cfg = config.get('ingestion', {}).get('watch', {})
+        watcher = IngestionWatcher(
+            ingestion,
+            data_dirs,
+            poll_interval_s=watch_cfg.get('poll_interval_s', 5),
+            debounce_s=watch_cfg.get('debounce_s', 10),
+            batch_size=watch_cfg.get('batch_size', 4),
+            status_path=watch_cfg.get('status_path'),
+        )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print(f"\nStopped watching. Final status: {watcher.status()}")
+        return
+
     print(f"Ingesting from directories: {data_dirs}")
-    ingestion.bulk_ingest(data_dirs)
+    if args.reindex:
+        if not ingestion.reindex(data_dirs):
+            sys.exit(1)
+    else:
+        ingestion.bulk_ingest(data_dirs)
+
+    try:
+        load_offering_store(config)
+    except Exception as e:
+        print(f"Warning: Could not update course offering index: {e}")
+
+    cache_stats = ingestion.embedding_cache_stats()
+    if cache_stats:
+        print(f"Embedding cache: {cache_stats}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from fse_utils.config_loader import get_project_root
+
+INGESTABLE_EXTENSIONS = ('.pdf', '.md', '.json', '.txt')
+
+
+def resolve_path(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(get_project_root(), path)
+
+
+def file_sha256(file_path: str) -> str:
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IngestionManifest:
+    """Content hashes of every file as of its last successful ingestion."""
+
+    def __init__(self, path: str):
+        self.path = Path(resolve_path(path))
+        self.root = get_project_root()
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read ingestion manifest {self.path}: {e}")
+
+    def _key(self, file_path: str) -> str:
+        abs_path = os.path.abspath(file_path)
+        try:
+            return os.path.relpath(abs_path, self.root)
+        except ValueError:
+            return abs_path
+
+    def get(self, file_path: str) -> Optional[Dict]:
+        return self.entries.get(self._key(file_path))
+
+    def is_unchanged(self, file_path: str, sha256: str = None) -> bool:
+        entry = self.get(file_path)
+        if entry is None:
+            return False
+        return entry['sha256'] == (sha256 or file_sha256(file_path))
+
+    def record(self, file_path: str, sha256: str = None):
+        stat = os.stat(file_path)
+        self.entries[self._key(file_path)] = {
+            'sha256': sha256 or file_sha256(file_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'ingested_at': time.time(),
+        }
+
+    def forget(self, file_path: str):
+        self.entries.pop(self._key(file_path), None)
+
+    def tracked_files(self):
+        return [os.path.join(self.root, k) if not os.path.isabs(k) else k for k in self.entries]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,189 @@
+import json
+import math
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from pypdf import PdfReader
+
+from fse_catalog.model import get_catalog_store, load_catalog_file, load_plan_file
+from fse_ingestion.catalog_chunker import (
+    CATALOG_YEARS_PLACEHOLDER, chunk_catalog, dedup_key, format_catalog_years, is_catalog_json,
+    superseded_by_catalog_json,
+)
+from fse_ingestion.fse_edit_metadata import FSEMetadataExtractor
+from fse_ingestion.manifest import INGESTABLE_EXTENSIONS, IngestionManifest, file_sha256, resolve_path
+from fse_ingestion.plan_chunker import chunk_plan, is_plan_json
+from fse_utils.tokens import configured_tokenizer, count_tokens, encoding_available_offline, estimate_tokens
+
+_FLOAT32_BYTES = 4
+
+
+def _flatten_json_text(obj) -> List[str]:
+    if isinstance(obj, dict):
+        return [s for v in obj.values() for s in _flatten_json_text(v)]
+    if isinstance(obj, list):
+        return [s for v in obj for s in _flatten_json_text(v)]
+    if obj is None:
+        return []
+    return [str(obj)]
+
+
+class IngestionPlanner:
+    """Dry run of FSEIngestion: parse and size every file without embedding or touching Qdrant."""
+
+    def __init__(self, config: dict):
+        self.config = config
+        ingestion_cfg = config.get('ingestion', {})
+        self.manifest = IngestionManifest(ingestion_cfg.get('manifest_path', '.cache/ingest_manifest.json'))
+        self.text_cache_dir = Path(resolve_path(ingestion_cfg.get('parsed_text_cache', '.cache/parsed_text')))
+        self.tokenizer = configured_tokenizer(config)
+        # tiktoken downloads encodings on first use; a dry run on a cold machine must not
+        self.exact_tokens = encoding_available_offline(self.tokenizer)
+        if not self.exact_tokens:
+            print(f"Warning: tiktoken encoding '{self.tokenizer}' is not cached locally; "
+                  f"estimating tokens as characters / 4")
+        self.metadata_extractor = FSEMetadataExtractor()
+
+        chunker = config.get('chunker', {})
+        self.target_tokens = chunker.get('target_tokens', 1000)
+        self.overlap_tokens = int(self.target_tokens * chunker.get('overlap_ratio', 0.1))
+
+        embedding = config.get('embedding', {})
+        self.dimension = embedding.get('dimension', 4096)
+        self.embed_batch_size = embedding.get('batch_size', 64)
+        self.type_to_collection = config.get('domain', {}).get('document_type_mapping', {})
+        self.catalog_chunking = ingestion_cfg.get('catalog_chunking', True)
+        self.plan_chunking = ingestion_cfg.get('plan_chunking', True)
+        self.cross_year_dedup = ingestion_cfg.get('cross_year_dedup', True)
+        self._catalog_keys = set()
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self.tokenizer) if self.exact_tokens else estimate_tokens(text)
+
+    def catalog_chunks(self, file_path: str) -> List[Dict]:
+        """Chunks ingest would write for a catalog JSON, after cross-year dedup with files planned so far."""
+        catalog = load_catalog_file(file_path)
+        if not self.cross_year_dedup:
+            return chunk_catalog(catalog)
+        year_label = format_catalog_years([catalog.year])
+        chunks = []
+        for chunk in chunk_catalog(catalog, year_label=CATALOG_YEARS_PLACEHOLDER):
+            key = dedup_key(chunk)
+            if key in self._catalog_keys:
+                continue
+            self._catalog_keys.add(key)
+            chunks.append(dict(chunk, text=chunk['text'].replace(CATALOG_YEARS_PLACEHOLDER, year_label)))
+        return chunks
+
+    def extract_text(self, file_path: str, sha256: str) -> str:
+        cached = self.text_cache_dir / f"{sha256}.txt"
+        if cached.exists():
+            return cached.read_text(encoding='utf-8')
+
+        if file_path.endswith('.pdf'):
+            reader = PdfReader(file_path)
+            text = '\n'.join(page.extract_text() or '' for page in reader.pages)
+        elif file_path.endswith('.json'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = '\n'.join(_flatten_json_text(json.load(f)))
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+
+        self.text_cache_dir.mkdir(parents=True, exist_ok=True)
+        cached.write_text(text, encoding='utf-8')
+        return text
+
+    def estimate_chunks(self, tokens: int) -> int:
+        if tokens == 0:
+            return 0
+        if tokens <= self.target_tokens:
+            return 1
+        stride = max(1, self.target_tokens - self.overlap_tokens)
+        return math.ceil((tokens - self.overlap_tokens) / stride)
+
+    def collection_for(self, file_path: str) -> str:
+        doc_type = self.metadata_extractor.extract_metadata_from_path(file_path).get('DocumentType')
+        return self.type_to_collection.get(doc_type, doc_type or 'general_knowledge')
+
+    def plan_file(self, file_path: str) -> Dict:
+        sha256 = file_sha256(file_path)
+        chunks = None
+        if self.catalog_chunking and is_catalog_json(file_path):
+            chunks = self.catalog_chunks(file_path)
+        elif self.plan_chunking and is_plan_json(file_path):
+            chunks = chunk_plan(load_plan_file(file_path))
+        if chunks is not None:
+            tokens = sum(self.count_tokens(c['text']) for c in chunks)
+            n_chunks = len(chunks)
+        else:
+            tokens = self.count_tokens(self.extract_text(file_path, sha256))
+            n_chunks = self.estimate_chunks(tokens)
+        return {
+            'path': file_path,
+            'collection': self.collection_for(file_path),
+            'tokens': tokens,
+            'chunks': n_chunks,
+            'unchanged': self.manifest.is_unchanged(file_path, sha256),
+        }
+
+    def plan(self, data_dirs: List[str]) -> Dict[str, Dict]:
+        totals = defaultdict(lambda: {
+            'files': 0, 'unchanged_files': 0, 'chunks': 0, 'tokens': 0,
+            'chunks_to_embed': 0, 'tokens_to_embed': 0, 'changed': [],
+        })
+        self._catalog_keys = set()
+        store = get_catalog_store(self.config)
+        catalogs = store.catalogs if store is not None else {}
+        for data_dir in data_dirs:
+            for root, _, files in os.walk(resolve_path(data_dir)):
+                for name in sorted(files):
+                    if not name.lower().endswith(INGESTABLE_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    if superseded_by_catalog_json(path, catalogs):
+                        continue
+                    try:
+                        entry = self.plan_file(path)
+                    except Exception as e:
+                        print(f"Warning: Could not plan {path}: {e}")
+                        continue
+                    t = totals[entry['collection']]
+                    t['files'] += 1
+                    t['chunks'] += entry['chunks']
+                    t['tokens'] += entry['tokens']
+                    if entry['unchanged']:
+                        t['unchanged_files'] += 1
+                    else:
+                        t['chunks_to_embed'] += entry['chunks']
+                        t['tokens_to_embed'] += entry['tokens']
+                        t['changed'].append(path)
+
+        report = {}
+        for collection, t in totals.items():
+            t['embedding_batches'] = math.ceil(t['chunks_to_embed'] / self.embed_batch_size)
+            t['vector_bytes'] = t['chunks'] * self.dimension * _FLOAT32_BYTES
+            report[collection] = t
+        return report
+
+
+def format_plan(report: Dict[str, Dict]) -> str:
+    header = f"{'collection':<20}{'files':>7}{'unchanged':>11}{'chunks':>9}{'tokens':>11}" \
+             f"{'to embed':>10}{'batches':>9}{'vectors MB':>12}"
+    lines = [header, '-' * len(header)]
+    for collection, t in sorted(report.items()):
+        lines.append(
+            f"{collection:<20}{t['files']:>7}{t['unchanged_files']:>11}{t['chunks']:>9}{t['tokens']:>11}"
+            f"{t['chunks_to_embed']:>10}{t['embedding_batches']:>9}{t['vector_bytes'] / 1e6:>12.1f}"
+        )
+    total = {k: sum(t[k] for t in report.values())
+             for k in ('files', 'unchanged_files', 'chunks', 'tokens', 'chunks_to_embed',
+                       'embedding_batches', 'vector_bytes')}
+    lines.append('-' * len(header))
+    lines.append(
+        f"{'TOTAL':<20}{total['files']:>7}{total['unchanged_files']:>11}{total['chunks']:>9}{total['tokens']:>11}"
+        f"{total['chunks_to_embed']:>10}{total['embedding_batches']:>9}{total['vector_bytes'] / 1e6:>12.1f}"
+    )
+    return '\n'.join(lines)
@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import Dict, List
+
+from fse_catalog.course_codes import display_course_code
+from fse_catalog.model import FourYearPlan, PlanTerm
+
+
+def is_plan_json(file_path: str) -> bool:
+    path = Path(file_path)
+    return path.suffix.lower() == '.json' and '4_year_plans' in path.parts and path.stem.endswith('_plan')
+
+
+def _course_label(code: str, title: str) -> str:
+    number = display_course_code(code) or code
+    return f"{number} {title}".strip() if title and title != number else number
+
+
+def _overview_chunk(plan: FourYearPlan) -> str:
+    lines = [f"{plan.program} — {plan.catalog_year} 4-year plan overview",
+             f"Total major credits: {plan.total_credits if plan.total_credits is not None else 'n/a'}"]
+    for name, req in plan.requirements_summary.items():
+        needed = req.get('needed') if isinstance(req, dict) else req
+        lines.append(f"{name.replace('_', ' ')}: {needed}")
+    for term in plan.terms:
+        lines.append(f"Year {term.year} {term.semester}: " + ', '.join(
+            display_course_code(c.code) or c.code for c in term.courses))
+    return '\n'.join(lines)
+
+
+def _semester_chunk(plan: FourYearPlan, term: PlanTerm) -> str:
+    header = f"{plan.program} — {plan.catalog_year} 4-year plan, Year {term.year} {term.semester}"
+    if term.total_credits is not None:
+        header += f" ({term.total_credits} credits)"
+    return '\n'.join([header] + [
+        f"- {_course_label(c.code, c.title)}, {c.credits} credits ({c.category.replace('_', ' ')})"
+        for c in term.courses
+    ])
+
+
+def chunk_plan(plan: FourYearPlan) -> List[Dict]:
+    """One overview chunk plus one compact chunk per semester of a structured 4-year plan."""
+    base = {
+        'DocumentType': '4_year_plan',
+        'doc_type': '4_year_plan',
+        'Year': plan.catalog_year,
+        'SubjectCode': plan.program_code,
+        'Program': plan.program,
+    }
+    chunks = [{'text': _overview_chunk(plan), 'metadata': dict(base, ChunkType='plan_overview')}]
+    for term in plan.terms:
+        chunks.append({
+            'text': _semester_chunk(plan, term),
+            'metadata': dict(
+                base,
+                ChunkType='plan_semester',
+                PlanYear=term.year,
+                Semester=term.semester,
+                CourseCodes=sorted({c.code for c in term.courses}),
+                Credits=term.total_credits,
+            ),
+        })
+    return chunks
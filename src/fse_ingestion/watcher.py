@@ -0,0 +1,144 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from fse_ingestion.manifest import INGESTABLE_EXTENSIONS, file_sha256, resolve_path
+
+
+class IngestionWatcher:
+    """Polls the data directories and feeds changed files through FSEIngestion.ingest_file.
+
+    Changes are debounced: nothing is ingested until the directories have been quiet for
+    `debounce_s`, so a burst of writes (e.g. pdf_to_json.py emitting a year of catalogs)
+    becomes one queue that is drained in batches of `batch_size`.
+    """
+
+    def __init__(self, ingestion, data_dirs: List[str], poll_interval_s: float = 5,
+                 debounce_s: float = 10, batch_size: int = 4, status_path: str = None):
+        self.ingestion = ingestion
+        self.manifest = ingestion.manifest
+        self.data_dirs = [resolve_path(d) for d in data_dirs]
+        self.poll_interval_s = poll_interval_s
+        self.debounce_s = debounce_s
+        self.batch_size = max(1, batch_size)
+        self.status_path = Path(resolve_path(status_path)) if status_path else None
+
+        self._snapshot: Dict[str, Tuple[float, int]] = {}
+        self._pending: Dict[str, float] = {}   # path -> time the change was first seen
+        self._last_change = 0.0
+        self.files_ingested = 0
+        self.files_deleted = 0
+        self.files_failed = 0
+        self.last_ingest_at = None
+        self.last_ingest_lag_s = None
+
+    def scan(self) -> Dict[str, Tuple[float, int]]:
+        snapshot = {}
+        for data_dir in self.data_dirs:
+            for root, _, files in os.walk(data_dir):
+                for name in files:
+                    if not name.lower().endswith(INGESTABLE_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def prime(self, now: float = None):
+        """Queue files that changed while the daemon was not running."""
+        now = time.time() if now is None else now
+        self._snapshot = self.scan()
+        for path in self._snapshot:
+            if not self.manifest.is_unchanged(path):
+                self._pending.setdefault(path, now)
+        for path in self.manifest.tracked_files():
+            if path.startswith(tuple(self.data_dirs)) and path not in self._snapshot:
+                self._pending.setdefault(path, now)
+        if self._pending:
+            self._last_change = now
+
+    def poll_once(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        current = self.scan()
+        changed = [p for p, sig in current.items() if self._snapshot.get(p) != sig]
+        changed += [p for p in self._snapshot if p not in current]
+        for path in changed:
+            self._pending.setdefault(path, now)
+        if changed:
+            self._last_change = now
+        self._snapshot = current
+        return len(changed)
+
+    def ready(self, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        return bool(self._pending) and now - self._last_change >= self.debounce_s
+
+    def drain(self):
+        pending = sorted(self._pending.items(), key=lambda kv: kv[1])
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            for path, seen_at in batch:
+                self._process(path, seen_at)
+                self._pending.pop(path, None)
+            self.manifest.save()
+            self.write_status()
+
+    def _process(self, path: str, seen_at: float):
+        try:
+            if not os.path.exists(path):
+                self.ingestion.delete_file(path)
+                self.files_deleted += 1
+                print(f"Removed deleted file from index: {path}")
+                return
+            sha256 = file_sha256(path)
+            if self.manifest.is_unchanged(path, sha256):
+                return
+            print(f"Ingesting changed file: {path}")
+            if self.ingestion.ingest_file(path):
+                self.files_ingested += 1
+            else:
+                self.files_failed += 1
+        except Exception as e:
+            self.files_failed += 1
+            print(f"Error ingesting {path}: {e}")
+            return
+        self.last_ingest_at = time.time()
+        self.last_ingest_lag_s = round(self.last_ingest_at - seen_at, 2)
+
+    def status(self) -> Dict:
+        return {
+            'queue_depth': len(self._pending),
+            'last_ingest_at': self.last_ingest_at,
+            'last_ingest_lag_s': self.last_ingest_lag_s,
+            'files_ingested': self.files_ingested,
+            'files_deleted': self.files_deleted,
+            'files_failed': self.files_failed,
+            'watching': self.data_dirs,
+            'updated_at': time.time(),
+        }
+
+    def write_status(self):
+        if not self.status_path:
+            return
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.status_path.with_suffix(self.status_path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.status(), f, indent=1)
+        os.replace(tmp_path, self.status_path)
+
+    def run(self):
+        print(f"Watching for changes in: {', '.join(self.data_dirs)}")
+        self.prime()
+        self.write_status()
+        while True:
+            self.poll_once()
+            if self.ready():
+                print(f"Ingesting {len(self._pending)} changed file(s)")
+                self.drain()
+                print(f"Watch status: {self.status()}")
+            time.sleep(self.poll_interval_s)
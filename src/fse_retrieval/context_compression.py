@@ -0,0 +1,152 @@
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from fse_catalog.course_codes import find_course_codes
+from fse_ingestion.embedding_cache import EmbeddingCache, embedding_fingerprint
+from fse_utils.config_loader import get_project_root
+from fse_utils.sentences import is_scored, split_segments
+from fse_utils.tokens import DEFAULT_TOKENIZER, count_tokens
+
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+class ContextCompressor:
+    """Drops low-relevance sentences from retrieved chunks before they reach the LLM.
+
+    Sentences are scored by cosine similarity between the query embedding and their
+    embeddings, which ingestion stores in the embedding cache. Only whole segments are dropped,
+    so course codes and numbers in the kept text are unchanged. Always kept: each chunk's first
+    line, short segments (list lines), sentences naming a course code or number from the
+    question, and sentences without a cached embedding. Pinned chunks are never compressed.
+    """
+
+    def __init__(self, sentence_vectors: EmbeddingCache, embed_query: Callable[[str], List[float]],
+                 target_ratio: float = 0.5, min_similarity: float = 0.35, min_chunk_tokens: int = 150,
+                 tokenizer: str = DEFAULT_TOKENIZER, refresh_s: float = 60):
+        self.sentence_vectors = sentence_vectors
+        self.embed_query = embed_query
+        self.target_ratio = target_ratio
+        self.min_similarity = min_similarity
+        self.min_chunk_tokens = min_chunk_tokens
+        self.tokenizer = tokenizer
+        self.refresh_s = refresh_s
+        self._refreshed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def begin_request(self):
+        self._local.query = None
+        self._local.query_vector = None
+        self._local.stats = self._empty_stats()
+        if time.monotonic() - self._refreshed_at > self.refresh_s:
+            with self._lock:
+                self.sentence_vectors.refresh()
+                self._refreshed_at = time.monotonic()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'chunks_compressed': 0, 'tokens_before': 0, 'tokens_after': 0, 'sentences_dropped': 0}
+
+    def set_query(self, query: str):
+        self._local.query = query
+        self._local.query_vector = None
+
+    def request_stats(self) -> Dict:
+        stats = dict(getattr(self._local, 'stats', {}))
+        if stats:
+            stats['tokens_saved'] = stats['tokens_before'] - stats['tokens_after']
+        return stats
+
+    def _query_vector(self) -> Optional[np.ndarray]:
+        if getattr(self._local, 'query_vector', None) is None and getattr(self._local, 'query', None):
+            vector = self.embed_query(self._local.query)
+            if vector:
+                vector = np.asarray(vector, dtype=np.float32)
+                self._local.query_vector = vector / (np.linalg.norm(vector) or 1.0)
+        return getattr(self._local, 'query_vector', None)
+
+    def compress(self, chunks: List[Dict]) -> List[Dict]:
+        query_vector = self._query_vector()
+        if query_vector is None:
+            return chunks
+        query = self._local.query
+        anchors = set(find_course_codes(query)) | set(_NUMBER_RE.findall(query))
+        return [self._compress_chunk(c, query_vector, anchors) for c in chunks]
+
+    def _compress_chunk(self, chunk: Dict, query_vector: np.ndarray, anchors: set) -> Dict:
+        metadata = chunk.get('metadata') or {}
+        text = chunk.get('text', '')
+        if metadata.get('pinned') or not text:
+            return chunk
+        segments = split_segments(text)
+        tokens = [count_tokens(s, self.tokenizer) for s in segments]
+        total = sum(tokens)
+        if total < self.min_chunk_tokens or len(segments) < 3:
+            return chunk
+
+        keep = [False] * len(segments)
+        scorable = []
+        for i, segment in enumerate(segments):
+            mentions = set(find_course_codes(segment)) | set(_NUMBER_RE.findall(segment))
+            if i == 0 or not is_scored(segment) or anchors & mentions:
+                keep[i] = True
+            else:
+                scorable.append(i)
+
+        with self._lock:
+            vectors = self.sentence_vectors.get_many([segments[i].strip() for i in scorable])
+        similarities = {}
+        for i, vector in zip(scorable, vectors):
+            if vector is None:
+                keep[i] = True
+                continue
+            vector = np.asarray(vector, dtype=np.float32)
+            similarities[i] = float(vector @ query_vector / (np.linalg.norm(vector) or 1.0))
+
+        budget = max(self.target_ratio * total, sum(t for t, k in zip(tokens, keep) if k))
+        used = sum(t for t, k in zip(tokens, keep) if k)
+        for i in sorted(similarities, key=similarities.get, reverse=True):
+            if similarities[i] < self.min_similarity or used + tokens[i] > budget:
+                continue
+            keep[i] = True
+            used += tokens[i]
+
+        if not hasattr(self._local, 'stats'):
+            self._local.stats = self._empty_stats()
+        stats = self._local.stats
+        stats['tokens_before'] += total
+        stats['tokens_after'] += used
+        if all(keep):
+            return chunk
+        stats['chunks_compressed'] += 1
+        stats['sentences_dropped'] += keep.count(False)
+        compressed = ''.join(s for s, k in zip(segments, keep) if k).rstrip()
+        return dict(chunk, text=compressed, metadata=dict(metadata, token_count=used, compressed_from=total))
+
+
+def build_context_compressor(config: dict, embed_query: Callable[[str], List[float]]) -> Optional[ContextCompressor]:
+    cfg = config.get('context_compression', {})
+    if not cfg.get('enabled', False) or os.getenv('CONTEXT_COMPRESSION_DISABLED', 'false').lower() == 'true':
+        return None
+    cache_dir = config.get('embedding_cache', {}).get('dir', '.cache/embeddings')
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(get_project_root(), cache_dir)
+    if not os.path.isdir(cache_dir):
+        print(f"Warning: Context compression disabled: no sentence embeddings at {cache_dir}")
+        return None
+    sentence_vectors = EmbeddingCache(cache_dir, dimension=config['embedding']['dimension'],
+                                      fingerprint=embedding_fingerprint(config), readonly=True)
+    return ContextCompressor(
+        sentence_vectors,
+        embed_query,
+        target_ratio=cfg.get('target_ratio', 0.5),
+        min_similarity=cfg.get('min_similarity', 0.35),
+        min_chunk_tokens=cfg.get('min_chunk_tokens', 150),
+        tokenizer=config.get('ingestion', {}).get('tokenizer', DEFAULT_TOKENIZER),
+        refresh_s=cfg.get('refresh_s', 60),
+    )
@@ -0,0 +1,155 @@
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from fse_utils.tokens import DEFAULT_TOKENIZER
+
+
+@lru_cache(maxsize=8192)
+def _counted(text: str, tokenizer: str) -> int:
+    from fse_utils.tokens import count_tokens
+    return count_tokens(text, tokenizer)
+
+
+def chunk_tokens(chunk: Dict, tokenizer: str = DEFAULT_TOKENIZER) -> int:
+    """Token count stored in the payload at ingest time, else counted (and cached) now."""
+    count = (chunk.get('metadata') or {}).get('token_count')
+    if isinstance(count, int):
+        return count
+    return _counted(chunk.get('text', ''), tokenizer)
+
+
+def _is_chunk_list(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(c, dict) and 'text' in c for c in value)
+
+
+class ContextPacker:
+    """Fills the router's ``token_allocation`` with the best-scoring chunks instead of a fixed ``final_top_k``.
+
+    Pinned chunks (exact lookups) always go in first. The rest are taken greedily by rerank
+    score, then retrieval score, while each collection stays under its share of the budget; any
+    budget left after that pass is filled ignoring the shares. ``min_chunks`` are kept even if
+    they alone exceed the budget. Kept chunks stay in their original order.
+    """
+
+    def __init__(self, default_budget: int = 4000, min_budget: int = 200, max_budget: int = 15000,
+                 allocation_scale: float = 1.0, min_chunks: int = 2, max_collection_share: float = 0.6,
+                 collection_quotas: Dict[str, float] = None, tokenizer: str = DEFAULT_TOKENIZER):
+        self.default_budget = default_budget
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.allocation_scale = allocation_scale
+        self.min_chunks = min_chunks
+        self.max_collection_share = max_collection_share
+        self.collection_quotas = collection_quotas or {}
+        self.tokenizer = tokenizer
+        self._local = threading.local()
+
+    def begin_request(self):
+        self._local.allocation = None
+        self._local.packs = []
+
+    def observe_route(self, route: Dict):
+        if isinstance(route, dict) and route.get('token_allocation'):
+            self._local.allocation = route['token_allocation']
+
+    def budget(self) -> int:
+        allocation = getattr(self._local, 'allocation', None)
+        if not allocation:
+            return self.default_budget
+        return int(min(max(allocation * self.allocation_scale, self.min_budget), self.max_budget))
+
+    def request_stats(self) -> Dict:
+        packs = getattr(self._local, 'packs', [])
+        return packs[-1] if packs else {}
+
+    def _quota(self, collection: str, collections: int) -> float:
+        if collection in self.collection_quotas:
+            return self.collection_quotas[collection]
+        return 1.0 if collections <= 1 else self.max_collection_share
+
+    def pack(self, chunks: List[Dict], budget: int = None) -> Tuple[List[Dict], Dict]:
+        budget = budget or self.budget()
+        tokens = [chunk_tokens(c, self.tokenizer) for c in chunks]
+        collections = {c.get('collection') for c in chunks}
+        order = sorted(range(len(chunks)), key=lambda i: (
+            not (chunks[i].get('metadata') or {}).get('pinned'),
+            -(chunks[i].get('rerank_score') if chunks[i].get('rerank_score') is not None
+              else chunks[i].get('score') or 0.0),
+        ))
+
+        kept, used, per_collection = set(), 0, {}
+        for respect_quota in (True, False):
+            for i in order:
+                if i in kept:
+                    continue
+                collection = chunks[i].get('collection')
+                pinned = (chunks[i].get('metadata') or {}).get('pinned')
+                fits = used + tokens[i] <= budget
+                within_quota = not respect_quota or pinned or \
+                    per_collection.get(collection, 0) + tokens[i] <= self._quota(collection, len(collections)) * budget
+                if len(kept) < self.min_chunks or (fits and within_quota):
+                    kept.add(i)
+                    used += tokens[i]
+                    per_collection[collection] = per_collection.get(collection, 0) + tokens[i]
+
+        packed = [c for i, c in enumerate(chunks) if i in kept]
+        stats = {'budget': budget, 'chunks_in': len(chunks), 'chunks_kept': len(packed),
+                 'tokens_in': sum(tokens), 'tokens_kept': used}
+        if not hasattr(self._local, 'packs'):
+            self._local.packs = []
+        self._local.packs.append(stats)
+        return packed, stats
+
+
+class PackingLLMHandler:
+    """Wraps the core_rag LLMHandler so any chunk list handed to it is compressed and packed first.
+
+    core_rag assembles the prompt inside the handler, so this sits in front of every handler
+    call rather than replacing one method. Compression runs before packing so the budget is
+    spent on the sentences that remain; the prompt layout then fixes the order of what is kept.
+    """
+
+    def __init__(self, handler, packer: ContextPacker = None, compressor=None, layout=None):
+        self.handler = handler
+        self.packer = packer
+        self.compressor = compressor
+        self.layout = layout
+
+    def _prepare(self, chunks: List[Dict]) -> List[Dict]:
+        if self.compressor is not None:
+            chunks = self.compressor.compress(chunks)
+        if self.packer is not None:
+            chunks = self.packer.pack(chunks)[0]
+        if self.layout is not None:
+            chunks = self.layout.order_chunks(chunks)
+        return chunks
+
+    def __getattr__(self, name):
+        attr = getattr(self.handler, name)
+        if not callable(attr):
+            return attr
+
+        def packed_call(*args, **kwargs):
+            args = [self._prepare(a) if _is_chunk_list(a) else a for a in args]
+            kwargs = {k: self._prepare(v) if _is_chunk_list(v) else v for k, v in kwargs.items()}
+            return attr(*args, **kwargs)
+
+        return packed_call
+
+
+def build_context_packer(config: dict) -> Optional[ContextPacker]:
+    cfg = config.get('context_packer', {})
+    if not cfg.get('enabled', False):
+        return None
+    router_cfg = config.get('query_router', {})
+    return ContextPacker(
+        default_budget=cfg.get('default_budget', 4000),
+        min_budget=router_cfg.get('min_tokens', 200),
+        max_budget=router_cfg.get('max_tokens', 15000),
+        allocation_scale=cfg.get('allocation_scale', 1.0),
+        min_chunks=cfg.get('min_chunks', 2),
+        max_collection_share=cfg.get('max_collection_share', 0.6),
+        collection_quotas=cfg.get('collection_quotas') or {},
+        tokenizer=config.get('ingestion', {}).get('tokenizer', DEFAULT_TOKENIZER),
+    )
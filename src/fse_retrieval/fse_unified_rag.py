@@ -1,5 +1,7 @@
 import os
 import sys
+import threading
+import time
 from typing import Any, Dict, List, Optional
 
 from qdrant_client import QdrantClient
@@ -12,10 +14,28 @@ from core_rag.retrieval.llm_handler import LLMHandler, format_system_prompt
 from core_rag.retrieval.search import SearchEngine
 from core_rag.retrieval.answer import AnswerGenerator
 from core_rag.utils.docstore import get_docstore
+from fse_catalog.catalog_diff import CHANGE_QUERY_RE, format_diff, load_catalog_diff_index
+from fse_catalog.course_codes import find_course_codes, normalize_course_code
+from fse_catalog.course_index import load_course_index
+from fse_catalog.degree_audit import AUDIT_QUERY_RE, format_audit, load_degree_auditor
+from fse_catalog.model import get_catalog_store
+from fse_catalog.offerings import OFFERING_QUERY_RE, load_offering_store, mentioned_season
+from fse_catalog.plan_index import WHEN_QUERY_RE, load_plan_index
+from fse_catalog.plan_scheduler import PLAN_QUERY_RE, format_schedule, load_plan_scheduler, minor_courses
+from fse_catalog.prereq_graph import PREREQ_QUERY_RE, UNLOCK_QUERY_RE, load_prereq_graphs
+from fse_ingestion.collection_versions import corpus_version
+from fse_ingestion.plan_chunker import chunk_plan
+from fse_retrieval.context_compression import build_context_compressor
+from fse_retrieval.context_packer import PackingLLMHandler, build_context_packer
+from fse_retrieval.prompt_layout import PromptLayoutAPI, build_prompt_layout
+from fse_retrieval.rerank_cache import CachedReranker, build_rerank_cache
+from fse_retrieval.rerank_pruning import build_adaptive_reranker
+from fse_retrieval.reranker_backends import build_reranker
 from fse_utils.config_loader import load_config
 from core_rag.utils.llm_api import get_ollama_api, get_intermediate_ollama_api
 
 _CATALOG_COLLECTIONS = frozenset({'major_catalogs', 'minor_catalogs', '4_year_plans'})
+_CORPUS_VERSION_TTL_S = 30
 
 
 class FSEUnifiedRAG(BaseUnifiedRAG):
@@ -35,12 +55,21 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
         self.docstore = get_docstore()
         self.hybrid_disabled = os.getenv('HYBRID_DISABLED', 'false').lower() == 'true'
         self.rerank_disabled = os.getenv('RERANK_DISABLED', 'false').lower() == 'true'
+        self.two_phase_cfg = self.config.get('retrieval', {}).get('two_phase', {})
+        self.two_phase = self.two_phase_cfg.get('enabled', False)
         self.reranker = None
+        self._reranker_lock = threading.Lock()
+        self._debug_layers = {}
         self.bm25_retriever = None
         self.summary_retriever = None
+        self._corpus_version = None
+        self._corpus_version_checked = 0.0
 
         self._init_query_router()
         self._init_summary_retriever()
+        self._catalog_lock = threading.Lock()
+        self._init_catalog_model()
+        self._init_offerings()
 
         coll_cfg = self.config.get('collection_config', {})
         enable_summary_gating = any(v.get('summary_enabled', False) for v in coll_cfg.values())
@@ -51,7 +80,10 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
             self.embedding_model, self.bm25_retriever, self.hybrid_disabled,
         )
         self.system_prompt = format_system_prompt(self.config)
-        self.llm_handler = LLMHandler(self.config, self.ollama_api, self.system_prompt)
+        self._init_prompt_layout()
+        llm_api = PromptLayoutAPI(self.ollama_api, self.prompt_layout) if self.prompt_layout else self.ollama_api
+        self.llm_handler = LLMHandler(self.config, llm_api, self.system_prompt)
+        self._init_context_packer()
         self.answer_gen = AnswerGenerator(
             self.config, self.search_engine, self.llm_handler, self._get_reranker,
             query_router=self.query_router,
@@ -63,6 +95,19 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
             search_fn=self.search_collection,
         )
 
+    @property
+    def corpus_version(self) -> str:
+        """Identifier of the collection versions behind the aliases; changes after a reindex."""
+        now = time.monotonic()
+        if self._corpus_version is None or now - self._corpus_version_checked > _CORPUS_VERSION_TTL_S:
+            try:
+                self._corpus_version = corpus_version(self.client, self.collections.values())
+            except Exception as e:
+                print(f"Warning: Could not resolve corpus version: {e}")
+                self._corpus_version = self._corpus_version or 'unknown'
+            self._corpus_version_checked = now
+        return self._corpus_version
+
     def _init_query_router(self):
         self.query_router = None
         try:
@@ -76,6 +121,44 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
         except Exception as e:
             print(f"Warning: Query router disabled: {e}")
 
+    def _init_prompt_layout(self):
+        self.prompt_layout = None
+        try:
+            self.prompt_layout = build_prompt_layout(self.config)
+        except Exception as e:
+            print(f"Warning: Prompt layout disabled: {e}")
+        if self.prompt_layout is not None:
+            self._debug_layers['prompt_cache'] = self.prompt_layout
+
+    def _init_context_packer(self):
+        self.context_compressor = None
+        try:
+            self.context_compressor = build_context_compressor(self.config, self.search_engine.get_embedding)
+        except Exception as e:
+            print(f"Warning: Context compression disabled: {e}")
+        if self.context_compressor is not None:
+            self._debug_layers['context_compression'] = self.context_compressor
+        try:
+            packer = build_context_packer(self.config)
+        except Exception as e:
+            print(f"Warning: Context packer disabled: {e}")
+            packer = None
+        if packer is None and self.context_compressor is None and self.prompt_layout is None:
+            return
+        self.llm_handler = PackingLLMHandler(self.llm_handler, packer, self.context_compressor, self.prompt_layout)
+        if packer is None:
+            return
+        self._debug_layers['context_packing'] = packer
+        if self.query_router is not None:
+            route_query = self.query_router.route_query
+
+            def routed(*args, **kwargs):
+                route = route_query(*args, **kwargs)
+                packer.observe_route(route)
+                return route
+
+            self.query_router.route_query = routed
+
     def _init_summary_retriever(self):
         self.summary_retriever = None
         coll_cfg = self.config.get('collection_config', {})
@@ -98,27 +181,418 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
         except Exception as e:
             print(f"Warning: Summary retriever disabled: {e}")
 
-    def _get_reranker(self):
-        if self.reranker is None and not self.rerank_disabled:
+    def _init_catalog_model(self):
+        """Course index, prerequisite graphs, degree audit, catalog diffs and plans, all from one catalog store."""
+        try:
+            self._catalog_store = get_catalog_store(self.config)
+        except Exception as e:
+            print(f"Warning: Catalog store unavailable: {e}")
+            self._catalog_store = None
+        self._init_course_index()
+        self._init_prereq_graph()
+        self._init_degree_audit()
+        self._init_catalog_diff()
+        self._init_plan_index()
+        self.plan_cfg = self.config.get('plan_scheduler', {})
+        self._plan_schedulers = {}
+
+    def _refresh_catalog_model(self):
+        """Rebuild the catalog-derived indexes once re-ingestion has changed the catalog or plan JSON."""
+        with self._catalog_lock:
             try:
-                from core_rag.retrieval.reranker import BGEReranker
-                print("Initializing reranker...")
-                self.reranker = BGEReranker()
+                store = get_catalog_store(self.config)
             except Exception as e:
-                print(f"Reranker initialization failed: {e}")
-                self.reranker = False
+                print(f"Warning: Could not check catalog store: {e}")
+                return
+            if store is self._catalog_store:
+                return
+            print("Catalog data changed; rebuilding catalog indexes")
+            self._init_catalog_model()
+            if getattr(self, 'prompt_layout', None) is not None:
+                self.prompt_layout.reset_bundles()
+
+    def _init_course_index(self):
+        self.course_index = None
+        self.course_lookup_cfg = self.config.get('course_lookup', {})
+        if not self.course_lookup_cfg.get('enabled', False):
+            return
+        try:
+            self.course_index = load_course_index(self.config)
+            if self.course_index is not None:
+                print(f"Course lookup index initialized ({len(self.course_index)} courses)")
+        except Exception as e:
+            print(f"Warning: Course lookup index disabled: {e}")
+
+    def _init_prereq_graph(self):
+        self.prereq_graphs = None
+        self.prereq_cfg = self.config.get('prereq_graph', {})
+        if not self.prereq_cfg.get('enabled', False):
+            return
+        try:
+            self.prereq_graphs = load_prereq_graphs(self.config)
+            if self.prereq_graphs is not None:
+                print(f"Prerequisite graphs initialized ({len(self.prereq_graphs.graphs)} catalogs)")
+        except Exception as e:
+            print(f"Warning: Prerequisite graph disabled: {e}")
+
+    def _init_degree_audit(self):
+        self.degree_auditor = None
+        self.audit_cfg = self.config.get('degree_audit', {})
+        if not self.audit_cfg.get('enabled', False):
+            return
+        try:
+            self.degree_auditor = load_degree_auditor(self.config)
+            if self.degree_auditor is not None:
+                print(f"Degree audit initialized ({len(self.degree_auditor.catalogs)} catalogs)")
+        except Exception as e:
+            print(f"Warning: Degree audit disabled: {e}")
+
+    def _init_catalog_diff(self):
+        self.catalog_diffs = None
+        self.diff_cfg = self.config.get('catalog_diff', {})
+        if not self.diff_cfg.get('enabled', False):
+            return
+        try:
+            self.catalog_diffs = load_catalog_diff_index(self.config)
+            if self.catalog_diffs is not None:
+                print(f"Catalog diff index initialized ({len(self.catalog_diffs.diffs)} year pairs)")
+        except Exception as e:
+            print(f"Warning: Catalog diff index disabled: {e}")
+
+    def _init_plan_index(self):
+        self.plan_index = None
+        self.plan_lookup_cfg = self.config.get('plan_lookup', {})
+        if not self.plan_lookup_cfg.get('enabled', False):
+            return
+        try:
+            self.plan_index = load_plan_index(self.config)
+            if self.plan_index is not None:
+                print(f"Plan lookup index initialized ({len(self.plan_index.plans)} plans)")
+        except Exception as e:
+            print(f"Warning: Plan lookup index disabled: {e}")
+
+    def _plan_lookup_chunks(self, query: str, collection_name: str,
+                            user_context: Dict = None) -> List[Dict]:
+        """"When should I take CPSC 406" answered from the structured plan, plus the semester chunks it names."""
+        if self.plan_index is None or collection_name not in self.plan_lookup_cfg.get(
+                'collections', ['4_year_plans']) or not WHEN_QUERY_RE.search(query):
+            return []
+        user_context = user_context or {}
+        program = user_context.get('program')
+        year = user_context.get('year')
+        plan = self.plan_index.plan(program, year) if program else None
+        # Another catalog year's plan is not the student's; leave it to normal retrieval rather than pin it
+        if plan is None or (year and plan.catalog_year != str(year)):
+            return []
+        semesters = {(c['metadata']['PlanYear'], c['metadata']['Semester']): c for c in chunk_plan(plan)[1:]}
+        chunks, seen = [], set()
+        for code in find_course_codes(query):
+            text = self.plan_index.when_text(program, code, plan.catalog_year)
+            if text is None:
+                continue
+            chunks.append({'text': text, 'metadata': {
+                'ChunkType': 'plan_lookup', 'CourseCode': code, 'SubjectCode': program,
+                'Year': plan.catalog_year, 'doc_type': '4_year_plan'}})
+            for p in self.plan_index.lookup(program, code, plan.catalog_year):
+                key = (p['year'], p['semester'])
+                if key not in seen:
+                    seen.add(key)
+                    chunks.append(semesters[key])
+        return [{
+            'text': chunk['text'],
+            'score': 1.0,
+            'metadata': dict(chunk['metadata'], pinned=True),
+            'collection': collection_name,
+        } for chunk in chunks]
+
+    @staticmethod
+    def _plan_lookup_covers(query: str, chunks: List[Dict], user_context: Dict = None) -> bool:
+        """Every mentioned course was found in the plan (which is already the student's catalog year)."""
+        answered = {c['metadata']['CourseCode'] for c in chunks if c['metadata']['ChunkType'] == 'plan_lookup'}
+        return answered == set(find_course_codes(query))
+
+    def _init_offerings(self):
+        self.offering_store = None
+        self.offerings_cfg = self.config.get('course_offerings', {})
+        if not self.offerings_cfg.get('enabled', False):
+            return
+        try:
+            self.offering_store = load_offering_store(self.config)
+            if self.offering_store is not None:
+                print(f"Course offering index initialized ({len(self.offering_store.terms())} terms)")
+        except Exception as e:
+            print(f"Warning: Course offering index disabled: {e}")
+
+    def _offering_chunks(self, query: str, collection_name: str,
+                         user_context: Dict = None) -> List[Dict]:
+        """Term-by-term offering history for "is CPSC 406 offered in spring" questions."""
+        if self.offering_store is None or collection_name not in self.offerings_cfg.get(
+                'collections', ['major_catalogs']) or not OFFERING_QUERY_RE.search(query):
+            return []
+        season = mentioned_season(query)
+        chunks = []
+        for code in find_course_codes(query):
+            text = self.offering_store.summary_text(code, season)
+            if text is None:
+                continue
+            chunks.append({
+                'text': text,
+                'score': 1.0,
+                'metadata': {
+                    'ChunkType': 'course_offerings',
+                    'CourseCode': code,
+                    'doc_type': 'course_listing',
+                    'pinned': True,
+                },
+                'collection': collection_name,
+            })
+        return chunks
+
+    def _catalog_diff_chunks(self, query: str, collection_name: str,
+                             user_context: Dict = None) -> List[Dict]:
+        """Precomputed catalog-year diff for "what changed between 2023 and 2025" questions."""
+        if self.catalog_diffs is None or collection_name not in self.diff_cfg.get(
+                'collections', ['major_catalogs']) or not CHANGE_QUERY_RE.search(query):
+            return []
+        user_context = user_context or {}
+        if not user_context.get('program'):
+            return []
+        diff = self.catalog_diffs.resolve(query, user_context['program'], user_context.get('year'))
+        if diff is None:
+            return []
+        return [{
+            'text': format_diff(diff),
+            'score': 1.0,
+            'metadata': {
+                'ChunkType': 'catalog_diff',
+                'SubjectCode': diff['program'],
+                'FromYear': diff['from_year'],
+                'ToYear': diff['to_year'],
+                'doc_type': 'major_catalog',
+                'pinned': True,
+            },
+            'collection': collection_name,
+        }]
+
+    def _degree_audit_chunks(self, query: str, collection_name: str,
+                             user_context: Dict = None) -> List[Dict]:
+        """Remaining requirements from the student's completed courses and any listed in the question."""
+        if self.degree_auditor is None or collection_name not in self.audit_cfg.get(
+                'collections', ['major_catalogs']) or not AUDIT_QUERY_RE.search(query):
+            return []
+        user_context = user_context or {}
+        completed = list(user_context.get('completed') or [])
+        known = {normalize_course_code(c) for c in completed if isinstance(c, str)}
+        completed += [code for code in find_course_codes(query) if code not in known]
+        if not user_context.get('program') or not completed:
+            return []
+        result = self.degree_auditor.audit(user_context['program'], user_context.get('year'), completed)
+        if result is None:
+            return []
+        return [{
+            'text': format_audit(result),
+            'score': 1.0,
+            'metadata': {
+                'ChunkType': 'degree_audit',
+                'SubjectCode': result['program'],
+                'Year': result['year'],
+                'doc_type': 'major_catalog',
+                'pinned': True,
+            },
+            'collection': collection_name,
+        }]
+
+    def _prereq_chain_chunks(self, query: str, collection_name: str,
+                             user_context: Dict = None) -> List[Dict]:
+        """Exact prerequisite chain / unlock list for prerequisite questions about a named course."""
+        if self.prereq_graphs is None or collection_name not in self.prereq_cfg.get(
+                'collections', ['major_catalogs']):
+            return []
+        wants_prereqs = bool(PREREQ_QUERY_RE.search(query))
+        wants_unlocks = bool(UNLOCK_QUERY_RE.search(query))
+        if not (wants_prereqs or wants_unlocks):
+            return []
+        user_context = user_context or {}
+        chunks = []
+        for code in find_course_codes(query):
+            graph = self.prereq_graphs.get(user_context.get('program'), user_context.get('year'), code)
+            if graph is None or code not in graph:
+                continue
+            text = graph.unlock_summary(code) if wants_unlocks and not wants_prereqs \
+                else graph.prerequisite_chain(code)
+            chunks.append({
+                'text': text,
+                'score': 1.0,
+                'metadata': {
+                    'ChunkType': 'prereq_chain',
+                    'CourseCode': code,
+                    'SubjectCode': graph.program,
+                    'Year': graph.year,
+                    'doc_type': 'major_catalog',
+                    'pinned': True,
+                },
+                'collection': collection_name,
+            })
+        return chunks
+
+    def _pinned_course_chunks(self, query: str, collection_name: str,
+                              user_context: Dict = None) -> List[Dict]:
+        if self.course_index is None or collection_name not in self.course_lookup_cfg.get(
+                'collections', ['major_catalogs']):
+            return []
+        user_context = user_context or {}
+        hits = self.course_index.resolve(query, user_context.get('year'), user_context.get('program'))
+        return [{
+            'text': chunk['text'],
+            'score': 1.0,
+            'metadata': dict(chunk['metadata'], pinned=True),
+            'collection': collection_name,
+        } for chunk in hits]
+
+    def _generated_plan_chunks(self, query: str, collection_name: str,
+                               user_context: Dict = None) -> List[Dict]:
+        """Deterministic semester plan for 4-year plan questions; the LLM only narrates it."""
+        if not self.plan_cfg.get('enabled', False) or collection_name not in self.plan_cfg.get(
+                'collections', ['4_year_plans']) or not PLAN_QUERY_RE.search(query):
+            return []
+        program = (user_context or {}).get('program')
+        if not program:
+            return []
+        if program not in self._plan_schedulers:
+            try:
+                self._plan_schedulers[program] = load_plan_scheduler(self.config, program, self.prereq_graphs)
+            except Exception as e:
+                print(f"Warning: Plan scheduler unavailable for {program}: {e}")
+                self._plan_schedulers[program] = None
+        scheduler = self._plan_schedulers[program]
+        if scheduler is None:
+            return []
+        # A plan without the student's minor would be pinned as if it were complete; leave it to retrieval
+        minor = user_context.get('minor')
+        extra_courses = minor_courses(self.config, minor) if minor else []
+        if extra_courses is None:
+            return []
+        plan = scheduler.schedule(completed=user_context.get('completed', ()), extra_courses=extra_courses)
+        return [{
+            'text': format_schedule(plan),
+            'score': 1.0,
+            'metadata': {
+                'ChunkType': 'generated_plan',
+                'SubjectCode': program,
+                'Year': plan['catalog_year'],
+                'doc_type': '4_year_plan',
+                'pinned': True,
+            },
+            'collection': collection_name,
+        }]
+
+    def _get_reranker(self):
+        # Warmup and the first queries can race here; the model must only be loaded once
+        with self._reranker_lock:
+            if self.reranker is None and not self.rerank_disabled:
+                try:
+                    print("Initializing reranker...")
+                    reranker = build_reranker(self.config)
+                except Exception as e:
+                    print(f"Reranker initialization failed: {e}")
+                    self.reranker = False
+                else:
+                    self.reranker = self._wrap_reranker(reranker)
         return self.reranker if self.reranker is not False else None
 
+    def _wrap_reranker(self, reranker):
+        """Layer the score cache and adaptive pruning over the backend; each reports into debug_info."""
+        try:
+            cache = build_rerank_cache(self.config)
+        except Exception as e:
+            print(f"Warning: Rerank score cache disabled: {e}")
+            cache = None
+        if cache is not None:
+            cfg = self.config.get('reranker', {})
+            model_id = getattr(reranker, 'model_id', None) \
+                or f"{cfg.get('model', 'reranker')}:{os.getenv('RERANK_BACKEND') or cfg.get('backend', 'torch')}"
+            reranker = CachedReranker(reranker, cache, model_id, lambda: self.corpus_version)
+            self._debug_layers['rerank_cache'] = reranker
+        adaptive = build_adaptive_reranker(reranker, self.config)
+        if adaptive is not None:
+            reranker = adaptive
+            self._debug_layers['rerank_pruning'] = adaptive
+        return reranker
+
+    def warmup(self, steps=('embed', 'rerank', 'llm')) -> Dict[str, Dict]:
+        """Run one throwaway call per step so the first real query skips model load and first-inference compile."""
+        query = 'What are the prerequisites for CPSC 350?'
+        results = {}
+        for step in steps:
+            start = time.perf_counter()
+            try:
+                if step == 'embed':
+                    ok = bool(self.search_engine.get_embedding(query))
+                elif step == 'rerank':
+                    reranker = self._get_reranker()
+                    ok = reranker is not None
+                    if ok:
+                        reranker.rerank(query, [{'text': 'CPSC 350 requires CPSC 231.', 'score': 0.0, 'metadata': {}}])
+                elif step == 'llm':
+                    llm_cfg = self.config.get('llm', {})
+                    self.ollama_api.chat(
+                        model=llm_cfg.get('primary_model') or llm_cfg.get('model'),
+                        messages=[{'role': 'user', 'content': 'Reply with OK.'}],
+                        stream=False,
+                        think=False,
+                        options={'num_predict': 1},
+                    )
+                    ok = True
+                else:
+                    raise ValueError(f"Unknown warmup step '{step}'")
+                results[step] = {'ok': ok, 'seconds': round(time.perf_counter() - start, 3)}
+            except Exception as e:
+                print(f"Warning: Warmup step '{step}' failed: {e}")
+                results[step] = {'ok': False, 'seconds': round(time.perf_counter() - start, 3), 'error': str(e)}
+        return results
+
     def search_collection(self, query: str, collection_name: str,
                           user_context: Dict = None, top_k: int = 10,
                           **kwargs) -> List[Dict]:
-        return self._dense_search(
+        # A "when should I take X" question resolved from the student's own structured plan
+        # needs only that answer and the semesters it names, not a full 4_year_plans budget.
+        plan_lookup = self._plan_lookup_chunks(query, collection_name, user_context)
+        if plan_lookup and self.plan_lookup_cfg.get('bypass_search', True) \
+                and self._plan_lookup_covers(query, plan_lookup, user_context):
+            return plan_lookup
+        # Exact course mentions ("CPSC 350 prerequisites") are answered from the course
+        # index and pinned at rank 1; if every mention resolves, skip the ANN query entirely,
+        # otherwise the pinned chunks are merged ahead of the dense results.
+        # Courses listed for a degree audit are completed courses, not lookups, so they are not pinned.
+        audit = self._degree_audit_chunks(query, collection_name, user_context)
+        pinned = plan_lookup + self._generated_plan_chunks(query, collection_name, user_context) \
+            + self._catalog_diff_chunks(query, collection_name, user_context) + audit
+        if not audit:
+            pinned += self._offering_chunks(query, collection_name, user_context) \
+                + self._prereq_chain_chunks(query, collection_name, user_context) \
+                + self._pinned_course_chunks(query, collection_name, user_context)
+            if pinned and self.course_index is not None and self.course_lookup_cfg.get('bypass_search', True) \
+                    and self.course_index.mentions_only_indexed(query):
+                return pinned
+
+        results = self._dense_search(
             query=query,
             collection_name=collection_name,
             user_context=user_context,
             top_k=top_k,
             document_type=kwargs.get('document_type'),
         )
+        if pinned:
+            pinned_texts = {p['text'] for p in pinned}
+            pinned_courses = {(p['metadata'].get('CourseCode'), p['metadata'].get('SubjectCode'))
+                              for p in pinned if p['metadata'].get('ChunkType') == 'course'}
+            results = pinned + [
+                r for r in results
+                if r['text'] not in pinned_texts and not (
+                    r['metadata'].get('ChunkType') == 'course'
+                    and (r['metadata'].get('CourseCode'), r['metadata'].get('SubjectCode')) in pinned_courses)
+            ]
+        return results
 
     def _dense_search(self, query: str, collection_name: str,
                       user_context: Dict = None, top_k: int = 10,
@@ -133,39 +607,22 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
 
             if filter_obj:
                 query_vector = self.search_engine.get_embedding(query)
-                scroll_results = self.client.scroll(
-                    collection_name=collection,
-                    scroll_filter=filter_obj,
-                    limit=500,
-                    with_payload=True,
-                    with_vectors=True,
-                )
-                if scroll_results and scroll_results[0]:
+                coll_cfg = self.config.get('collection_config', {}).get(collection_name, {})
+                hybrid = coll_cfg.get('hybrid_enabled') and not self.hybrid_disabled
+                # BM25 fusion ranks over the text of every candidate, so it needs full payloads
+                scored = self._query_window(collection, query_vector, filter_obj, 500, top_k,
+                                            two_phase=self.two_phase and not hybrid)
+                if scored:
                     seen_texts = set()
-                    unique_points = []
-                    for point in scroll_results[0]:
-                        text = point.payload.get('chunk_text', point.payload.get('text', ''))
-                        if text and text not in seen_texts:
-                            seen_texts.add(text)
-                            unique_points.append(point)
-
                     results = []
-                    for point in unique_points:
-                        score = (
-                            sum(a * b for a, b in zip(query_vector, point.vector))
-                            if query_vector and point.vector else 0.0
-                        )
-                        text = point.payload.get('chunk_text', point.payload.get('text', ''))
-                        results.append({
-                            'text': text,
-                            'score': score,
-                            'metadata': {k: v for k, v in point.payload.items() if k != 'chunk_text'},
-                            'collection': collection_name,
-                        })
-                    results.sort(key=lambda x: x['score'], reverse=True)
-
-                    coll_cfg = self.config.get('collection_config', {}).get(collection_name, {})
-                    if coll_cfg.get('hybrid_enabled') and not self.hybrid_disabled and results:
+                    for score, payload in scored:
+                        text = payload.get('chunk_text', payload.get('text', ''))
+                        if not text or text in seen_texts:
+                            continue
+                        seen_texts.add(text)
+                        results.append(self._point_result(payload, score, collection_name))
+
+                    if hybrid and results:
                         results = self._fuse_with_bm25(query, results)
 
                     return results
@@ -176,18 +633,60 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
 
         filter_obj = self._build_filter(user_context, document_type)
         collection = self.collections.get(collection_name, collection_name)
-        results = self.client.query_points(
-            collection_name=collection,
-            query=query_vector,
-            limit=top_k,
-            query_filter=filter_obj,
-        )
-        return [{
-            'text': hit.payload.get('chunk_text', hit.payload.get('text', '')),
-            'score': hit.score,
-            'metadata': {k: v for k, v in hit.payload.items() if k != 'chunk_text'},
+        scored = self._query_window(collection, query_vector, filter_obj, top_k, top_k, two_phase=self.two_phase)
+        return [self._point_result(payload, score, collection_name) for score, payload in scored]
+
+    def _query_window(self, collection: str, query_vector, filter_obj, limit: int, top_k: int,
+                      two_phase: bool) -> List:
+        """(score, payload) pairs ranked by Qdrant.
+
+        Two-phase asks only for ``text_hash`` (no vectors, no text), drops duplicate texts and
+        fetches full payloads for the fetch window alone.
+        """
+        if not query_vector:
+            return []
+        if not two_phase:
+            hits = self.client.query_points(collection_name=collection, query=query_vector, limit=limit,
+                                            query_filter=filter_obj, with_payload=True).points
+            return [(hit.score, hit.payload) for hit in hits]
+        window_size = self._fetch_window(top_k)
+        hits = self.client.query_points(collection_name=collection, query=query_vector,
+                                        limit=max(limit, window_size), query_filter=filter_obj,
+                                        with_payload=['text_hash']).points
+        seen_hashes, window = set(), []
+        for hit in hits:
+            text_hash = (hit.payload or {}).get('text_hash')
+            if text_hash and text_hash in seen_hashes:
+                continue
+            seen_hashes.add(text_hash)
+            window.append((hit.score, hit.id))
+        window = window[:window_size]
+        payloads = self._fetch_payloads(collection, [point_id for _, point_id in window])
+        return [(score, payloads[str(point_id)]) for score, point_id in window if str(point_id) in payloads]
+
+    def _fetch_window(self, top_k: int) -> int:
+        """Candidates whose text is fetched: the rerank window when reranking, else top_k."""
+        window = self.two_phase_cfg.get('fetch_window')
+        if window:
+            return window
+        if self.rerank_disabled:
+            return top_k
+        return max(top_k, self.config.get('reranker', {}).get('max_candidates_for_rerank', 200))
+
+    def _fetch_payloads(self, collection: str, ids: List) -> Dict[str, Dict]:
+        if not ids:
+            return {}
+        return {str(p.id): p.payload for p in self.client.retrieve(collection_name=collection, ids=ids,
+                                                                  with_payload=True, with_vectors=False)}
+
+    @staticmethod
+    def _point_result(payload: Dict, score: float, collection_name: str) -> Dict:
+        return {
+            'text': payload.get('chunk_text', payload.get('text', '')),
+            'score': score,
+            'metadata': {k: v for k, v in payload.items() if k != 'chunk_text'},
             'collection': collection_name,
-        } for hit in results.points]
+        }
 
     def _fuse_with_bm25(self, query: str, chunks: List[Dict]) -> List[Dict]:
         from core_rag.retrieval.bm25 import BM25
@@ -227,7 +726,11 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
             conditions.append(FieldCondition(key="SubjectCode", match=MatchValue(value=subject_code)))
 
         if student_year and collection_name in ('major_catalogs', '4_year_plans'):
-            conditions.append(FieldCondition(key="Year", match=MatchValue(value=str(student_year))))
+            # Cross-year deduplicated catalog chunks carry a Years list; PDF chunks a single Year
+            conditions.append(Filter(should=[
+                FieldCondition(key="Year", match=MatchValue(value=str(student_year))),
+                FieldCondition(key="Years", match=MatchValue(value=str(student_year))),
+            ]))
 
         if document_type:
             conditions.append(FieldCondition(key="doc_type", match=MatchValue(value=document_type)))
@@ -236,18 +739,32 @@ class FSEUnifiedRAG(BaseUnifiedRAG):
 
     def answer_question(self, query: str, student_program: str = None,
                         student_year: str = None, student_minor: str = None,
-                        conversation_history: List[Dict] = None, **kwargs) -> Any:
+                        conversation_history: List[Dict] = None,
+                        completed_courses: List[str] = None, **kwargs) -> Any:
         if 'use_streaming' in kwargs:
             kwargs['stream'] = kwargs.pop('use_streaming')
+        self._refresh_catalog_model()
         user_context = {k: v for k, v in {
             'program': student_program,
             'year': student_year,
             'minor': student_minor,
+            'completed': completed_courses,
         }.items() if v is not None}
-        return self.answer_gen.answer_question(
+        for layer in self._debug_layers.values():
+            layer.begin_request()
+        if getattr(self, 'context_compressor', None) is not None:
+            self.context_compressor.set_query(query)
+        if getattr(self, 'prompt_layout', None) is not None:
+            self.prompt_layout.set_context(user_context)
+        result = self.answer_gen.answer_question(
             query, conversation_history=conversation_history,
             user_context=user_context or None, **kwargs
         )
+        # The reranker is built lazily on the first query, so its layers may only exist now
+        if isinstance(result, tuple) and len(result) == 3 and isinstance(result[2], dict):
+            for key, layer in self._debug_layers.items():
+                result[2][key] = layer.request_stats()
+        return result
 
 
 UnifiedRAG = FSEUnifiedRAG
@@ -0,0 +1,191 @@
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from fse_catalog.model import Catalog, get_catalog_store
+from fse_utils.tokens import DEFAULT_TOKENIZER, count_tokens
+
+
+def _field(obj, name: str):
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def response_usage(response) -> Optional[Dict]:
+    """Prompt token counts from one chat response (or the final stream chunk), if the backend reports them.
+
+    OpenAI-compatible servers (vLLM, mlx_lm.server) return ``usage.prompt_tokens`` and, when
+    prefix caching details are enabled, ``usage.prompt_tokens_details.cached_tokens``. Ollama
+    only reports ``prompt_eval_count``, the tokens actually prefilled after its prefix cache.
+    """
+    usage = _field(response, 'usage')
+    if usage is not None and _field(usage, 'prompt_tokens') is not None:
+        prompt = _field(usage, 'prompt_tokens')
+        cached = _field(_field(usage, 'prompt_tokens_details'), 'cached_tokens')
+        return {'prompt_tokens': prompt, 'cached_tokens': cached,
+                'prefill_tokens': prompt - cached if cached is not None else prompt}
+    prefill = _field(response, 'prompt_eval_count')
+    if prefill is not None:
+        return {'prompt_tokens': None, 'cached_tokens': None, 'prefill_tokens': prefill}
+    return None
+
+
+def format_program_bundle(catalog: Catalog) -> str:
+    """Core requirements of one catalog year, serialized the same way on every call."""
+    lines = [f"PROGRAM REQUIREMENTS: {catalog.program} ({catalog.year} catalog)"]
+    if catalog.total_credits:
+        lines.append(f"- Total credits: {catalog.total_credits}")
+    if catalog.upper_division_units:
+        lines.append(f"- Upper-division units: {catalog.upper_division_units}")
+    for rule in sorted(catalog.gpa):
+        lines.append(f"- {rule.replace('_', ' ')} GPA: {catalog.gpa[rule]}")
+    if catalog.grade_requirement:
+        lines.append(f"- Grades: {catalog.grade_requirement}")
+    for section in catalog.sections:
+        credits = f" ({section.credits} credits)" if section.credits is not None else ''
+        courses = [f"{c.number} {c.name}".strip() for c in section.courses]
+        courses += [f"sequence {s.number}: " + ', '.join(c.number for c in s.courses) for s in section.sequences]
+        lines.append(f"- {section.name}{credits}: " + '; '.join(courses) if courses else f"- {section.name}{credits}")
+    return '\n'.join(lines)
+
+
+def stable_chunk_key(chunk: Dict) -> Tuple:
+    """Pinned lookups first, then by source document and position, never by per-query score."""
+    metadata = chunk.get('metadata') or {}
+    return (
+        not metadata.get('pinned'),
+        chunk.get('collection') or '',
+        str(metadata.get('source_path') or metadata.get('doc_id') or ''),
+        metadata.get('chunk_index') if isinstance(metadata.get('chunk_index'), int) else -1,
+        metadata.get('text_hash') or chunk.get('text', ''),
+    )
+
+
+class PromptLayout:
+    """Keeps the start of every LLM prompt byte-identical so the backend can reuse its KV cache.
+
+    The system prompt comes first, then the student's program bundle (core requirements for
+    their program and catalog year), then the conversation and the per-question context.
+    Requests from students in the same program share everything up to the retrieved chunks,
+    which are handed to the LLM in a fixed order.
+    """
+
+    def __init__(self, bundle_for=None, stable_chunk_order: bool = True,
+                 max_bundle_tokens: int = 1500, tokenizer: str = DEFAULT_TOKENIZER):
+        self.bundle_for = bundle_for
+        self.stable_chunk_order = stable_chunk_order
+        self.max_bundle_tokens = max_bundle_tokens
+        self.tokenizer = tokenizer
+        self._local = threading.local()
+        self._bundles = lru_cache(maxsize=256)(self._build_bundle)
+
+    def reset_bundles(self):
+        """Forget rendered bundles after the catalog data changes."""
+        self._bundles.cache_clear()
+
+    def begin_request(self):
+        self._local.program = None
+        self._local.calls = []
+
+    def set_context(self, user_context: Dict = None):
+        user_context = user_context or {}
+        program = user_context.get('program')
+        self._local.program = (program, str(user_context.get('year') or '')) if program else None
+
+    def request_stats(self) -> Dict:
+        calls = getattr(self._local, 'calls', [])
+        if not calls:
+            return {}
+        program = getattr(self._local, 'program', None)
+        stats = {'calls': len(calls), 'bundle': '/'.join(program) if program else None}
+        for key in ('prompt_tokens', 'cached_tokens', 'prefill_tokens'):
+            values = [c[key] for c in calls if c.get(key) is not None]
+            stats[key] = sum(values) if values else None
+        if stats['prompt_tokens'] and stats['cached_tokens'] is not None:
+            stats['cached_share'] = round(stats['cached_tokens'] / stats['prompt_tokens'], 3)
+        return stats
+
+    def _build_bundle(self, program: str, year: str) -> str:
+        if self.bundle_for is None:
+            return ''
+        text = self.bundle_for(program, year) or ''
+        if not text or count_tokens(text, self.tokenizer) <= self.max_bundle_tokens:
+            return text
+        # Drop whole trailing lines rather than cutting one mid-course
+        lines = text.split('\n')
+        while len(lines) > 1 and count_tokens('\n'.join(lines), self.tokenizer) > self.max_bundle_tokens:
+            lines.pop()
+        return '\n'.join(lines)
+
+    def bundle(self) -> str:
+        program = getattr(self._local, 'program', None)
+        return self._bundles(*program) if program else ''
+
+    def order_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        return sorted(chunks, key=stable_chunk_key) if self.stable_chunk_order else chunks
+
+    def layout_messages(self, messages: List[Dict]) -> List[Dict]:
+        """System prompt first with the program bundle appended; everything else keeps its order."""
+        bundle = self.bundle()
+        if not bundle or not messages:
+            return messages
+        if messages[0].get('role') == 'system':
+            system = dict(messages[0], content=f"{messages[0].get('content', '').rstrip()}\n\n{bundle}")
+            return [system] + list(messages[1:])
+        return [{'role': 'system', 'content': bundle}] + list(messages)
+
+    def record(self, response):
+        usage = response_usage(response)
+        if usage is not None:
+            if not hasattr(self._local, 'calls'):
+                self._local.calls = []
+            self._local.calls.append(usage)
+
+
+class PromptLayoutAPI:
+    """Wraps the chat API handed to core_rag's LLMHandler: lays out messages and records prompt usage."""
+
+    def __init__(self, api, layout: PromptLayout):
+        self.api = api
+        self.layout = layout
+
+    def chat(self, *args, **kwargs):
+        if 'messages' in kwargs:
+            kwargs['messages'] = self.layout.layout_messages(kwargs['messages'])
+        response = self.api.chat(*args, **kwargs)
+        if kwargs.get('stream'):
+            return self._recorded_stream(response)
+        self.layout.record(response)
+        return response
+
+    def _recorded_stream(self, stream):
+        last = None
+        for chunk in stream:
+            last = chunk
+            yield chunk
+        # Ollama and OpenAI-compatible servers put usage on the final chunk
+        self.layout.record(last)
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+
+def build_prompt_layout(config: dict) -> Optional[PromptLayout]:
+    cfg = config.get('prompt_layout', {})
+    if not cfg.get('enabled', False):
+        return None
+    bundle_for = None
+    if cfg.get('program_bundle', True) and get_catalog_store(config) is not None:
+        def bundle_for(program: str, year: str) -> str:
+            store = get_catalog_store(config)
+            catalog = store.catalog(program, year or None) if store is not None else None
+            return format_program_bundle(catalog) if catalog is not None else ''
+    return PromptLayout(
+        bundle_for=bundle_for,
+        stable_chunk_order=cfg.get('stable_chunk_order', True),
+        max_bundle_tokens=cfg.get('max_bundle_tokens', 1500),
+        tokenizer=config.get('ingestion', {}).get('tokenizer', DEFAULT_TOKENIZER),
+    )
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from fse_utils.config_loader import get_project_root
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key TEXT PRIMARY KEY,
+    corpus_version TEXT NOT NULL,
+    score REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_last_used ON scores (last_used);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the cross-encoder's answer enough to matter."""
+    return re.sub(r'\s+', ' ', query).strip().rstrip('?.! ').lower()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class RerankScoreCache:
+    """Cross-encoder scores keyed by (normalized query, chunk content, model, corpus version).
+
+    A bounded in-memory LRU sits in front of an optional SQLite file so scores survive
+    restarts. Entries from an older corpus version are dropped the first time the version
+    changes, and the disk table is trimmed to ``max_disk_entries`` by last use.
+    """
+
+    def __init__(self, max_entries: int = 50000, path: Optional[str] = None, max_disk_entries: int = 500000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._conn = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(query: str, text: str, model_id: str, text_hash: str = None) -> str:
+        h = hashlib.sha256(model_id.encode('utf-8'))
+        h.update(b'\0')
+        h.update(normalize_query(query).encode('utf-8'))
+        h.update(b'\0')
+        h.update((text_hash or content_hash(text)).encode('utf-8'))
+        return h.hexdigest()
+
+    def set_corpus_version(self, version: str):
+        with self._lock:
+            if version == self._version:
+                return
+            self._version = version
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('DELETE FROM scores WHERE corpus_version != ?', (version,))
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        found = {}
+        with self._lock:
+            for k in keys:
+                if k in self._memory:
+                    self._memory.move_to_end(k)
+                    found[k] = self._memory[k]
+            missing = [k for k in keys if k not in found]
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, score FROM scores WHERE corpus_version = ? AND key IN "
+                        f"({','.join('?' * len(batch))})", [self._version or ''] + batch).fetchall()
+                    for k, score in rows:
+                        found[k] = score
+                        self._remember(k, score)
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        if not scores:
+            return
+        with self._lock:
+            for k, score in scores.items():
+                self._remember(k, score)
+            if self._conn is not None:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)',
+                        [(k, self._version or '', s, now) for k, s in scores.items()])
+                    count = self._conn.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+                    if count > self.max_disk_entries:
+                        self._conn.execute(
+                            'DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)',
+                            (count - self.max_disk_entries,))
+
+    def _remember(self, key: str, score: float):
+        self._memory[key] = score
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def __len__(self):
+        return len(self._memory)
+
+
+class CachedReranker:
+    """Wraps a reranker so only (query, chunk) pairs without a cached score reach the cross-encoder.
+
+    Exposes the same ``rerank(query, chunks, top_k=None)`` call as the wrapped reranker. Uncached
+    pairs are scored in one batch through the backend's ``score`` when it has one, else through
+    its own ``rerank``. Hit counts are kept per thread for the current request (``request_stats``)
+    and in total (``stats``).
+    """
+
+    def __init__(self, reranker, cache: RerankScoreCache, model_id: str,
+                 corpus_version: Callable[[], str] = None):
+        self.reranker = reranker
+        self.cache = cache
+        self.model_id = model_id
+        self._corpus_version = corpus_version
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+    def begin_request(self):
+        self._local.hits = 0
+        self._local.misses = 0
+
+    def request_stats(self) -> Dict:
+        hits, misses = getattr(self._local, 'hits', 0), getattr(self._local, 'misses', 0)
+        return {'hits': hits, 'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None}
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.cache),
+                'hit_rate': round(self.hits / total, 3) if total else None}
+
+    def _score_uncached(self, query: str, chunks: List[Dict]) -> List[Optional[float]]:
+        if hasattr(self.reranker, 'score'):
+            return list(self.reranker.score(query, [c.get('text', '') for c in chunks]))
+        tagged = [dict(c, _rerank_idx=i) for i, c in enumerate(chunks)]
+        scores: List[Optional[float]] = [None] * len(chunks)
+        for r in self.reranker.rerank(query, tagged) or []:
+            if '_rerank_idx' in r:
+                scores[r['_rerank_idx']] = r.get('rerank_score', r.get('score'))
+        return scores
+
+    def rerank(self, query: str, chunks: List[Dict], top_k: int = None, **kwargs) -> List[Dict]:
+        if not chunks:
+            return []
+        if self._corpus_version is not None:
+            self.cache.set_corpus_version(self._corpus_version())
+        keys = [self.cache.key(query, c.get('text', ''), self.model_id, (c.get('metadata') or {}).get('text_hash'))
+                for c in chunks]
+        cached = self.cache.get_many(keys)
+        uncached = [i for i, k in enumerate(keys) if k not in cached]
+
+        hits, misses = len(chunks) - len(uncached), len(uncached)
+        self.hits += hits
+        self.misses += misses
+        self._local.hits = getattr(self._local, 'hits', 0) + hits
+        self._local.misses = getattr(self._local, 'misses', 0) + misses
+
+        scores = dict(cached)
+        if uncached:
+            fresh = self._score_uncached(query, [chunks[i] for i in uncached])
+            new = {keys[i]: float(s) for i, s in zip(uncached, fresh) if s is not None}
+            self.cache.put_many(new)
+            scores.update(new)
+
+        # A chunk the wrapped reranker dropped (e.g. its own top-k cut) has no score and stays dropped
+        ranked = sorted((dict(c, rerank_score=scores[k]) for c, k in zip(chunks, keys) if k in scores),
+                        key=lambda c: c['rerank_score'], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+    def __getattr__(self, name):
+        return getattr(self.reranker, name)
+
+
+def build_rerank_cache(config: dict) -> Optional[RerankScoreCache]:
+    cfg = config.get('rerank_cache', {})
+    if not cfg.get('enabled', False):
+        return None
+    path = cfg.get('path')
+    if path and not os.path.isabs(path):
+        path = os.path.join(get_project_root(), path)
+    return RerankScoreCache(
+        max_entries=cfg.get('max_entries', 50000),
+        path=path,
+        max_disk_entries=cfg.get('max_disk_entries', 500000),
+    )
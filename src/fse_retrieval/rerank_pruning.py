@@ -0,0 +1,96 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class AdaptiveReranker:
+    """Feeds candidates to the cross-encoder in retrieval-score order, in batches, and stops early.
+
+    After each batch, the rest of the list is skipped when any of these holds:
+    - ``gap``: the next candidate's retrieval score, min-max normalized over the list, is below
+      ``min_relative_score``;
+    - ``mass``: the candidates scored so far hold ``mass`` of the normalized retrieval score;
+    - ``stable``: ``patience`` consecutive batches added nothing to the current top ``top_k``.
+    At least ``min_candidates`` are always scored. Skipped candidates are dropped, the same as
+    candidates beyond ``max_candidates_for_rerank``.
+    """
+
+    def __init__(self, reranker, top_k: int = 12, batch_size: int = 32, min_candidates: int = 24,
+                 min_relative_score: float = 0.35, mass: float = 0.9, patience: int = 1):
+        self.reranker = reranker
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.min_candidates = max(min_candidates, top_k)
+        self.min_relative_score = min_relative_score
+        self.mass = mass
+        self.patience = patience
+        self._local = threading.local()
+
+    def begin_request(self):
+        self._local.calls = []
+
+    def request_stats(self) -> Dict:
+        calls = getattr(self._local, 'calls', [])
+        return {'candidates': sum(c['candidates'] for c in calls),
+                'pairs_scored': sum(c['pairs_scored'] for c in calls),
+                'stops': [c['stop'] for c in calls]}
+
+    def _normalized(self, scores: List[float]) -> List[float]:
+        """Normalized retrieval scores, so the gap and mass rules work for cosine and RRF alike."""
+        hi, lo = max(scores), min(scores)
+        if hi - lo <= 1e-9:
+            return [1.0] * len(scores)
+        return [(s - lo) / (hi - lo) for s in scores]
+
+    def rerank(self, query: str, chunks: List[Dict], top_k: int = None, **kwargs) -> List[Dict]:
+        if not chunks:
+            return []
+        keep = top_k or self.top_k
+        ordered = sorted(chunks, key=lambda c: c.get('score') or 0.0, reverse=True)
+        norm = self._normalized([c.get('score') or 0.0 for c in ordered])
+        total_mass = sum(norm) or 1.0
+
+        ranked: List[Dict] = []
+        scored, quiet_batches, stop = 0, 0, 'exhausted'
+        while scored < len(ordered):
+            batch = ordered[scored:scored + self.batch_size]
+            previous_top = {id(c) for c in ranked[:keep]}
+            new = self.reranker.rerank(query, batch) or []
+            scored += len(batch)
+            ranked = sorted(ranked + new, key=lambda c: c.get('rerank_score', 0.0), reverse=True)
+            if scored >= len(ordered) or scored < self.min_candidates:
+                continue
+            entered = any(id(c) not in previous_top for c in ranked[:keep])
+            quiet_batches = 0 if entered else quiet_batches + 1
+            if norm[scored] < self.min_relative_score:
+                stop = 'gap'
+            elif sum(norm[:scored]) / total_mass >= self.mass:
+                stop = 'mass'
+            elif quiet_batches >= self.patience:
+                stop = 'stable'
+            else:
+                continue
+            break
+
+        if not hasattr(self._local, 'calls'):
+            self._local.calls = []
+        self._local.calls.append({'candidates': len(ordered), 'pairs_scored': scored, 'stop': stop})
+        return ranked[:top_k] if top_k else ranked
+
+    def __getattr__(self, name):
+        return getattr(self.reranker, name)
+
+
+def build_adaptive_reranker(reranker, config: dict) -> Optional[AdaptiveReranker]:
+    cfg = config.get('reranker', {})
+    adaptive = cfg.get('adaptive', {})
+    if not adaptive.get('enabled', False):
+        return None
+    return AdaptiveReranker(
+        reranker,
+        top_k=cfg.get('top_k_rerank', 12),
+        batch_size=adaptive.get('batch_size', cfg.get('batch_size', 32)),
+        min_candidates=adaptive.get('min_candidates', 24),
+        min_relative_score=adaptive.get('min_relative_score', 0.35),
+        mass=adaptive.get('mass', 0.9),
+        patience=adaptive.get('patience', 1),
+    )
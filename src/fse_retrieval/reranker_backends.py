@@ -0,0 +1,163 @@
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from fse_utils.config_loader import get_project_root
+
+BACKENDS = ('torch', 'int8', 'onnx', 'onnx-int8')
+_DEFAULT_MODEL = 'BAAI/bge-reranker-v2-m3'
+
+
+def _activate(logit: float, activation: str) -> float:
+    if activation != 'sigmoid':
+        return logit
+    if logit >= 0:
+        return 1.0 / (1.0 + math.exp(-logit))
+    z = math.exp(logit)
+    return z / (1.0 + z)
+
+
+class CPUReranker:
+    """Cross-encoder reranker for CPU serving, as a drop-in for core_rag's BGEReranker.
+
+    ``int8`` runs the Hugging Face model with torch dynamic int8 quantization of its Linear
+    layers; ``onnx`` / ``onnx-int8`` run an ONNX export through onnxruntime (exported, and
+    optionally quantized, once into ``onnx_dir``). ``num_threads`` bounds intra-op threads
+    so the reranker does not contend with the embedding and API workers. ``torch`` loads the
+    unquantized model (used by the reranker service, which needs pair-level scoring).
+    """
+
+    def __init__(self, backend: str = 'int8', model: str = _DEFAULT_MODEL, batch_size: int = 32,
+                 max_length: int = 512, activation: str = 'sigmoid', num_threads: int = None,
+                 onnx_dir: str = '.cache/onnx_reranker'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported CPU reranker backend '{backend}'")
+        from transformers import AutoTokenizer
+
+        self.backend = backend
+        self.model_name = model
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.activation = activation
+        self.num_threads = num_threads
+        self.tokenizer = AutoTokenizer.from_pretrained(model)
+        if backend in ('torch', 'int8'):
+            self._load_torch(quantize=backend == 'int8')
+        else:
+            self._load_onnx(onnx_dir, quantize=backend == 'onnx-int8')
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.model_name}:{self.backend}"
+
+    def _load_torch(self, quantize: bool):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self._torch = torch
+
+    def _load_onnx(self, onnx_dir: str, quantize: bool):
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        root = Path(onnx_dir if os.path.isabs(onnx_dir) else os.path.join(get_project_root(), onnx_dir))
+        export_dir = root / self.model_name.replace('/', '__')
+        if not (export_dir / 'model.onnx').exists():
+            print(f"Exporting {self.model_name} to ONNX in {export_dir}...")
+            ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True).save_pretrained(export_dir)
+            self.tokenizer.save_pretrained(export_dir)
+        model_dir, file_name = export_dir, 'model.onnx'
+        if quantize:
+            model_dir = export_dir / 'int8'
+            file_name = 'model_quantized.onnx'
+            if not (model_dir / file_name).exists():
+                from optimum.onnxruntime import ORTQuantizer
+                from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+                print(f"Quantizing ONNX reranker to int8 in {model_dir}...")
+                quantizer = ORTQuantizer.from_pretrained(export_dir)
+                quantizer.quantize(save_dir=model_dir,
+                                   quantization_config=AutoQuantizationConfig.avx2(is_static=False))
+
+        options = onnxruntime.SessionOptions()
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.model = ORTModelForSequenceClassification.from_pretrained(
+            model_dir, file_name=file_name, session_options=options, provider='CPUExecutionProvider')
+        self._torch = None
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        return self.score_pairs([(query, t) for t in texts])
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Scores for (query, text) pairs; the queries in one call may differ."""
+        scores = []
+        for start in range(0, len(pairs), self.batch_size):
+            queries, texts = zip(*pairs[start:start + self.batch_size])
+            if self._torch is not None:
+                inputs = self.tokenizer(list(queries), list(texts), padding=True, truncation=True,
+                                        max_length=self.max_length, return_tensors='pt')
+                with self._torch.inference_mode():
+                    logits = self.model(**inputs).logits.view(-1).float().tolist()
+            else:
+                inputs = self.tokenizer(list(queries), list(texts), padding=True, truncation=True,
+                                        max_length=self.max_length, return_tensors='np')
+                logits = self.model(**inputs).logits.reshape(-1).tolist()
+            scores.extend(_activate(float(x), self.activation) for x in logits)
+        return scores
+
+    def rerank(self, query: str, chunks: List[Dict], top_k: int = None) -> List[Dict]:
+        """Chunks sorted by cross-encoder relevance, each with a ``rerank_score``."""
+        if not chunks:
+            return []
+        scores = self.score(query, [c.get('text', '') for c in chunks])
+        ranked = sorted((dict(c, rerank_score=s) for c, s in zip(chunks, scores)),
+                        key=lambda c: c['rerank_score'], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+
+def build_reranker(config: dict):
+    """Reranker for ``reranker.backend``: core_rag's BGEReranker for 'torch', else a CPUReranker.
+
+    With ``reranker.service.enabled`` (or ``RERANK_SERVICE_URL``) a RerankerClient for the shared
+    reranker service is returned instead, falling back to a local model if the service is down
+    and ``fallback_local`` is set.
+    """
+    cfg = config.get('reranker', {})
+    service_cfg = cfg.get('service', {})
+    service_url = os.getenv('RERANK_SERVICE_URL') or (service_cfg.get('url') if service_cfg.get('enabled') else None)
+    if service_url:
+        from fse_retrieval.reranker_service import RerankerClient
+
+        client = RerankerClient(service_url, timeout=service_cfg.get('timeout_s', 30))
+        try:
+            print(f"Using reranker service {client.model_id} at {service_url}")
+            return client
+        except Exception as e:
+            if not service_cfg.get('fallback_local', True):
+                raise
+            print(f"Warning: Reranker service at {service_url} unavailable ({e}), loading a local reranker")
+    backend = os.getenv('RERANK_BACKEND') or cfg.get('backend', 'torch')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown reranker backend '{backend}', expected one of {BACKENDS}")
+    if backend == 'torch':
+        from core_rag.retrieval.reranker import BGEReranker
+        return BGEReranker()
+    return CPUReranker(
+        backend=backend,
+        model=cfg.get('hf_model') or cfg.get('model', _DEFAULT_MODEL),
+        batch_size=cfg.get('batch_size', 32),
+        max_length=cfg.get('max_length', 512),
+        activation=cfg.get('activation', 'sigmoid'),
+        num_threads=cfg.get('num_threads'),
+        onnx_dir=cfg.get('onnx_dir', '.cache/onnx_reranker'),
+    )
+
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Local reranker service: one cross-encoder shared by the Slack bot, Streamlit and eval runs.
+
+Pairs from concurrent requests are collected for a few milliseconds and scored as one batch.
+Clients reach it through RerankerClient (reranker.service in model.yaml).
+
+Usage (from repo root):
+    python src/fse_retrieval/reranker_service.py                      # reranker.service.url
+    python src/fse_retrieval/reranker_service.py --url http://127.0.0.1:8765
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fse_utils.config_loader import get_project_root
+
+DEFAULT_URL = 'unix://.cache/reranker.sock'
+
+
+class _Request:
+    __slots__ = ('pairs', 'scores', 'error', 'done')
+
+    def __init__(self, pairs: List[Tuple[str, str]]):
+        self.pairs = pairs
+        self.scores: Optional[List[float]] = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class PairBatcher:
+    """Merges (query, text) pairs from concurrent callers into shared model batches.
+
+    The first waiting request opens a ``window_ms`` window; everything that arrives in it, up
+    to ``max_batch_pairs``, is scored in one ``score_pairs`` call. A request larger than the
+    cap is never split, so a batch may exceed it by that one request.
+    """
+
+    def __init__(self, score_pairs: Callable[[List[Tuple[str, str]]], List[float]],
+                 window_ms: float = 5.0, max_batch_pairs: int = 128):
+        self.score_pairs = score_pairs
+        self.window_s = window_ms / 1000.0
+        self.max_batch_pairs = max_batch_pairs
+        self._pending: List[_Request] = []
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.requests = 0
+        self.pairs = 0
+        self._thread = threading.Thread(target=self._run, name='rerank-batcher', daemon=True)
+        self._thread.start()
+
+    def score(self, query: str, texts: List[str], timeout: float = None) -> List[float]:
+        if not texts:
+            return []
+        request = _Request([(query, t) for t in texts])
+        with self._cond:
+            self._pending.append(request)
+            self._cond.notify()
+        if not request.done.wait(timeout):
+            raise TimeoutError('Reranker batch did not finish in time')
+        if request.error is not None:
+            raise request.error
+        return request.scores
+
+    def stats(self) -> Dict:
+        return {'batches': self.batches, 'requests': self.requests, 'pairs': self.pairs,
+                'avg_requests_per_batch': round(self.requests / self.batches, 2) if self.batches else None}
+
+    def _take_batch(self) -> List[_Request]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window_s
+            while sum(len(r.pairs) for r in self._pending) < self.max_batch_pairs:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0].pairs) <= self.max_batch_pairs):
+                request = self._pending.pop(0)
+                batch.append(request)
+                size += len(request.pairs)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            pairs = [p for r in batch for p in r.pairs]
+            try:
+                scores = self.score_pairs(pairs)
+            except Exception as e:
+                for r in batch:
+                    r.error = e
+                    r.done.set()
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            self.pairs += len(pairs)
+            start = 0
+            for r in batch:
+                r.scores = list(scores[start:start + len(r.pairs)])
+                start += len(r.pairs)
+                r.done.set()
+
+
+def _resolve_socket_path(url: str) -> str:
+    path = url[len('unix://'):]
+    return path if os.path.isabs(path) else os.path.join(get_project_root(), path)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class RerankerClient:
+    """Drop-in reranker that scores through the reranker service instead of a local model."""
+
+    def __init__(self, url: str = DEFAULT_URL, timeout: float = 30.0):
+        self.url = url
+        self.timeout = timeout
+        self._model_id = None
+
+    def _request(self, method: str, path: str, body: Dict = None) -> Dict:
+        if self.url.startswith('unix://'):
+            conn = _UnixHTTPConnection(_resolve_socket_path(self.url), self.timeout)
+        else:
+            parsed = urlparse(self.url)
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+        try:
+            payload = json.dumps(body) if body is not None else None
+            conn.request(method, path, body=payload, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            data = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"Reranker service returned {response.status}: {data[:200]!r}")
+            return json.loads(data)
+        finally:
+            conn.close()
+
+    def health(self) -> Dict:
+        return self._request('GET', '/health')
+
+    @property
+    def model_id(self) -> str:
+        if self._model_id is None:
+            self._model_id = self.health()['model_id']
+        return self._model_id
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        if not texts:
+            return []
+        return self._request('POST', '/score', {'query': query, 'texts': texts})['scores']
+
+    def rerank(self, query: str, chunks: List[Dict], top_k: int = None) -> List[Dict]:
+        if not chunks:
+            return []
+        scores = self.score(query, [c.get('text', '') for c in chunks])
+        ranked = sorted((dict(c, rerank_score=s) for c, s in zip(chunks, scores)),
+                        key=lambda c: c['rerank_score'], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+
+def create_app(reranker, batcher: PairBatcher):
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    class ScoreRequest(BaseModel):
+        query: str
+        texts: List[str]
+
+    app = FastAPI(title='PantherBot reranker')
+
+    # Sync handlers run in the server's threadpool, so concurrent requests meet in the batcher
+    @app.post('/score')
+    def score(request: ScoreRequest):
+        return {'scores': batcher.score(request.query, request.texts)}
+
+    @app.get('/health')
+    def health():
+        return {'model_id': reranker.model_id, 'batching': batcher.stats()}
+
+    return app
+
+
+def main():
+    from fse_retrieval.reranker_backends import CPUReranker
+    from fse_utils.config_loader import load_config
+
+    config = load_config()
+    cfg = config.get('reranker', {})
+    service_cfg = cfg.get('service', {})
+    parser = argparse.ArgumentParser(description='Serve one shared reranker with cross-request batching')
+    parser.add_argument('--url', default=service_cfg.get('url', DEFAULT_URL),
+                        help='http://host:port or unix://path/to.sock')
+    parser.add_argument('--backend', default=os.getenv('RERANK_BACKEND') or cfg.get('backend', 'torch'))
+    parser.add_argument('--window-ms', type=float, default=service_cfg.get('window_ms', 5))
+    parser.add_argument('--max-batch-pairs', type=int, default=service_cfg.get('max_batch_pairs', 128))
+    args = parser.parse_args()
+
+    import uvicorn
+
+    reranker = CPUReranker(
+        backend=args.backend,
+        model=cfg.get('hf_model') or cfg.get('model', 'BAAI/bge-reranker-v2-m3'),
+        batch_size=cfg.get('batch_size', 32),
+        max_length=cfg.get('max_length', 512),
+        activation=cfg.get('activation', 'sigmoid'),
+        num_threads=cfg.get('num_threads'),
+        onnx_dir=cfg.get('onnx_dir', '.cache/onnx_reranker'),
+    )
+    batcher = PairBatcher(reranker.score_pairs, args.window_ms, args.max_batch_pairs)
+    app = create_app(reranker, batcher)
+    print(f"Serving {reranker.model_id} on {args.url}")
+    if args.url.startswith('unix://'):
+        path = _resolve_socket_path(args.url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        uvicorn.run(app, uds=path, log_level='warning')
+    else:
+        parsed = urlparse(args.url)
+        uvicorn.run(app, host=parsed.hostname, port=parsed.port or 8765, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
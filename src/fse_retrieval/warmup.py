@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_STEPS = ('embed', 'rerank', 'llm')
+
+
+class RAGWarmup:
+    """Builds the RAG engine and warms its models on a background thread.
+
+    ``get_engine`` waits only for the engine to be constructed, so requests can be served
+    while the reranker and LLM are still warming; ``wait`` blocks until every warmup step
+    has run. Progress is available from ``status()`` and, if ``status_path`` is set, as JSON.
+    """
+
+    def __init__(self, build: Callable[[], Any], steps: Iterable[str] = DEFAULT_STEPS,
+                 status_path: Optional[str] = None):
+        self._build = build
+        self.steps = tuple(steps)
+        self.status_path = status_path
+        self.engine = None
+        self.engine_ready = threading.Event()
+        self.ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._state = 'pending'
+        self._error: Optional[str] = None
+        self._results: Dict[str, Dict] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def start(self) -> 'RAGWarmup':
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='rag-warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def get_engine(self, timeout: float = None):
+        """The engine once constructed (starting the warmup if needed); None if the build failed."""
+        self.start()
+        self.engine_ready.wait(timeout)
+        return self.engine
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.ready.wait(timeout)
+
+    def status(self) -> Dict:
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = round((self._finished_at or time.time()) - self._started_at, 3)
+        status = {'state': self._state, 'ready': self._state in ('ready', 'degraded'), 'elapsed_s': elapsed,
+                  'steps': dict(self._results)}
+        if self._error:
+            status['error'] = self._error
+        return status
+
+    def _run(self):
+        self._started_at = time.time()
+        self._set_state('building')
+        start = time.perf_counter()
+        try:
+            self.engine = self._build()
+            self._results['build'] = {'ok': True, 'seconds': round(time.perf_counter() - start, 3)}
+        except Exception as e:
+            self._error = f"Engine build failed: {e}"
+            self._results['build'] = {'ok': False, 'seconds': round(time.perf_counter() - start, 3)}
+            self._finish('failed')
+            return
+        self.engine_ready.set()
+
+        self._set_state('warming')
+        warmup = getattr(self.engine, 'warmup', None)
+        if warmup is not None and self.steps:
+            try:
+                self._results.update(warmup(self.steps))
+            except Exception as e:
+                self._error = f"Warmup failed: {e}"
+        ok = not self._error and all(r.get('ok') for r in self._results.values())
+        self._finish('ready' if ok else 'degraded')
+
+    def _finish(self, state: str):
+        self._finished_at = time.time()
+        self._set_state(state)
+        self.engine_ready.set()
+        self.ready.set()
+        print(f"RAG warmup {state} after {self._finished_at - self._started_at:.1f}s: "
+              + ', '.join(f"{k}={'ok' if v.get('ok') else 'failed'} ({v.get('seconds')}s)"
+                          for k, v in self._results.items()))
+
+    def _set_state(self, state: str):
+        self._state = state
+        if not self.status_path:
+            return
+        try:
+            Path(self.status_path).parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{self.status_path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp, self.status_path)
+        except OSError as e:
+            print(f"Warning: Could not write warmup status: {e}")
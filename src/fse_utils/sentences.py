@@ -0,0 +1,35 @@
+import re
+from typing import List
+
+# Segments shorter than this (headers, course list lines) are never scored or dropped
+MIN_SCORED_WORDS = 6
+
+_BOUNDARY_RE = re.compile(r'(?<=[.!?])[ \t]+(?=[A-Z(\[])|\n+')
+_ABBREVIATIONS = ('e.g.', 'i.e.', 'etc.', 'vs.', 'dr.', 'st.', 'no.', 'approx.', 'ph.d.', 'b.s.', 'm.s.', 'b.a.')
+
+
+def split_segments(text: str) -> List[str]:
+    """Split into sentence/line segments whose concatenation is exactly ``text``.
+
+    Each segment keeps its trailing whitespace, so dropping segments and joining the rest
+    leaves the kept text (course codes, numbers, punctuation) byte-for-byte unchanged.
+    """
+    segments, start = [], 0
+    for m in _BOUNDARY_RE.finditer(text):
+        before = text[start:m.start()].lower()
+        if '\n' not in m.group() and before.endswith(_ABBREVIATIONS):
+            continue
+        segments.append(text[start:m.end()])
+        start = m.end()
+    if start < len(text):
+        segments.append(text[start:])
+    return segments
+
+
+def is_scored(segment: str) -> bool:
+    return len(segment.split()) >= MIN_SCORED_WORDS
+
+
+def scored_sentences(text: str) -> List[str]:
+    """The stripped segments that sentence-level relevance scoring applies to."""
+    return [s.strip() for s in split_segments(text) if is_scored(s)]
@@ -0,0 +1,75 @@
+import hashlib
+import math
+import os
+import tempfile
+from functools import lru_cache
+
+import tiktoken
+
+DEFAULT_TOKENIZER = 'cl100k_base'
+
+_BLOB = 'https://openaipublic.blob.core.windows.net'
+# Files tiktoken downloads (and caches by sha1 of the URL) for its built-in encodings
+_ENCODING_FILES = {
+    'gpt2': (f'{_BLOB}/gpt-2/encodings/main/vocab.bpe', f'{_BLOB}/gpt-2/encodings/main/encoder.json'),
+    'r50k_base': (f'{_BLOB}/encodings/r50k_base.tiktoken',),
+    'p50k_base': (f'{_BLOB}/encodings/p50k_base.tiktoken',),
+    'p50k_edit': (f'{_BLOB}/encodings/p50k_base.tiktoken',),
+    'cl100k_base': (f'{_BLOB}/encodings/cl100k_base.tiktoken',),
+    'o200k_base': (f'{_BLOB}/encodings/o200k_base.tiktoken',),
+    'o200k_harmony': (f'{_BLOB}/encodings/o200k_base.tiktoken',),
+}
+
+
+@lru_cache(maxsize=4)
+def get_encoding(name: str = DEFAULT_TOKENIZER):
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str, tokenizer: str = DEFAULT_TOKENIZER) -> int:
+    if not text:
+        return 0
+    return len(get_encoding(tokenizer).encode(text, disallowed_special=()))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough count (4 characters per token) for when no tokenizer is available offline."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _tiktoken_cache_dir() -> str:
+    """Where tiktoken caches downloaded encoding files ('' disables its cache)."""
+    if 'TIKTOKEN_CACHE_DIR' in os.environ:
+        return os.environ['TIKTOKEN_CACHE_DIR']
+    if 'DATA_GYM_CACHE_DIR' in os.environ:
+        return os.environ['DATA_GYM_CACHE_DIR']
+    return os.path.join(tempfile.gettempdir(), 'data-gym-cache')
+
+
+def encoding_available_offline(name: str = DEFAULT_TOKENIZER) -> bool:
+    """True if the encoding loads without downloading anything: every file it needs is in tiktoken's cache."""
+    files = _ENCODING_FILES.get(name)
+    if files is None:
+        # Plugin encodings are not fetched from the public blob store
+        try:
+            get_encoding(name)
+            return True
+        except Exception:
+            return False
+    cache_dir = _tiktoken_cache_dir()
+    return bool(cache_dir) and all(
+        os.path.exists(os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())) for url in files)
+
+
+def configured_tokenizer(config: dict) -> str:
+    return config.get('ingestion', {}).get('tokenizer', DEFAULT_TOKENIZER)
+
+
+def text_stats(text: str, tokenizer: str = DEFAULT_TOKENIZER) -> dict:
+    """Payload fields that let query-time budgeting, dedup and caching skip re-tokenizing and re-hashing."""
+    text = text or ''
+    return {
+        'token_count': count_tokens(text, tokenizer),
+        'char_len': len(text),
+        'text_hash': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+    }
@@ -2,6 +2,7 @@ import asyncio
 import os
 import logging
 import textwrap
+import threading
 from typing import Dict, Any
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
@@ -16,6 +17,7 @@ from slackbot_config import load_slack_config
 
 sys.path.append(str(Path(__file__).parent.parent))
 from fse_utils.config_loader import load_config
+from fse_retrieval.warmup import DEFAULT_STEPS, RAGWarmup
 
 sys.path.append(str(Path(__file__).parent))
 from slackbot_formatter import SlackFormatter
@@ -45,6 +47,15 @@ class PantherSlackBot:
         self.client = AsyncWebClient(token=self.slack_bot_token)
         self.config = load_config()
         self._rag_system = None
+        self._rag_lock = threading.Lock()
+        self.warmup_cfg = self.config.get('warmup', {})
+        self._warmup = None
+        if self.warmup_cfg.get('enabled', False):
+            self._warmup = RAGWarmup(
+                self._build_rag_system,
+                steps=self.warmup_cfg.get('steps', DEFAULT_STEPS),
+                status_path=self.warmup_cfg.get('status_path'),
+            )
 
         from fse_memory.fse_student_manager import FSEStudentManager
         from fse_memory.fse_chat_session import init_all_schemas
@@ -74,12 +85,25 @@ class PantherSlackBot:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _build_rag_system():
+        from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+        return FSEUnifiedRAG()
+
     def _get_rag_system(self):
-        if self._rag_system is None:
-            from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
-            self._rag_system = FSEUnifiedRAG()
+        # Sessions call this from asyncio.to_thread workers; only one of them may build the engine
+        with self._rag_lock:
+            if self._rag_system is None:
+                # The warmup thread may still be building the engine; wait for it rather than build a second one
+                if self._warmup is not None:
+                    self._rag_system = self._warmup.get_engine()
+                if self._rag_system is None:
+                    self._rag_system = self._build_rag_system()
         return self._rag_system
 
+    def warmup_status(self) -> Dict[str, Any]:
+        return self._warmup.status() if self._warmup is not None else {'state': 'disabled'}
+
     async def _get_or_create_session(self, user_id: str):
         if user_id not in self._user_sessions:
             from fse_memory.fse_chat_session import FSEChatSession
@@ -87,6 +111,8 @@ class PantherSlackBot:
 
             session_id = await asyncio.to_thread(get_latest_session_id, user_id, self.config)
             session = await asyncio.to_thread(FSEChatSession, user_id, session_id, self.config)
+            # Share the bot's (warmed) engine instead of each session building its own
+            session.rag = await asyncio.to_thread(self._get_rag_system)
             self._user_sessions[user_id] = session
         return self._user_sessions[user_id]
 
@@ -177,6 +203,12 @@ class PantherSlackBot:
             self.bot_user_id = auth_response["user_id"]
             self.bot_info = auth_response
             self.logger.info(f"Bot authenticated as {auth_response['user']} (ID: {self.bot_user_id})")
+            if self._warmup is not None:
+                self._warmup.start()
+                if self.warmup_cfg.get('block_until_ready', False):
+                    self.logger.info("Waiting for RAG warmup before connecting to Slack...")
+                    await asyncio.to_thread(self._warmup.wait, self.warmup_cfg.get('timeout_s'))
+                self.logger.info(f"RAG warmup status: {self.warmup_status()}")
             await self.handler.start_async()
             self.logger.info("PantherBot is now running and listening for messages!")
         except SlackApiError as e:
@@ -0,0 +1,472 @@
+from pathlib import Path
+
+import pytest
+
+from fse_catalog.course_codes import display_course_code, find_course_codes, normalize_course_code
+from fse_catalog.model import CatalogStore, load_catalog_file
+from fse_ingestion.catalog_chunker import chunk_catalog, is_catalog_json
+
+DATA = Path(__file__).parent.parent / "data"
+CATALOG_JSON = DATA / "major_catalog_json"
+
+
+@pytest.fixture(scope="module")
+def store():
+    return CatalogStore.from_directories(str(CATALOG_JSON), str(DATA / "4_year_plans"))
+
+
+@pytest.fixture(scope="module")
+def cs_2024_chunks():
+    return chunk_catalog(load_catalog_file(str(CATALOG_JSON / "2024" / "2024_CompSci.json")))
+
+
+# ---------------------------------------------------------------------------
+# Course code normalization
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("raw", ["CPSC350", "cpsc-350", "CPSC 350", "Cpsc_350"])
+def test_normalize_course_code_variants(raw):
+    assert normalize_course_code(raw) == "CPSC350"
+
+
+def test_display_course_code_keeps_lab_suffix():
+    assert display_course_code("phys101l") == "PHYS 101L"
+
+
+def test_find_course_codes_in_question():
+    assert find_course_codes("Can I take cpsc-350 before CPSC 231?") == ["CPSC350", "CPSC231"]
+
+
+def test_find_course_codes_ignores_ordinary_words():
+    assert find_course_codes("I have 120 credits") == []
+    assert find_course_codes("took math 110 and ABCD 101") == ["MATH110", "ABCD101"]
+
+
+# ---------------------------------------------------------------------------
+# Catalog chunker — uses the checked-in catalog JSON, no services required
+# ---------------------------------------------------------------------------
+
+def test_is_catalog_json():
+    assert is_catalog_json("data/major_catalog_json/2024/2024_CompSci.json")
+    assert not is_catalog_json("data/4_year_plans/2026/2026_cs_plan.json")
+    assert not is_catalog_json("data/major_catalog/2024/2024_cs.pdf")
+
+
+def test_one_chunk_per_course(cs_2024_chunks):
+    codes = [c["metadata"]["CourseCode"] for c in cs_2024_chunks if c["metadata"]["ChunkType"] == "course"]
+    assert len(codes) == len(set(codes))
+    assert "CPSC350" in codes
+
+
+def test_course_chunk_payload_fields(cs_2024_chunks):
+    chunk = next(c for c in cs_2024_chunks if c["metadata"].get("CourseCode") == "CPSC350")
+    meta = chunk["metadata"]
+    assert meta["Year"] == "2024"
+    assert meta["SubjectCode"] == "cs"
+    assert meta["CourseNumber"] == "CPSC 350"
+    assert meta["Section"] == "Upper-Division Requirements"
+    assert "Prerequisite: CPSC 231" in chunk["text"]
+
+
+def test_sequence_courses_list_every_placement(cs_2024_chunks):
+    chunk = next(c for c in cs_2024_chunks if c["metadata"].get("CourseCode") == "BIOL204")
+    assert "Sequence 1" in chunk["text"] and "Sequence 2" in chunk["text"]
+
+
+def test_unchanged_course_has_same_dedup_key_across_years():
+    from fse_ingestion.catalog_chunker import CATALOG_YEARS_PLACEHOLDER, dedup_key
+
+    def course_chunks(year, name):
+        catalog = load_catalog_file(str(CATALOG_JSON / year / name))
+        return {c["metadata"].get("CourseCode"): c
+                for c in chunk_catalog(catalog, year_label=CATALOG_YEARS_PLACEHOLDER)}
+
+    cs_2023 = course_chunks("2023", "2023_CompSci.json")
+    cs_2024 = course_chunks("2024", "2024_CompSci.json")
+    shared = [code for code in cs_2023 if code and code in cs_2024
+              and cs_2023[code]["text"] == cs_2024[code]["text"]]
+    assert shared
+    assert dedup_key(cs_2023[shared[0]]) == dedup_key(cs_2024[shared[0]])
+    assert "2023" not in cs_2023[shared[0]]["text"].split("\n")[1]
+
+
+def test_format_catalog_years():
+    from fse_ingestion.catalog_chunker import format_catalog_years
+    assert format_catalog_years(["2024"]) == "2024 catalog"
+    assert format_catalog_years(["2024", "2022", "2023"]) == "2022–2024 catalogs"
+    assert format_catalog_years(["2022", "2025"]) == "2022, 2025 catalogs"
+
+
+def test_section_and_program_chunks(cs_2024_chunks):
+    types = [c["metadata"]["ChunkType"] for c in cs_2024_chunks]
+    assert types[0] == "program"
+    assert types.count("section") == 6
+    assert "Upper-division units: 21" in cs_2024_chunks[0]["text"]
+
+
+# ---------------------------------------------------------------------------
+# CourseIndex — exact course-number lookup
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def course_index(store):
+    from fse_catalog.course_index import CourseIndex
+    return CourseIndex.from_store(store)
+
+
+def test_course_index_prefers_student_year_and_program(course_index):
+    chunk = course_index.lookup("cpsc-350", year="2023", program="cs")
+    assert chunk["metadata"]["Year"] == "2023"
+    assert chunk["metadata"]["SubjectCode"] == "cs"
+
+
+def test_course_index_falls_back_to_newest_year(course_index):
+    chunk = course_index.lookup("CPSC 350")
+    assert chunk["metadata"]["Year"] == "2025"
+
+
+def test_course_index_resolves_mentions(course_index):
+    hits = course_index.resolve("What are the CPSC 350 prerequisites?", year="2024", program="cs")
+    assert [h["metadata"]["CourseCode"] for h in hits] == ["CPSC350"]
+    assert course_index.mentions_only_indexed("What are the CPSC 350 prerequisites?")
+    assert not course_index.mentions_only_indexed("What are the upper division requirements?")
+    assert not course_index.mentions_only_indexed("Is CPSC 350 like ZZZZ 999?")
+    assert course_index.lookup("ZZZZ 999") is None
+
+
+# ---------------------------------------------------------------------------
+# PrereqGraph — compiled prerequisite DAG
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("text,groups", [
+    ("CPSC 230, MATH 203 or MATH 303 or MGSC 209", (("CPSC230",), ("MATH203", "MATH303", "MGSC209"))),
+    ("CENG 381 and MATH 116 or MATH 210", (("CENG381",), ("MATH116", "MATH210"))),
+    ("PHYS 101, and MATH 111, or MATH 115", (("PHYS101",), ("MATH111", "MATH115"))),
+    ("MATH 101 with a minimum grade of C-", (("MATH101",),)),
+    ("", ()),
+])
+def test_parse_requisites_groups(text, groups):
+    from fse_catalog.prereq_graph import parse_requisites
+    assert parse_requisites(text)[0] == groups
+
+
+def test_parse_requisites_keeps_non_course_notes():
+    from fse_catalog.prereq_graph import parse_requisites
+    assert parse_requisites("CPSC 230, or equivalent") == ((("CPSC230",),), "equivalent")
+    assert parse_requisites("consent of instructor") == ((), "consent of instructor")
+
+
+@pytest.fixture(scope="module")
+def prereq_graphs(store):
+    from fse_catalog.prereq_graph import PrereqGraphSet
+    return PrereqGraphSet.from_store(store)
+
+
+def test_prereq_graph_transitive_closure(prereq_graphs):
+    graph = prereq_graphs.get("cs", "2025")
+    assert graph.prerequisites("CPSC 350") == (("CPSC231", "CENG231"),)
+    assert {"CPSC350", "CPSC231", "CPSC230", "MATH250"} <= graph.ancestors("CPSC 406")
+    assert "CPSC406" in graph.unlocks("CPSC 350")
+    assert "CPSC406" in graph.descendants("CPSC 230")
+    assert graph.is_satisfied("CPSC 350", ["CENG 231"])
+    assert not graph.is_satisfied("CPSC 406", ["CPSC 350"])
+
+
+def test_prereq_chain_text(prereq_graphs):
+    chain = prereq_graphs.get("cs", "2025").prerequisite_chain("cpsc406")
+    assert chain.startswith("Prerequisite chain for CPSC 406 (cs 2025 catalog)")
+    assert "- CPSC 350 requires (CPSC 231 or CENG 231)" in chain
+
+
+# ---------------------------------------------------------------------------
+# PlanScheduler — deterministic semester plans
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def curricula(store):
+    return {program: plan for (program, year), plan in store.plans.items() if year == "2026"}
+
+
+def _term_of(plan, code):
+    for index, term in enumerate(plan["semesters"]):
+        if any(c["code"] == code for c in term["courses"]):
+            return index
+    return None
+
+
+@pytest.mark.parametrize("program", ["cs", "ce", "ee", "se", "ds"])
+def test_curriculum_schedules_unchanged(curricula, prereq_graphs, program):
+    from fse_catalog.plan_scheduler import PlanScheduler
+    plan = PlanScheduler(curricula[program], prereq_graphs.get(program, "2026"),
+                         fallback_graphs=prereq_graphs).schedule()
+    assert plan["valid"]
+    assert plan["moved"] == []
+    assert len(plan["semesters"]) == 8
+    assert all(t["credits"] <= 18 for t in plan["semesters"])
+
+
+def test_credit_cap_respects_prerequisites(curricula, prereq_graphs):
+    from fse_catalog.plan_scheduler import PlanScheduler
+    graph = prereq_graphs.get("cs", "2026")
+    plan = PlanScheduler(curricula["cs"], graph, credit_cap=12, fallback_graphs=prereq_graphs).schedule()
+    assert plan["valid"]
+    assert all(t["credits"] <= 12 for t in plan["semesters"])
+    for course in ("CPSC350", "CPSC406"):
+        for group in graph.prerequisites(course):
+            scheduled = [_term_of(plan, c) for c in group if _term_of(plan, c) is not None]
+            assert not scheduled or min(scheduled) < _term_of(plan, course)
+
+
+def test_extra_courses_fill_spare_credits(curricula, prereq_graphs):
+    from fse_catalog.plan_scheduler import PlanScheduler, format_schedule
+    plan = PlanScheduler(curricula["cs"], prereq_graphs.get("cs", "2026"),
+                         fallback_graphs=prereq_graphs).schedule(
+        completed=["CPSC 230"], extra_courses=[{"code": "CENG 330", "credits": 4}, {"code": "ZZZZ 999"}])
+    assert plan["moved"] == []
+    assert _term_of(plan, "CPSC230") is None
+    assert _term_of(plan, "CENG330") is not None
+    assert plan["unknown_prerequisites"] == ["ZZZZ999"]
+    assert "Year 1 Fall" in format_schedule(plan)
+
+
+def test_corequisites_land_in_the_same_term():
+    from fse_catalog.model import FourYearPlan, PlanCourse, PlanTerm
+    from fse_catalog.plan_scheduler import PlanScheduler
+    from fse_catalog.prereq_graph import PrereqGraph
+
+    def term(semester, *codes):
+        return PlanTerm(1, semester, 3 * len(codes), tuple(PlanCourse(c, c, 3, "core") for c in codes))
+
+    curriculum = FourYearPlan("zz", "Test", "2026", 12, {},
+                              (term("Fall", "ENGR101", "ENGR201"), term("Spring"), term("Fall", "ENGR102")))
+    graph = PrereqGraph("zz", "2026", {"ENGR101": (), "ENGR102": (), "ENGR201": ()},
+                        coreqs={"ENGR101": (("ENGR102",),), "ENGR201": (("ENGR202",),)})
+    plan = PlanScheduler(curriculum, graph).schedule()
+    assert plan["valid"]
+    assert _term_of(plan, "ENGR101") == _term_of(plan, "ENGR102") == 2
+    assert _term_of(plan, "ENGR201") == 0
+    assert plan["assumed_prerequisites"] == ["ENGR202"]
+
+    mutual = PrereqGraph("zz", "2026", {"ENGR101": (), "ENGR102": (), "ENGR201": ()},
+                         coreqs={"ENGR101": (("ENGR102",),), "ENGR102": (("ENGR101",),)})
+    curriculum = FourYearPlan("zz", "Test", "2026", 9, {}, (term("Fall", "ENGR101", "ENGR102", "ENGR201"),))
+    plan = PlanScheduler(curriculum, mutual, credit_cap=6).schedule()
+    assert _term_of(plan, "ENGR101") == _term_of(plan, "ENGR102") == 0
+    assert _term_of(plan, "ENGR201") == 1
+
+
+# ---------------------------------------------------------------------------
+# DegreeAuditor — remaining requirements
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def auditor(store):
+    from fse_catalog.degree_audit import DegreeAuditor
+    return DegreeAuditor.from_store(store)
+
+
+def _section(result, name):
+    return next(s for s in result["sections"] if s["name"] == name)
+
+
+def test_audit_remaining_courses_and_sequences(auditor):
+    result = auditor.audit("cs", "2025", ["CPSC 230", "CPSC 231", "MATH 110", "MATH 111"])
+    assert not result["complete"]
+    core = _section(result, "Lower-Division Core Requirements")
+    assert {"courses": ["ENGR101", "MATH215", "MATH250"]} in core["remaining"]
+    sequence = next(r for r in core["remaining"] if r.get("one_of_sequences"))
+    assert sequence["closest"] == "Sequence 1"
+    assert sequence["courses"] == ["MATH210"]
+
+
+def test_audit_elective_and_repeatable_credits(auditor):
+    result = auditor.audit("cs", "2025", ["CPSC 298", "CPSC 298", "SE 300", "CPSC 402"])
+    electives = _section(result, "Electives")["remaining"][0]
+    assert electives["credits"] == 6
+    assert "SE300" not in electives["choose_from"]
+    colloquium = _section(result, "Colloquium Requirement")["remaining"][0]
+    assert colloquium == {"credits": 3, "choose_from": ["CPSC298"]}
+    assert result["upper_division_units"]["completed"] == 6
+
+
+def test_audit_grades_below_minimum_do_not_count(auditor):
+    result = auditor.audit("cs", "2025", [("ENGR 101", "D"), ("MATH 215", "A")])
+    core = _section(result, "Lower-Division Core Requirements")
+    assert "ENGR101" in core["remaining"][0]["courses"]
+    assert result["gpa"]["major"]["gpa"] == 2.5
+
+
+def test_audit_batch_across_programs(auditor):
+    catalog = auditor.catalog_for("ce", "2024")
+    students = [
+        {"id": "a", "program": "cs", "year": "2023", "completed": ["CPSC 230"]},
+        {"id": "b", "program": "ce", "year": "2024",
+         "completed": catalog.courses * 4},
+        {"id": "c", "program": "zz", "year": "2024", "completed": []},
+    ]
+    results = auditor.audit_batch(students)
+    assert results[0]["year"] == "2023" and not results[0]["complete"]
+    assert results[1]["complete"]
+    assert results[2] is None
+
+
+# ---------------------------------------------------------------------------
+# Catalog model
+# ---------------------------------------------------------------------------
+
+def test_store_shares_interned_course_records(store):
+    catalog = store.catalog("cs", "2025")
+    core = next(s for s in catalog.sections if s.name == "Lower-Division Core Requirements")
+    assert catalog.courses["CPSC230"] is next(c for c in core.courses if c.code == "CPSC230")
+    assert store.catalog("cs", "2024").courses["CPSC230"].code is catalog.courses["CPSC230"].code
+    assert not hasattr(catalog.courses["CPSC230"], "__dict__")
+    assert store.catalog("cs", "2031").year == "2025"
+
+
+def test_store_loads_structured_plans(store):
+    plan = store.plan("cs", "2026")
+    assert plan.catalog_year == "2026"
+    assert len(plan.terms) == 8
+    assert plan.terms[0].semester == "Fall"
+
+
+def test_store_snapshot_round_trip(store, tmp_path):
+    path = str(tmp_path / "catalog_model.pkl")
+    store.save(path, fingerprint=("a",))
+    assert CatalogStore.load(path, fingerprint=("b",)) is None
+    loaded = CatalogStore.load(path, fingerprint=("a",))
+    assert set(loaded.catalogs) == set(store.catalogs)
+    assert loaded.catalog("ce", "2024").courses["CENG231"].prerequisite == \
+        store.catalog("ce", "2024").courses["CENG231"].prerequisite
+
+
+# ---------------------------------------------------------------------------
+# Catalog-year diffs
+# ---------------------------------------------------------------------------
+
+
+def test_catalog_store_picks_up_changed_sources(tmp_path):
+    import os
+    import shutil
+    from fse_catalog.model import get_catalog_store
+
+    (tmp_path / "json" / "2024").mkdir(parents=True)
+    shutil.copy(CATALOG_JSON / "2024" / "2024_CompSci.json", tmp_path / "json" / "2024")
+    config = {"data_directories": {"major_catalog_json": str(tmp_path / "json"),
+                                   "4_year_plans": str(tmp_path / "plans")},
+              "catalog_model": {"snapshot_path": str(tmp_path / "model.pkl"), "refresh_s": 0}}
+    first = get_catalog_store(config)
+    assert get_catalog_store(config) is first
+    assert set(first.catalogs) == {("cs", "2024")}
+
+    shutil.copy(CATALOG_JSON / "2024" / "2024_CompEng.json", tmp_path / "json" / "2024")
+    changed = get_catalog_store(config)
+    assert changed is not first
+    assert set(changed.catalogs) == {("cs", "2024"), ("ce", "2024")}
+
+    config["catalog_model"]["refresh_s"] = 3600
+    os.remove(tmp_path / "json" / "2024" / "2024_CompEng.json")
+    assert get_catalog_store(config) is changed
+
+def test_diff_detects_renumbered_and_removed_courses(store):
+    from fse_catalog.catalog_diff import diff_catalogs
+
+    diff = diff_catalogs(store.catalog("cs", "2022"), store.catalog("cs", "2023"))
+    assert {"from": "CPSC351", "to": "CENG351", "name": "Computer Architecture I"} in diff["courses_renumbered"]
+    assert "CPSC430" in [c["code"] for c in diff["courses_removed"]]
+    assert "CPSC357" not in [c["code"] for c in diff["courses_changed"]]
+    assert diff["program_changes"] == {}
+
+
+def test_diff_index_resolves_years_from_query(store):
+    from fse_catalog.catalog_diff import CHANGE_QUERY_RE, CatalogDiffIndex, format_diff
+
+    index = CatalogDiffIndex.from_store(store)
+    assert CHANGE_QUERY_RE.search("What changed between the 2023 and 2025 catalogs?")
+    diff = index.resolve("what changed between 2025 and 2024?", "cs")
+    assert (diff["from_year"], diff["to_year"]) == ("2024", "2025")
+    assert "CPSC320" in [c["code"] for c in diff["courses_added"]]
+    assert "Professional Portfolio" in format_diff(diff)
+    mine = index.resolve("what changed since my catalog?", "cs", student_year="2023")
+    assert (mine["from_year"], mine["to_year"]) == ("2023", "2025")
+    mine = index.resolve("what changed since my catalog?", "cs", student_year=2023)
+    assert (mine["from_year"], mine["to_year"]) == ("2023", "2025")
+
+
+def test_adjacent_diff_chunks_cover_consecutive_years(store):
+    from fse_catalog.catalog_diff import adjacent_diff_chunks
+
+    chunks = adjacent_diff_chunks([store.catalog("cs", y) for y in ("2025", "2022", "2024", "2023")])
+    assert [c["metadata"]["Years"] for c in chunks] == [["2022", "2023"], ["2023", "2024"], ["2024", "2025"]]
+    assert "SCI150" in chunks[1]["text"] and chunks[1]["metadata"]["ChunkType"] == "catalog_diff"
+
+
+# ---------------------------------------------------------------------------
+# Structured 4-year plans
+# ---------------------------------------------------------------------------
+
+def test_plan_index_when_lookup(store):
+    from fse_catalog.plan_index import WHEN_QUERY_RE, PlanIndex
+
+    index = PlanIndex.from_store(store)
+    assert WHEN_QUERY_RE.search("When should I take CPSC 406?")
+    assert index.lookup("cs", "cpsc-406") == [
+        {"year": 4, "semester": "Spring", "credits": 3, "title": "Algorithm Analysis", "category": "major_core"}]
+    assert len(index.lookup("cs", "CPSC298")) == 4
+    assert "Year 4 Spring" in index.when_text("cs", "CPSC 406", "2024")
+    assert index.when_text("ee", "CPSC 406") is None
+    assert index.semester("cs", 1, "fall").total_credits == 13
+
+
+def test_plan_chunks_one_per_semester(store):
+    from fse_ingestion.plan_chunker import chunk_plan, is_plan_json
+
+    assert is_plan_json("data/4_year_plans/2026/2026_cs_plan.json")
+    assert not is_plan_json("data/4_year_plans/2025/2025_cs_plan.md")
+    chunks = chunk_plan(store.plan("cs", "2026"))
+    semesters = [c for c in chunks if c["metadata"]["ChunkType"] == "plan_semester"]
+    assert len(semesters) == 8 and chunks[0]["metadata"]["ChunkType"] == "plan_overview"
+    last = semesters[-1]
+    assert (last["metadata"]["PlanYear"], last["metadata"]["Semester"]) == (4, "Spring")
+    assert "CPSC406" in last["metadata"]["CourseCodes"] and "CPSC 406 Algorithm Analysis" in last["text"]
+
+
+# ---------------------------------------------------------------------------
+# Course offering index (scraped term listings)
+# ---------------------------------------------------------------------------
+
+_LISTING_HEADER = "Term,Class,Title,Description,Status,Days,Time,Seats\n"
+
+
+def _write_term(directory, term, rows):
+    path = directory / f"{term}.csv"
+    path.write_text(_LISTING_HEADER + "".join(f"{term},{row}\n" for row in rows))
+    return path
+
+
+def test_offering_store_lookup_and_incremental_append(tmp_path):
+    from fse_catalog.offerings import OFFERING_QUERY_RE, OfferingStore, mentioned_season
+
+    listings = tmp_path / "course_listings"
+    listings.mkdir()
+    _write_term(listings, "Fall 2024", ["CPSC 350,Data Structures,DS.,Open,MoWe,9:00AM - 10:15AM,3/30"])
+    _write_term(listings, "Spring 2025", [
+        "CPSC 406,Algorithm Analysis,Algorithms.,Open,MoWe,10:00AM - 11:15AM,12/30",
+        "CPSC 406,Algorithm Analysis,Algorithms.,Closed,TuTh,1:00PM - 2:15PM,0/30",
+    ])
+    store = OfferingStore(str(tmp_path / "offerings.sqlite"))
+    assert store.sync(str(listings)) == {"Fall 2024": 1, "Spring 2025": 2}
+    assert store.sync(str(listings)) == {}
+
+    assert OFFERING_QUERY_RE.search("Is CPSC 406 offered in spring?")
+    assert mentioned_season("Is CPSC 406 offered in spring?") == "Spring"
+    assert store.seasons("cpsc-406") == ["Spring"]
+    assert [s["status"] for s in store.offerings("CPSC 406", "spring")] == ["Open", "Closed"]
+    assert "Not listed in any Fall term" in store.summary_text("CPSC406", "Fall")
+    assert store.summary_text("CPSC999") is None
+
+    _write_term(listings, "Fall 2025", ["CPSC 406,Algorithm Analysis,Algorithms.,Open,Fr,9:00AM - 11:45AM,20/30"])
+    assert store.sync(str(listings)) == {"Fall 2025": 1}
+    assert store.terms() == ["Fall 2024", "Spring 2025", "Fall 2025"]
+    assert store.seasons("CPSC406") == ["Spring", "Fall"]
+    assert store.offerings("CPSC406")[0]["term"] == "Fall 2025"
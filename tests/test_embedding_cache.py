@@ -0,0 +1,65 @@
+import numpy as np
+
+from fse_ingestion.embedding_cache import EmbeddingCache, embedding_fingerprint
+
+
+# ---------------------------------------------------------------------------
+# EmbeddingCache — unit tests (no services required)
+# ---------------------------------------------------------------------------
+
+def _vec(seed, dim=8):
+    return [float(seed + i) / 10 for i in range(dim)]
+
+
+def test_roundtrip_and_stats(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dimension=8)
+    assert cache.get_many(["a", "b"]) == [None, None]
+
+    cache.put_many(["a", "b"], [_vec(1), _vec(2)])
+    hits = cache.get_many(["a", "b", "c"])
+    assert hits[2] is None
+    assert np.allclose(hits[0], _vec(1), atol=1e-2)
+    assert np.allclose(hits[1], _vec(2), atol=1e-2)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+
+
+def test_persists_across_instances(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dimension=8, fingerprint="m1")
+    cache.put_many(["chunk"], [_vec(3)])
+    cache.flush()
+
+    reopened = EmbeddingCache(str(tmp_path), dimension=8, fingerprint="m1")
+    assert np.allclose(reopened.get_many(["chunk"])[0], _vec(3), atol=1e-2)
+
+
+def test_fingerprint_change_invalidates(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), dimension=8, fingerprint="m1")
+    cache.put_many(["chunk"], [_vec(3)])
+    cache.flush()
+
+    other = EmbeddingCache(str(tmp_path), dimension=8, fingerprint="m2")
+    assert other.get_many(["chunk"]) == [None]
+
+
+def test_size_based_eviction_drops_least_recently_used(tmp_path):
+    # 8 dims * 2 bytes = 16 bytes per vector; cap the cache at 4 vectors
+    cache = EmbeddingCache(str(tmp_path), dimension=8, max_size_mb=64 / (1024 * 1024))
+    assert cache.max_entries == 4
+    cache.put_many(["a", "b", "c", "d"], [_vec(i) for i in range(4)])
+    cache.get_many(["a"])
+    cache.put_many(["e"], [_vec(5)])
+
+    assert cache.stats()["entries"] == 4
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_many(["b"]) == [None]
+    assert cache.get_many(["a"])[0] is not None
+
+
+def test_embedding_fingerprint_tracks_model():
+    base = {"embedding": {"model": "qwen3-embedding", "dimension": 4096}}
+    other = {"embedding": {"model": "bge-m3", "dimension": 4096}}
+    assert embedding_fingerprint(base) != embedding_fingerprint(other)
@@ -179,7 +179,7 @@ def test_eval_corpus(rag_system, query_data, _eval_report):
     """
     start = time.time()
     try:
-        answer_text, sources, _ = _answer_question(rag_system, query_data)
+        answer_text, sources, debug = _answer_question(rag_system, query_data)
         elapsed = round(time.time() - start, 1)
 
         judge_passed = None
@@ -221,6 +221,12 @@ def test_eval_corpus(rag_system, query_data, _eval_report):
                 and collection_ok
                 and (judge_passed is not False)
             ),
+            'rerank_candidates': (debug.get('rerank_pruning') or {}).get('candidates'),
+            'rerank_pairs_scored': (debug.get('rerank_pruning') or {}).get('pairs_scored'),
+            'prompt_tokens_saved': (debug.get('context_compression') or {}).get('tokens_saved'),
+            'prompt_tokens': (debug.get('prompt_cache') or {}).get('prompt_tokens'),
+            'prompt_cached_tokens': (debug.get('prompt_cache') or {}).get('cached_tokens'),
+            'prompt_prefill_tokens': (debug.get('prompt_cache') or {}).get('prefill_tokens'),
             'elapsed_s': elapsed,
         })
 
@@ -1,7 +1,10 @@
 import pytest
 import tempfile
 import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+from fse_ingestion import collection_versions
 from fse_ingestion.fse_edit_metadata import FSEMetadataExtractor
 
 FSE_COLLECTIONS = ["major_catalogs", "minor_catalogs", "4_year_plans", "general_knowledge"]
@@ -62,6 +65,218 @@ def test_metadata_extraction_all_subject_codes(extractor, tmp_path):
         assert meta["SubjectCode"] == code
 
 
+# ---------------------------------------------------------------------------
+# Blue/green collection versions — unit tests with a stubbed Qdrant client
+# ---------------------------------------------------------------------------
+
+def _client_with(collections, aliases=None):
+    client = MagicMock()
+    client.get_collections.return_value = SimpleNamespace(
+        collections=[SimpleNamespace(name=n) for n in collections]
+    )
+    client.get_aliases.return_value = SimpleNamespace(aliases=[
+        SimpleNamespace(alias_name=a, collection_name=c) for a, c in (aliases or {}).items()
+    ])
+    return client
+
+
+def test_next_version_ignores_other_collections():
+    client = _client_with(["major_catalogs__v1", "major_catalogs__v3", "minor_catalogs__v9", "major_catalogs"])
+    assert collection_versions.list_versions(client, "major_catalogs") == [1, 3]
+    assert collection_versions.next_version(client, "major_catalogs") == 4
+    assert collection_versions.next_version(client, "4_year_plans") == 1
+
+
+def test_garbage_collect_keeps_newest_and_live():
+    client = _client_with(
+        ["major_catalogs__v1", "major_catalogs__v2", "major_catalogs__v3", "major_catalogs__v4"],
+        aliases={"major_catalogs": "major_catalogs__v1"},
+    )
+    deleted = collection_versions.garbage_collect(client, "major_catalogs", keep=2)
+    assert deleted == ["major_catalogs__v2"]
+
+
+def test_corpus_version_changes_with_alias_target():
+    before = _client_with([], aliases={"major_catalogs": "major_catalogs__v1"})
+    after = _client_with([], aliases={"major_catalogs": "major_catalogs__v2"})
+    v1 = collection_versions.corpus_version(before, ["major_catalogs"])
+    assert v1 == collection_versions.corpus_version(before, ["major_catalogs"])
+    assert v1 != collection_versions.corpus_version(after, ["major_catalogs"])
+
+
+def test_swap_aliases_is_a_single_request():
+    client = _client_with(["major_catalogs__v1", "major_catalogs__v2"],
+                          aliases={"major_catalogs": "major_catalogs__v1"})
+    collection_versions.swap_aliases(client, {"major_catalogs": "major_catalogs__v2"})
+    assert client.update_collection_aliases.call_count == 1
+    client.delete_collection.assert_not_called()
+
+
+def test_swap_aliases_creates_alias_before_dropping_legacy_collection():
+    client = _client_with(["major_catalogs", "major_catalogs__v1"])
+    order = []
+    client.update_collection_aliases.side_effect = lambda **kwargs: order.append("alias")
+    client.delete_collection.side_effect = lambda name: order.append(f"delete {name}")
+    collection_versions.swap_aliases(client, {"major_catalogs": "major_catalogs__v1"})
+    assert order == ["alias", "delete major_catalogs"]
+
+
+def test_reindex_deletes_a_build_that_fails_validation():
+    from fse_ingestion.fse_ingestion import FSEIngestion
+
+    existing = ["major_catalogs__v1"]
+    client = _client_with(existing, aliases={"major_catalogs": "major_catalogs__v1"})
+    ingestion = FSEIngestion.__new__(FSEIngestion)
+    ingestion.client = client
+    ingestion.config = {"qdrant": {"collections": {"major_catalogs": "major_catalogs"}, "aliasing": {}}}
+    ingestion.summary_indexer = None
+    ingestion._ensure_collections_exist = MagicMock()
+    ingestion.bulk_ingest = lambda data_dirs: existing.append("major_catalogs__v2")
+    client.collection_exists.side_effect = lambda name: name in existing
+    client.count.side_effect = lambda collection_name, exact: SimpleNamespace(
+        count=1 if collection_name == "major_catalogs__v2" else 100)
+
+    assert not ingestion.reindex(["data"])
+    client.update_collection_aliases.assert_not_called()
+    client.delete_collection.assert_called_once_with("major_catalogs__v2")
+
+
+def test_reindex_versions_summary_collections_with_their_collection():
+    from fse_ingestion.fse_ingestion import FSEIngestion
+
+    existing = ["general_knowledge__v1", "general_knowledge__v1_summaries",
+                "general_knowledge__v2", "general_knowledge__v2_summaries",
+                "major_catalogs__v2"]
+    client = _client_with(existing, aliases={"general_knowledge": "general_knowledge__v2",
+                                             "general_knowledge_summaries": "general_knowledge__v2_summaries",
+                                             "major_catalogs": "major_catalogs__v2"})
+    ingestion = FSEIngestion.__new__(FSEIngestion)
+    ingestion.client = client
+    ingestion.config = {
+        "qdrant": {"collections": {"general_knowledge": "general_knowledge", "major_catalogs": "major_catalogs"},
+                   "aliasing": {"keep_versions": 1}},
+        "collection_config": {"general_knowledge": {"summary_enabled": True},
+                              "major_catalogs": {"summary_enabled": False}},
+    }
+    ingestion.summary_indexer = MagicMock()
+    ingestion._ensure_collections_exist = MagicMock()
+
+    def bulk_ingest(data_dirs):
+        # Summaries are written to the versioned name the mapping points at during the rebuild
+        assert ingestion.config["qdrant"]["collections"]["general_knowledge"] == "general_knowledge__v3"
+        existing.extend(["general_knowledge__v3", "general_knowledge__v3_summaries", "major_catalogs__v3"])
+
+    ingestion.bulk_ingest = bulk_ingest
+    client.collection_exists.side_effect = lambda name: name in existing
+    client.count.return_value = SimpleNamespace(count=10)
+
+    assert ingestion.reindex(["data"])
+    ingestion.summary_indexer._ensure_summary_collections.assert_called_once()
+    counted = {c.kwargs["collection_name"] for c in client.count.call_args_list}
+    assert {"general_knowledge__v3_summaries", "general_knowledge__v2_summaries"} <= counted
+    operations = client.update_collection_aliases.call_args.kwargs["change_aliases_operations"]
+    created = {op.create_alias.alias_name: op.create_alias.collection_name
+               for op in operations if hasattr(op, "create_alias")}
+    assert created == {"general_knowledge": "general_knowledge__v3",
+                       "general_knowledge_summaries": "general_knowledge__v3_summaries",
+                       "major_catalogs": "major_catalogs__v3"}
+
+
+def test_garbage_collect_summary_versions():
+    client = _client_with(
+        ["general_knowledge__v1", "general_knowledge__v1_summaries", "general_knowledge__v2_summaries"],
+        aliases={"general_knowledge_summaries": "general_knowledge__v2_summaries"},
+    )
+    assert collection_versions.list_versions(client, "general_knowledge", "_summaries") == [1, 2]
+    assert collection_versions.list_versions(client, "general_knowledge") == [1]
+    deleted = collection_versions.garbage_collect(client, "general_knowledge", keep=0, suffix="_summaries")
+    assert deleted == ["general_knowledge__v1_summaries"]
+
+
+def _planner(tmp_path, **ingestion_cfg):
+    from fse_ingestion.plan import IngestionPlanner
+
+    return IngestionPlanner({"ingestion": dict(manifest_path=str(tmp_path / "manifest.json"),
+                                               parsed_text_cache=str(tmp_path / "parsed"), **ingestion_cfg),
+                             "domain": {"document_type_mapping": {"major_catalog": "major_catalogs"}}})
+
+
+def test_encoding_available_offline_checks_tiktoken_cache(tmp_path, monkeypatch):
+    import hashlib
+    from fse_utils.tokens import encoding_available_offline
+
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    assert not encoding_available_offline("cl100k_base")
+    url = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+    (tmp_path / hashlib.sha1(url.encode()).hexdigest()).write_bytes(b"")
+    assert encoding_available_offline("cl100k_base")
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", "")
+    assert not encoding_available_offline("cl100k_base")
+
+
+def test_planner_counts_catalog_chunks_after_cross_year_dedup(tmp_path, monkeypatch):
+    import math
+    import shutil
+    from pathlib import Path
+    from fse_catalog.model import load_catalog_file
+    from fse_ingestion import plan as plan_module
+    from fse_ingestion.catalog_chunker import chunk_catalog
+
+    # Cold machine: the tokenizer cannot be downloaded, so the planner estimates
+    monkeypatch.setattr(plan_module, "encoding_available_offline", lambda name: False)
+    source = Path(__file__).parent.parent / "data" / "major_catalog_json"
+    for year in ("2023", "2024"):
+        (tmp_path / "major_catalog_json" / year).mkdir(parents=True)
+        shutil.copy(source / year / f"{year}_CompSci.json", tmp_path / "major_catalog_json" / year)
+    data_dir = str(tmp_path / "major_catalog_json")
+
+    deduped = _planner(tmp_path).plan([data_dir])["major_catalogs"]
+    per_year = _planner(tmp_path, cross_year_dedup=False).plan([data_dir])["major_catalogs"]
+    chunks = [c for year in ("2023", "2024") for c in chunk_catalog(
+        load_catalog_file(str(tmp_path / "major_catalog_json" / year / f"{year}_CompSci.json")))]
+    assert per_year["files"] == deduped["files"] == 2
+    assert per_year["chunks"] == len(chunks)
+    assert per_year["tokens"] == sum(math.ceil(len(c["text"]) / 4) for c in chunks)
+    assert 0 < deduped["chunks"] < per_year["chunks"]
+    # Planning twice with one planner does not carry dedup state over
+    planner = _planner(tmp_path)
+    assert planner.plan([data_dir])["major_catalogs"]["chunks"] == planner.plan([data_dir])["major_catalogs"]["chunks"]
+
+
+def test_ingest_directories_include_catalog_json(tmp_path, monkeypatch):
+    from pathlib import Path
+    from fse_ingestion import plan as plan_module
+    from fse_ingestion.ingest import ingest_data_dirs
+    from fse_utils.config_loader import load_config
+
+    monkeypatch.setattr(plan_module, "encoding_available_offline", lambda name: False)
+    config = load_config()
+    config["ingestion"] = dict(config.get("ingestion", {}), manifest_path=str(tmp_path / "manifest.json"),
+                               parsed_text_cache=str(tmp_path / "parsed"))
+    planner = plan_module.IngestionPlanner(config)
+    planned = []
+    plan_file = planner.plan_file
+    monkeypatch.setattr(planner, "plan_file", lambda path: planned.append(path) or plan_file(path))
+
+    report = planner.plan(ingest_data_dirs(config))
+    catalog_json = [p for p in planned if "major_catalog_json" in Path(p).parts]
+    expected = list((Path(__file__).parent.parent / "data" / "major_catalog_json").glob("*/*.json"))
+    assert expected and len(catalog_json) == len(expected)
+    assert report["major_catalogs"]["files"] >= len(expected)
+    # The PDF of a catalog that also exists as JSON would index every course twice
+    catalog_pdfs = [p for p in planned if "major_catalog" in Path(p).parts]
+    assert "2024_cs.pdf" not in {Path(p).name for p in catalog_pdfs}
+
+
+def test_catalog_pdf_superseded_only_by_same_program_and_year():
+    from fse_ingestion.catalog_chunker import superseded_by_catalog_json
+
+    catalogs = {("cs", "2024"): object()}
+    assert superseded_by_catalog_json("data/major_catalog/2024/2024_cs.pdf", catalogs)
+    assert not superseded_by_catalog_json("data/major_catalog/2022/2022_cs.pdf", catalogs)
+    assert not superseded_by_catalog_json("data/minor_catalog/2024/2024_cs.pdf", catalogs)
+
+
 # ---------------------------------------------------------------------------
 # FSEIngestion — integration tests (requires Qdrant + Ollama)
 # ---------------------------------------------------------------------------
@@ -116,3 +331,43 @@ def test_collection_has_documents(ingestion):
         coll_name = ingestion.config["qdrant"]["collections"].get(coll_key, coll_key)
         info = ingestion.client.get_collection(coll_name)
         assert info.points_count > 0, f"Collection '{coll_name}' is empty — run ingestion first"
+
+
+@pytest.mark.integration
+def test_payload_indexes_exist_post_init(ingestion):
+    coll_cfg = ingestion.config.get("collection_config", {})
+    for coll_key in FSE_COLLECTIONS:
+        fields = coll_cfg.get(coll_key, {}).get("payload_indexes", [])
+        coll_name = ingestion.config["qdrant"]["collections"].get(coll_key, coll_key)
+        schema = ingestion.client.get_collection(coll_name).payload_schema or {}
+        for field in fields:
+            assert field in schema, f"Payload index '{field}' missing on '{coll_name}'"
+
+
+@pytest.mark.integration
+def test_points_carry_text_stats(ingestion):
+    coll_name = ingestion.config["qdrant"]["collections"]["major_catalogs"]
+    points, _ = ingestion.client.scroll(coll_name, limit=20, with_payload=True)
+    for point in points:
+        assert {"token_count", "char_len", "text_hash"} <= set(point.payload), \
+            "Run ingest.py --backfill-stats for points ingested before text stats"
+
+
+def test_backfill_text_stats_only_fills_missing():
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Distance, PointStruct, VectorParams
+    from fse_ingestion.fse_ingestion import FSEIngestion
+
+    ingestion = FSEIngestion.__new__(FSEIngestion)
+    ingestion.client = QdrantClient(":memory:")
+    ingestion.tokenizer = "cl100k_base"
+    ingestion.client.create_collection("gk", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    ingestion.client.upsert("gk", points=[
+        PointStruct(id=1, vector=[1.0, 0.0], payload={"chunk_text": "Add/drop ends week two.", "doc_id": "a"}),
+        PointStruct(id=2, vector=[0.0, 1.0], payload={"chunk_text": "x", "doc_id": "b", "token_count": 1}),
+    ])
+    assert ingestion.backfill_text_stats("gk") == 1
+    payload = ingestion.client.retrieve("gk", ids=[1])[0].payload
+    assert payload["char_len"] == 23 and payload["token_count"] > 0 and len(payload["text_hash"]) == 64
+    assert ingestion.backfill_text_stats("gk") == 0
+    assert ingestion.backfill_text_stats("gk", doc_id="b", force=True) == 1
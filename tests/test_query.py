@@ -93,7 +93,11 @@ def test_metadata_filter_subject_code(rag):
 def test_metadata_filter_year(rag):
     ctx = {"year": "2024"}
     results = rag.search_collection("graduation requirements", "major_catalogs", ctx, top_k=10)
-    years = {r["metadata"].get("Year") for r in results if r.get("metadata")}
+    years = set()
+    for r in results:
+        meta = r.get("metadata") or {}
+        years.add(meta.get("Year"))
+        years.update(meta.get("Years") or [])
     assert "2024" in years or not years - {None}
 
 
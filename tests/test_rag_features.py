@@ -106,3 +106,467 @@ def test_answer_catalog_returns_content(rag):
         answer = result
     assert isinstance(answer, str)
     assert len(answer.strip()) > 0
+
+
+# ---------------------------------------------------------------------------
+# Startup warmup — fake engine, no services required
+# ---------------------------------------------------------------------------
+
+def test_warmup_builds_once_and_reports_readiness(tmp_path):
+    import json
+    import threading
+    from fse_retrieval.warmup import RAGWarmup
+
+    release = threading.Event()
+    builds = []
+
+    class FakeEngine:
+        def warmup(self, steps):
+            release.wait(5)
+            return {step: {"ok": step != "llm", "seconds": 0.0} for step in steps}
+
+    def build():
+        builds.append(1)
+        return FakeEngine()
+
+    status_path = tmp_path / "warmup_status.json"
+    warmup = RAGWarmup(build, steps=["embed", "rerank", "llm"], status_path=str(status_path))
+    engine = warmup.get_engine(timeout=5)
+    assert isinstance(engine, FakeEngine)
+    assert not warmup.wait(timeout=0.01)
+    assert warmup.status()["state"] == "warming"
+
+    release.set()
+    assert warmup.wait(timeout=5)
+    assert warmup.get_engine() is engine and len(builds) == 1
+    status = json.loads(status_path.read_text())
+    assert status["state"] == "degraded" and status["ready"]
+    assert status["steps"]["rerank"]["ok"] and not status["steps"]["llm"]["ok"]
+
+
+def test_warmup_build_failure_is_reported():
+    from fse_retrieval.warmup import RAGWarmup
+
+    def build():
+        raise RuntimeError("qdrant unreachable")
+
+    warmup = RAGWarmup(build)
+    assert warmup.get_engine(timeout=5) is None
+    assert warmup.status()["state"] == "failed"
+    assert "qdrant unreachable" in warmup.status()["error"]
+
+
+# ---------------------------------------------------------------------------
+# Reranker backends — no model download required
+# ---------------------------------------------------------------------------
+
+def test_unknown_reranker_backend_rejected(monkeypatch):
+    from fse_retrieval.reranker_backends import build_reranker
+
+    monkeypatch.delenv("RERANK_BACKEND", raising=False)
+    with pytest.raises(ValueError):
+        build_reranker({"reranker": {"backend": "tensorrt"}})
+
+
+def test_cpu_reranker_orders_by_score():
+    from fse_retrieval.reranker_backends import CPUReranker, _activate
+
+    reranker = CPUReranker.__new__(CPUReranker)
+    reranker.score = lambda query, texts: [_activate(len(t) - 3.0, "sigmoid") for t in texts]
+    ranked = reranker.rerank("q", [{"text": "ab"}, {"text": "abcdef"}, {"text": "abcd"}], top_k=2)
+    assert [c["text"] for c in ranked] == ["abcdef", "abcd"]
+    assert 0.5 < ranked[1]["rerank_score"] < ranked[0]["rerank_score"] < 1.0
+    assert _activate(-1000.0, "sigmoid") == 0.0
+
+
+def test_reranker_loads_once_under_concurrent_first_use(monkeypatch, tmp_path):
+    import threading
+    import time
+    from fse_retrieval import fse_unified_rag
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+    from fse_retrieval.rerank_cache import CachedReranker
+
+    builds = []
+
+    def build(config):
+        builds.append(1)
+        time.sleep(0.05)
+        return type("Backend", (), {"model_id": "bge:torch"})()
+
+    monkeypatch.setattr(fse_unified_rag, "build_reranker", build)
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.config = {"rerank_cache": {"enabled": True, "path": str(tmp_path / "scores.sqlite")},
+                  "reranker": {"adaptive": {"enabled": False}}}
+    rag.rerank_disabled = False
+    rag.reranker = None
+    rag._reranker_lock = threading.Lock()
+    rag._debug_layers = {}
+
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(rag._get_reranker())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(builds) == 1
+    assert all(r is got[0] for r in got)
+    assert isinstance(got[0], CachedReranker) and not isinstance(got[0].reranker, CachedReranker)
+
+
+def test_rerank_cache_scores_only_new_pairs(tmp_path):
+    from fse_retrieval.rerank_cache import CachedReranker, RerankScoreCache
+
+    class LengthReranker:
+        def __init__(self):
+            self.scored = []
+
+        def rerank(self, query, chunks):
+            self.scored += [c["text"] for c in chunks]
+            return sorted((dict(c, rerank_score=float(len(c["text"]))) for c in chunks),
+                          key=lambda c: c["rerank_score"], reverse=True)
+
+    inner = LengthReranker()
+    version = ["v1"]
+    path = str(tmp_path / "scores.sqlite")
+    reranker = CachedReranker(inner, RerankScoreCache(max_entries=10, path=path), "bge:torch", lambda: version[0])
+
+    reranker.rerank("Prereqs for CPSC 350?", [{"text": "ab"}, {"text": "abcd"}])
+    reranker.begin_request()
+    ranked = reranker.rerank("prereqs  for cpsc 350", [{"text": "abcd"}, {"text": "abc"}, {"text": "ab"}], top_k=2)
+    assert [c["text"] for c in ranked] == ["abcd", "abc"]
+    assert inner.scored == ["ab", "abcd", "abc"]
+    assert reranker.request_stats() == {"hits": 2, "misses": 1, "hit_rate": 0.667}
+
+    # Scores persist across processes, but not across a reindex
+    reloaded = CachedReranker(inner, RerankScoreCache(path=path), "bge:torch", lambda: version[0])
+    reloaded.rerank("prereqs for cpsc 350", [{"text": "abc"}])
+    assert inner.scored == ["ab", "abcd", "abc"]
+    version[0] = "v2"
+    reloaded.rerank("prereqs for cpsc 350", [{"text": "abc"}])
+    assert inner.scored[-1] == "abc" and len(inner.scored) == 4
+
+
+def test_adaptive_rerank_stops_on_peaked_scores():
+    from fse_retrieval.rerank_pruning import AdaptiveReranker
+
+    class ScoreReranker:
+        def rerank(self, query, chunks):
+            return [dict(c, rerank_score=c["score"]) for c in chunks]
+
+    peaked = [{"text": str(i), "score": 1.0 if i < 4 else 0.01} for i in range(40)]
+    reranker = AdaptiveReranker(ScoreReranker(), top_k=3, batch_size=4, min_candidates=4)
+    reranker.begin_request()
+    ranked = reranker.rerank("q", peaked, top_k=3)
+    assert [c["text"] for c in ranked] == ["0", "1", "2"]
+    assert reranker.request_stats() == {"candidates": 40, "pairs_scored": 4, "stops": ["gap"]}
+
+    flat = [{"text": str(i), "score": 1.0} for i in range(40)]
+    reranker.begin_request()
+    reranker.rerank("q", flat)
+    assert reranker.request_stats()["stops"] == ["stable"]
+    assert reranker.request_stats()["pairs_scored"] == 8
+
+
+def test_reranker_service_batches_concurrent_requests():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from fse_retrieval.reranker_service import PairBatcher
+
+    calls = []
+    lock = threading.Lock()
+
+    def score_pairs(pairs):
+        with lock:
+            calls.append(len(pairs))
+        return [float(len(q) + len(t)) for q, t in pairs]
+
+    batcher = PairBatcher(score_pairs, window_ms=50, max_batch_pairs=64)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda q: batcher.score(q, ["a", "bb"], timeout=5), ["x", "yy", "zzz", "w"]))
+    assert results == [[2.0, 3.0], [3.0, 4.0], [4.0, 5.0], [2.0, 3.0]]
+    assert sum(calls) == 8 and len(calls) < 4
+
+
+def test_reranker_client_round_trip():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from fse_retrieval.reranker_service import RerankerClient
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._reply({"model_id": "bge:int8", "batching": {}})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            self._reply({"scores": [float(len(t)) for t in body["texts"]]})
+
+        def _reply(self, data):
+            payload = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = RerankerClient(f"http://127.0.0.1:{server.server_address[1]}")
+        assert client.model_id == "bge:int8"
+        ranked = client.rerank("q", [{"text": "a"}, {"text": "abc"}, {"text": "ab"}], top_k=2)
+        assert [c["text"] for c in ranked] == ["abc", "ab"]
+    finally:
+        server.shutdown()
+
+
+def test_context_packer_fills_routed_budget_with_quotas():
+    from fse_retrieval.context_packer import ContextPacker, PackingLLMHandler
+
+    def chunk(name, collection, tokens, score, pinned=False):
+        return {"text": name, "collection": collection, "rerank_score": score,
+                "metadata": {"token_count": tokens, "pinned": pinned}}
+
+    chunks = [
+        chunk("gk1", "general_knowledge", 300, 0.99),
+        chunk("gk2", "general_knowledge", 300, 0.98),
+        chunk("cat1", "major_catalogs", 300, 0.5),
+        chunk("course", "major_catalogs", 100, 1.0, pinned=True),
+        chunk("cat2", "major_catalogs", 900, 0.4),
+    ]
+    packer = ContextPacker(min_budget=200, max_budget=15000, min_chunks=1, max_collection_share=0.6)
+    packer.begin_request()
+    packer.observe_route({"collections": ["general_knowledge", "major_catalogs"], "token_allocation": 1000})
+    packed, stats = packer.pack(chunks)
+    # general_knowledge is capped at 600 tokens, so the catalog chunk gets the room a third gk chunk would
+    assert [c["text"] for c in packed] == ["gk1", "gk2", "cat1", "course"]
+    assert stats == {"budget": 1000, "chunks_in": 5, "chunks_kept": 4, "tokens_in": 1900, "tokens_kept": 1000}
+
+    class Handler:
+        def generate(self, query, context_chunks, stream=False):
+            return [c["text"] for c in context_chunks]
+
+    packer.observe_route({"token_allocation": 50})
+    assert PackingLLMHandler(Handler(), packer).generate("q", context_chunks=chunks) == ["course"]
+
+
+def test_degree_audit_uses_completed_courses_from_context(monkeypatch):
+    from fse_retrieval import fse_unified_rag
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    audits = []
+
+    class Auditor:
+        def audit(self, program, year, completed):
+            audits.append(list(completed))
+            return {"program": program, "year": year}
+
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.degree_auditor = Auditor()
+    rag.audit_cfg = {}
+    context = {"program": "cs", "year": "2024", "completed": ["CPSC 230"]}
+    monkeypatch.setattr(fse_unified_rag, "format_audit", lambda result: "audit")
+    assert rag._degree_audit_chunks("What do I still need to graduate?", "major_catalogs", context)
+    rag._degree_audit_chunks("I took cpsc 230 and CPSC 231, what do I still need?", "major_catalogs", context)
+    assert audits == [["CPSC 230"], ["CPSC 230", "CPSC231"]]
+    assert rag._degree_audit_chunks("What do I still need to graduate?", "major_catalogs", {"program": "cs"}) == []
+
+
+def test_catalog_indexes_rebuilt_when_store_changes(monkeypatch):
+    import threading
+    from fse_retrieval import fse_unified_rag
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    current = [object()]
+    monkeypatch.setattr(fse_unified_rag, "get_catalog_store", lambda config: current[0])
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.config = {}
+    rag._catalog_lock = threading.Lock()
+    rag._catalog_store = current[0]
+    rebuilds = []
+    rag._init_catalog_model = lambda: rebuilds.append(1) or setattr(rag, "_catalog_store", current[0])
+
+    rag._refresh_catalog_model()
+    assert rebuilds == []
+    current[0] = object()
+    rag._refresh_catalog_model()
+    rag._refresh_catalog_model()
+    assert rebuilds == [1]
+
+
+def test_plan_lookup_pins_only_the_students_catalog_year():
+    from fse_catalog.model import get_catalog_store
+    from fse_catalog.plan_index import PlanIndex
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+    from fse_utils.config_loader import load_config
+
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.plan_index = PlanIndex.from_store(get_catalog_store(load_config()))
+    rag.plan_lookup_cfg = {}
+    query = "When should I take CPSC 406?"
+
+    chunks = rag._plan_lookup_chunks(query, "4_year_plans", {"program": "cs", "year": "2026"})
+    assert chunks[0]["metadata"]["Year"] == "2026" and chunks[0]["metadata"]["pinned"]
+    assert rag._plan_lookup_chunks(query, "4_year_plans", {"program": "cs", "year": 2026})
+    assert rag._plan_lookup_chunks(query, "4_year_plans", {"program": "cs", "year": "2023"}) == []
+
+
+def test_exact_course_questions_skip_dense_search():
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    dense_calls = []
+    course = {"text": "CPSC 350 Data Structures", "score": 1.0,
+              "metadata": {"ChunkType": "course", "CourseCode": "CPSC350", "SubjectCode": "cs"}}
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.plan_lookup_cfg, rag.course_lookup_cfg = {}, {}
+    for name in ("_plan_lookup_chunks", "_generated_plan_chunks", "_catalog_diff_chunks",
+                 "_degree_audit_chunks", "_offering_chunks", "_prereq_chain_chunks"):
+        setattr(rag, name, lambda query, collection_name, user_context: [])
+    rag._pinned_course_chunks = lambda query, collection_name, user_context: [course]
+    rag.course_index = type("Index", (), {"mentions_only_indexed": lambda self, q: "ZZZZ" not in q})()
+    rag._dense_search = lambda **kwargs: dense_calls.append(kwargs) or [
+        {"text": "CPSC 350 Data Structures", "metadata": {}}, {"text": "MATH 110", "metadata": {}}]
+
+    assert rag.search_collection("CPSC 350 prerequisites", "major_catalogs", {"program": "cs"}) == [course]
+    assert dense_calls == []
+    mixed = rag.search_collection("Is CPSC 350 like ZZZZ 999?", "major_catalogs", {"program": "cs"})
+    assert [r["text"] for r in mixed] == ["CPSC 350 Data Structures", "MATH 110"]
+    assert len(dense_calls) == 1
+
+
+def test_two_phase_query_fetches_text_for_window_only():
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import (
+        Distance, FieldCondition, Filter, MatchValue, PointStruct, VectorParams,
+    )
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    client = QdrantClient(":memory:")
+    client.create_collection("major_catalogs", vectors_config=VectorParams(size=2, distance=Distance.DOT))
+    texts = ["CPSC 350 Data Structures", "CPSC 350 Data Structures", "CPSC 231", "CPSC 230", "MATH 110"]
+    client.upsert("major_catalogs", points=[
+        PointStruct(id=i, vector=[1.0, i / 10], payload={"chunk_text": t, "text_hash": t, "SubjectCode": "cs"})
+        for i, t in enumerate(texts)
+    ])
+    retrieved = []
+    retrieve = client.retrieve
+    client.retrieve = lambda **kwargs: retrieved.append(sorted(kwargs["ids"])) or retrieve(**kwargs)
+
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.client = client
+    rag.collections = {"major_catalogs": "major_catalogs"}
+    rag.config = {"reranker": {"max_candidates_for_rerank": 3}}
+    rag.hybrid_disabled = True
+    rag.rerank_disabled = False
+    rag.search_engine = type("Engine", (), {"get_embedding": lambda self, q: [1.0, 1.0]})()
+    rag._build_filter = lambda user_context, document_type=None: Filter(must=[
+        FieldCondition(key="SubjectCode", match=MatchValue(value=user_context["program"]))]) \
+        if user_context.get("program") else None
+
+    def search(two_phase, user_context):
+        rag.two_phase, rag.two_phase_cfg = two_phase, {}
+        return [r["text"] for r in rag._dense_search("q", "major_catalogs", user_context, top_k=2)]
+
+    assert search(True, {"program": "cs"}) == ["MATH 110", "CPSC 230", "CPSC 231"]
+    assert retrieved == [[2, 3, 4]]
+    assert search(False, {"program": "cs"})[:3] == search(True, {"program": "cs"})
+    # Unfiltered queries get the same fetch window
+    assert search(True, {}) == ["MATH 110", "CPSC 230", "CPSC 231"]
+    assert search(False, {}) == ["MATH 110", "CPSC 230"]
+
+
+def test_generated_plan_includes_minor_and_completed_courses():
+    from fse_retrieval.fse_unified_rag import FSEUnifiedRAG
+
+    calls = []
+
+    class Scheduler:
+        def schedule(self, completed=(), extra_courses=()):
+            calls.append((list(completed), [c["code"] for c in extra_courses]))
+            return {"program": "cs", "catalog_year": "2026", "prereq_catalog_year": "2026", "credit_cap": 18,
+                    "semesters": [], "total_credits": 0, "moved": [], "assumed_prerequisites": [],
+                    "unknown_prerequisites": [], "unscheduled": []}
+
+    rag = FSEUnifiedRAG.__new__(FSEUnifiedRAG)
+    rag.config = {"plan_scheduler": {"minor_courses": {"game": ["GAME 230"]}}}
+    rag.plan_cfg = {"enabled": True, "collections": ["4_year_plans"]}
+    rag._plan_schedulers = {"cs": Scheduler()}
+    query = "Generate a 4 year plan for my major and minor"
+
+    chunks = rag._generated_plan_chunks(query, "4_year_plans",
+                                        {"program": "cs", "minor": "game", "completed": ["CPSC 230"]})
+    assert chunks[0]["metadata"]["pinned"]
+    assert calls == [(["CPSC 230"], ["GAME 230"])]
+    assert rag._generated_plan_chunks(query, "4_year_plans", {"program": "cs", "minor": "isp"}) == []
+    assert len(calls) == 1
+
+
+def test_context_compression_drops_irrelevant_sentences(tmp_path):
+    from fse_ingestion.embedding_cache import EmbeddingCache
+    from fse_retrieval.context_compression import ContextCompressor
+
+    header = "CPSC 350 Data Structures\n"
+    prereq = "Students must complete CPSC 231 before enrolling in this course.\n"
+    picnic = "The department hosts a welcome picnic every fall semester on campus.\n"
+    topics = "Data structures covers trees, graphs and hash tables in depth."
+    writer = EmbeddingCache(str(tmp_path), dimension=3)
+    writer.put_many([prereq.strip(), picnic.strip(), topics],
+                    [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.9, 0.1, 0.0]])
+    writer.flush()
+
+    vectors = EmbeddingCache(str(tmp_path), dimension=3, readonly=True)
+    compressor = ContextCompressor(vectors, lambda q: [1.0, 0.0, 0.0], target_ratio=0.8, min_chunk_tokens=0)
+    compressor.begin_request()
+    compressor.set_query("What do I need before CPSC 350?")
+    chunks = [{"text": header + prereq + picnic + topics, "metadata": {}},
+              {"text": header + picnic + topics, "metadata": {"pinned": True}}]
+    compressed = compressor.compress(chunks)
+
+    assert compressed[0]["text"] == header + prereq + topics
+    assert compressed[0]["metadata"]["compressed_from"] > compressed[0]["metadata"]["token_count"]
+    assert compressed[1] is chunks[1]
+    stats = compressor.request_stats()
+    assert stats["chunks_compressed"] == 1 and stats["sentences_dropped"] == 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_prompt_layout_keeps_stable_prefix_and_records_cache_usage():
+    from pathlib import Path
+
+    from fse_catalog.model import load_catalog_file
+    from fse_retrieval.prompt_layout import PromptLayout, PromptLayoutAPI, format_program_bundle
+
+    catalog = load_catalog_file(str(Path(__file__).parent.parent / "data/major_catalog_json/2024/2024_CompSci.json"))
+    bundle = format_program_bundle(catalog)
+    assert bundle == format_program_bundle(catalog) and "CPSC 350" in bundle
+
+    class API:
+        def chat(self, model, messages, stream=False, **kwargs):
+            self.messages = messages
+            if stream:
+                return iter([{"message": {"content": "ok"}}, {"done": True, "prompt_eval_count": 40}])
+            return {"usage": {"prompt_tokens": 900, "prompt_tokens_details": {"cached_tokens": 800}}}
+
+    api = API()
+    layout = PromptLayout(bundle_for=lambda program, year: bundle if (program, year) == ("CPSC", "2024") else "")
+    wrapped = PromptLayoutAPI(api, layout)
+    layout.begin_request()
+    layout.set_context({"program": "CPSC", "year": "2024"})
+    wrapped.chat(model="m", messages=[{"role": "system", "content": "SYSTEM"}, {"role": "user", "content": "q"}])
+    assert api.messages[0]["content"] == "SYSTEM\n\n" + bundle
+    assert api.messages[1] == {"role": "user", "content": "q"}
+    assert list(wrapped.chat(model="m", messages=[{"role": "user", "content": "q2"}], stream=True))[-1]["done"]
+    assert api.messages[0] == {"role": "system", "content": bundle}
+    assert layout.request_stats() == {"calls": 2, "bundle": "CPSC/2024", "prompt_tokens": 900,
+                                      "cached_tokens": 800, "prefill_tokens": 140, "cached_share": 0.889}
+
+    chunks = [
+        {"text": "b", "collection": "major_catalogs", "rerank_score": 0.9,
+         "metadata": {"source_path": "cs.json", "chunk_index": 4}},
+        {"text": "a", "collection": "major_catalogs", "rerank_score": 0.5,
+         "metadata": {"source_path": "cs.json", "chunk_index": 1}},
+        {"text": "pin", "collection": "major_catalogs", "metadata": {"pinned": True}},
+    ]
+    assert [c["text"] for c in layout.order_chunks(chunks)] == ["pin", "a", "b"]
@@ -0,0 +1,85 @@
+import pytest
+
+from fse_ingestion.manifest import IngestionManifest
+from fse_ingestion.watcher import IngestionWatcher
+
+
+class RecordingIngestion:
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.ingested = []
+        self.deleted = []
+
+    def ingest_file(self, path):
+        self.ingested.append(path)
+        self.manifest.record(path)
+        return True
+
+    def delete_file(self, path):
+        self.deleted.append(path)
+        self.manifest.forget(path)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    d = tmp_path / "major_catalog_json" / "2025"
+    d.mkdir(parents=True)
+    return d
+
+
+@pytest.fixture
+def watcher(tmp_path, data_dir):
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"))
+    ingestion = RecordingIngestion(manifest)
+    return IngestionWatcher(ingestion, [str(data_dir.parent)], debounce_s=10, batch_size=2,
+                            status_path=str(tmp_path / "status.json"))
+
+
+def test_prime_queues_files_missing_from_manifest(watcher, data_dir):
+    (data_dir / "2025_CompSci.json").write_text("{}")
+    (data_dir / "notes.docx").write_text("ignored")
+    watcher.prime(now=0)
+    assert watcher.status()["queue_depth"] == 1
+
+
+def test_burst_is_debounced_then_drained(watcher, data_dir):
+    watcher.prime(now=0)
+    for name in ("2025_CompSci.json", "2025_CompEng.json", "2025_DataSci.json"):
+        (data_dir / name).write_text("{}")
+    assert watcher.poll_once(now=100) == 3
+    assert not watcher.ready(now=105)
+    assert watcher.ready(now=111)
+
+    watcher.drain()
+    assert len(watcher.ingestion.ingested) == 3
+    status = watcher.status()
+    assert status["queue_depth"] == 0
+    assert status["files_ingested"] == 3
+    assert status["last_ingest_lag_s"] is not None
+
+
+def test_unchanged_content_is_skipped(watcher, data_dir):
+    f = data_dir / "2025_CompSci.json"
+    f.write_text("{}")
+    watcher.prime(now=0)
+    watcher.drain()
+    assert watcher.ingestion.ingested == [str(f)]
+
+    f.write_text("{}")
+    watcher._pending[str(f)] = 0
+    watcher.drain()
+    assert watcher.ingestion.ingested == [str(f)]
+
+
+def test_deleted_file_is_removed(watcher, data_dir):
+    f = data_dir / "2025_CompSci.json"
+    f.write_text("{}")
+    watcher.prime(now=0)
+    watcher.drain()
+
+    f.unlink()
+    watcher.poll_once(now=50)
+    watcher.drain()
+    assert watcher.ingestion.deleted == [str(f)]
+    assert watcher.ingestion.manifest.get(str(f)) is None